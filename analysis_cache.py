@@ -0,0 +1,147 @@
+"""
+Analysis Cache - persistent per-file CodeAnalyzer results
+
+Findings are stored in SQLite keyed by path and validated by size and mtime;
+when only the mtime changed, the content hash decides. Entries are tied to a
+signature of the analyzer's pattern configuration, so changing a pattern
+invalidates everything analyzed with the old one.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("logs", "analysis_cache.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    result TEXT NOT NULL,
+    analyzed_at REAL NOT NULL
+);
+"""
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Per-file analysis results that survive between orchestrator runs"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, signature: str = ""):
+        self.db_path = db_path
+        self.signature = signature
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # (size, mtime_ns) seen at lookup time for misses; a file that changes while
+        # being analyzed is not cached, since its result may describe older content
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def get(self, path: str, trust: bool = False) -> Optional[Dict[str, Any]]:
+        """Cached result for path if the file is unchanged, else None.
+
+        trust=True skips validation (for files known unchanged, e.g. outside a git diff).
+        """
+        key = self._key(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM files WHERE path = ? AND signature = ?", (key, self.signature)
+            ).fetchone()
+        if row is None or not trust:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.misses += 1
+                return None
+            self._pending[key] = (stat.st_size, stat.st_mtime_ns)
+        if row is None:
+            self.misses += 1
+            return None
+        if not trust:
+            if stat.st_size != row["size"]:
+                self.misses += 1
+                return None
+            if stat.st_mtime_ns != row["mtime_ns"]:
+                # Touched but possibly not modified (checkout, formatter no-op): compare content
+                if file_digest(path) != row["sha256"]:
+                    self.misses += 1
+                    return None
+                with self._lock:
+                    self._conn.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key))
+        self._pending.pop(key, None)
+        self.hits += 1
+        result = json.loads(row["result"])
+        result["file"] = path
+        return result
+
+    def put_many(self, results: Iterable[Dict[str, Any]]):
+        """Store analyze_file() results (keyed by their "file")"""
+        rows: List[Tuple] = []
+        for result in results:
+            path = result["file"]
+            seen = self._pending.pop(self._key(path), None)
+            try:
+                stat = os.stat(path)
+                digest = file_digest(path)
+            except OSError:
+                continue
+            if seen != (stat.st_size, stat.st_mtime_ns):
+                continue
+            rows.append((self._key(path), stat.st_size, stat.st_mtime_ns, digest, self.signature,
+                         json.dumps(result), time.time()))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, signature, result, analyzed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute("COMMIT")
+
+    def prune(self) -> int:
+        """Drop entries for deleted files or from another pattern configuration"""
+        with self._lock:
+            paths = [row["path"] for row in self._conn.execute("SELECT path FROM files")]
+            stale = [(path,) for path in paths if not os.path.exists(path)]
+            self._conn.execute("BEGIN")
+            self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            cursor = self._conn.execute("DELETE FROM files WHERE signature != ?", (self.signature,))
+            self._conn.execute("COMMIT")
+        removed = len(stale) + cursor.rowcount
+        if removed:
+            logger.info(f"Pruned {removed} stale analysis cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._conn.close()
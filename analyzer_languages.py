@@ -0,0 +1,196 @@
+"""
+Analyzer Languages - per-language rule sets for CodeAnalyzer, keyed by file extension
+
+Each Language bundles what the analyzer needs for one source language: its
+file extensions and a file filter (generated files to skip), its mock and
+commented-code patterns (compiled once, per language, into a combined
+scanner), and the comment syntax used by comment_detector. A registry maps
+extensions to languages so every file is dispatched to exactly one rule set,
+instead of every pattern running against every file.
+"""
+
+import os
+import re
+import fnmatch
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+# Result categories of the per-file scan and the config keys holding their patterns
+SCAN_CATEGORIES = (
+    ("mocks", "mock_patterns"),
+    ("commented_code", "commented_code_patterns")
+)
+
+# Built-in rule sets. Python's patterns are CodeAnalyzer's top-level mock_patterns and
+# commented_code_patterns config keys, so they are filled in by build_registry.
+LANGUAGES = {
+    "python": {
+        "extensions": [".py"],
+        "comment_syntax": "python",
+        "exclude_files": ["*_pb2.py", "*_pb2_grpc.py"]
+    },
+    "java": {
+        "extensions": [".java"],
+        "comment_syntax": "c",
+        "exclude_files": ["package-info.java", "module-info.java"],
+        "mock_patterns": [
+            r"//\s*TODO:",
+            r"//\s*FIXME:",
+            r"\bmock\.",
+            r"@Mock\b",
+            r"@MockBean\b",
+            r"\bMockito\."
+        ],
+        "commented_code_patterns": [
+            r"//\s*[a-zA-Z_][\w.]*\s*\(.*\)\s*;",
+            r"//\s*(?:if|for|while|switch)\s*\(",
+            r"//\s*return\b.*;",
+            r"//\s*[\w.<>\[\]]+\s+\w+\s*=.*;"
+        ]
+    },
+    "kotlin": {
+        "extensions": [".kt", ".kts"],
+        "comment_syntax": "c",
+        "exclude_files": [],
+        "mock_patterns": [
+            r"//\s*TODO:",
+            r"//\s*FIXME:",
+            r"\bmockk\b",
+            r"@MockK\b",
+            r"@Mock\b",
+            r"\bMockito\."
+        ],
+        "commented_code_patterns": [
+            r"//\s*(?:val|var|fun|if|for|while|when|return)\b"
+        ]
+    },
+    "javascript": {
+        "extensions": [".js", ".jsx", ".mjs", ".ts", ".tsx"],
+        "comment_syntax": "c",
+        "exclude_files": ["*.min.js", "*.d.ts"],
+        "mock_patterns": [
+            r"//\s*TODO:",
+            r"//\s*FIXME:",
+            r"\bjest\.(?:mock|fn|spyOn)\(",
+            r"\bvi\.(?:mock|fn|spyOn)\(",
+            r"\bsinon\."
+        ],
+        "commented_code_patterns": [
+            r"//\s*(?:const|let|var|function|if|for|while|return)\b"
+        ]
+    }
+}
+
+
+class Language:
+    """One language's extensions, file filter, comment syntax and precompiled scan patterns"""
+
+    def __init__(self, name: str, extensions: Iterable[str], comment_syntax: Optional[str] = None,
+                 mock_patterns: Iterable[str] = (), commented_code_patterns: Iterable[str] = (),
+                 exclude_files: Iterable[str] = ()):
+        self.name = name
+        self.extensions = tuple(extensions)
+        self.comment_syntax = comment_syntax
+        self.exclude_files = tuple(exclude_files)
+        self.rules: Dict[str, Tuple[str, ...]] = {
+            "mocks": tuple(mock_patterns),
+            "commented_code": tuple(commented_code_patterns)
+        }
+        self._scanners: Dict[Tuple, Tuple] = {}
+
+    def accepts(self, file_path: str) -> bool:
+        """File filter: False for generated files and others matching exclude_files"""
+        filename = os.path.basename(file_path)
+        return not any(fnmatch.fnmatchcase(filename, pattern) for pattern in self.exclude_files)
+
+    def scanner(self, binary: bool = False, categories: Optional[Iterable[str]] = None):
+        """(combined regex, [(category, pattern, regex)]) for this language's patterns, compiled once.
+        The combined regex finds candidate offsets; each pattern on its own attributes the matches.
+        binary=True compiles them for bytes (memory-mapped files)."""
+        categories = tuple(categories or [category for category, _ in SCAN_CATEGORIES])
+        key = (binary, categories)
+        scanner = self._scanners.get(key)
+        if scanner is None:
+            encode = (lambda pattern: pattern.encode('utf-8')) if binary else (lambda pattern: pattern)
+            entries = [
+                (category, pattern, re.compile(encode(pattern)))
+                for category, _ in SCAN_CATEGORIES if category in categories
+                for pattern in self.rules[category]
+            ]
+            try:
+                combined = re.compile(encode("|".join(f"(?:{pattern})" for _, pattern, _ in entries))) \
+                    if entries else None
+            except re.error:
+                combined = None  # e.g. inline global flags; scan pattern by pattern instead
+            scanner = self._scanners[key] = (combined, entries)
+        return scanner
+
+    def describe(self) -> Dict[str, Any]:
+        """Everything that affects scan results, for cache signatures"""
+        return {
+            "name": self.name,
+            "extensions": list(self.extensions),
+            "comment_syntax": self.comment_syntax,
+            "exclude_files": list(self.exclude_files),
+            "rules": {category: list(patterns) for category, patterns in self.rules.items()}
+        }
+
+
+class LanguageRegistry:
+    """File extension -> Language; unknown extensions fall back to a generic rule set"""
+
+    def __init__(self, languages: Iterable[Language] = (), fallback: Optional[Language] = None):
+        self.languages: List[Language] = []
+        self._by_extension: Dict[str, Language] = {}
+        self.fallback = fallback
+        for language in languages:
+            self.register(language)
+
+    def register(self, language: Language):
+        self.languages.append(language)
+        for extension in language.extensions:
+            self._by_extension[extension.lower()] = language
+
+    def for_path(self, file_path: str) -> Optional[Language]:
+        """The language analyzing file_path, or None if no registered language takes it"""
+        language = self._by_extension.get(os.path.splitext(file_path)[1].lower())
+        if language is None or not language.accepts(file_path):
+            return None
+        return language
+
+    def extensions(self) -> List[str]:
+        return list(self._by_extension)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        described = [language.describe() for language in self.languages]
+        if self.fallback is not None:
+            described.append(self.fallback.describe())
+        return described
+
+
+def build_registry(config: Dict[str, Any]) -> LanguageRegistry:
+    """Registry for a CodeAnalyzer config.
+
+    config["languages"]: enabled language names (keys of LANGUAGES or of language_rules).
+    config["language_rules"]: per-language overrides or additions, same shape as LANGUAGES.
+    The top-level mock_patterns / commented_code_patterns are Python's patterns and the
+    fallback rule set for files of other extensions that are analyzed explicitly.
+    """
+    top_level = {config_key: config.get(config_key, []) for _, config_key in SCAN_CATEGORIES}
+    overrides = config.get("language_rules", {})
+    languages = []
+    for name in config.get("languages", ["python", "java"]):
+        spec = {**LANGUAGES.get(name, {}), **overrides.get(name, {})}
+        if name == "python":
+            spec = {**top_level, **spec}
+        if not spec.get("extensions"):
+            continue
+        languages.append(Language(
+            name,
+            spec["extensions"],
+            spec.get("comment_syntax"),
+            spec.get("mock_patterns", []),
+            spec.get("commented_code_patterns", []),
+            spec.get("exclude_files", [])
+        ))
+    fallback = Language("generic", [], None, top_level["mock_patterns"], top_level["commented_code_patterns"])
+    return LanguageRegistry(languages, fallback)
@@ -4,15 +4,21 @@ Claude Desktop Automation API Server
 Flask wrapper for claude_desktop_automation.py to enable HTTP API access
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, g
 import logging
 import json
 import threading
-import queue
+import requests
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
 from claude_desktop_automation import ClaudeDesktopAutomation
+from session_pool import SessionPool
+from job_queue import JobQueue, DEFAULT_DB_PATH
+from result_store import ResultStore, FINISHED_STATUSES
+from metrics import metrics, span
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -24,68 +30,239 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global automation instance
+# Global automation instance (first session) and the pool of all sessions
 claude_automation = None
+session_pool = None
 
-# Task queue for async execution
-task_queue = queue.Queue()
-task_results = {}
-task_status = {}
+# Durable job queue for async execution (opened in __main__)
+job_queue = None
+# Bounded cache of recent job status/results; misses fall back to job_queue
+results = ResultStore()
+worker_stop = threading.Event()
 
-# Background worker thread
-def automation_worker():
-    """Background worker to process automation tasks"""
-    while True:
+# Finished jobs are removed from the queue database after this long
+JOB_RETENTION_S = 7 * 24 * 3600
+PRUNE_INTERVAL_S = 600
+
+# Long-poll and completion webhook settings
+MAX_STATUS_WAIT_S = 60
+CALLBACK_ATTEMPTS = 3
+CALLBACK_TIMEOUT_S = 10
+
+def lookup_task(task_id):
+    """Status response for a task, or None if unknown"""
+    entry = results.get(task_id)
+    if entry is None:
+        # Evicted or from before a restart: rebuild from the queue database
+        job = job_queue.get(task_id)
+        if not job:
+            return None
+        result = None
+        if job['finished_at']:
+            result = {
+                'success': job['result'] if job['status'] == 'completed' else False,
+                'completed_at': datetime.fromtimestamp(job['finished_at']).isoformat(),
+                'error': job['error']
+            }
+        results.seed(task_id, job['status'], result)
+        entry = {'status': job['status'], 'result': result} if result else {'status': job['status']}
+
+    response = {
+        'task_id': task_id,
+        'status': entry['status']
+    }
+
+    if 'result' in entry:
+        response['result'] = entry['result']
+
+    return response
+
+def post_callback(url, body):
+    """POST a completion notification, retrying with backoff"""
+    for attempt in range(CALLBACK_ATTEMPTS):
         try:
-            task = task_queue.get(timeout=1)
-            if task is None:
-                break
-                
-            task_id = task['id']
-            task_status[task_id] = 'running'
-            
+            response = requests.post(url, json=body, timeout=CALLBACK_TIMEOUT_S)
+            if response.ok:
+                logger.info(f"Callback delivered for task {body['task_id']} to {url}")
+                return True
+            logger.warning(f"Callback to {url} returned {response.status_code}")
+        except requests.RequestException as e:
+            logger.warning(f"Callback to {url} failed: {e}")
+        if attempt < CALLBACK_ATTEMPTS - 1:
+            time.sleep(2 ** attempt)
+    logger.error(f"Giving up on callback for task {body['task_id']} to {url}")
+    return False
+
+def send_callbacks(task_id, urls=None):
+    """Notify the task's registered callback URLs in background threads"""
+    urls = urls if urls is not None else job_queue.callbacks(task_id)
+    if not urls:
+        return
+    body = lookup_task(task_id)
+    for url in urls:
+        threading.Thread(target=post_callback, args=(url, body), daemon=True).start()
+
+# Prompt batching: small prompts for the same project and chat that are already
+# queued together are sent as one composite message. A lone prompt is sent at
+# once; the window only holds a batch open for stragglers once it has partners
+BATCH_WINDOW_S = 2.0
+BATCH_MAX_JOBS = 5
+BATCH_MAX_PROMPT_CHARS = 2000
+
+def is_batchable(task):
+    """Small prompts that continue the current chat can share a message"""
+    return (
+        not task.get('create_new_chat', False)
+        and len(task.get('prompt', '')) <= BATCH_MAX_PROMPT_CHARS
+    )
+
+def collect_batch(job):
+    """Claim queued jobs compatible with job, waiting for stragglers only when
+    the lane already has a compatible job queued"""
+    task = job['payload']
+    if BATCH_WINDOW_S <= 0 or BATCH_MAX_JOBS <= 1 or not is_batchable(task):
+        return [job]
+
+    wait_for_continue = task.get('wait_for_continue', True)
+
+    def compatible(other):
+        return is_batchable(other) and other.get('wait_for_continue', True) == wait_for_continue
+
+    others = job_queue.claim_matching(job['lane'], compatible, BATCH_MAX_JOBS - 1)
+    if others and len(others) < BATCH_MAX_JOBS - 1:
+        worker_stop.wait(BATCH_WINDOW_S)
+        others += job_queue.claim_matching(job['lane'], compatible, BATCH_MAX_JOBS - 1 - len(others))
+    return [job] + others
+
+def build_batch_prompt(tasks):
+    """Combine several prompts into one message with numbered sections"""
+    count = len(tasks)
+    sections = [
+        f"The following {count} requests were combined into one message. "
+        f"Handle each one in order and begin each answer with its \"### Response N of {count}\" header."
+    ]
+    for index, task in enumerate(tasks, 1):
+        sections.append(f"### Request {index} of {count}\n{task['prompt']}")
+    return "\n\n".join(sections)
+
+def run_prompt(automation, task, prompt):
+    """Send one prompt through a session's desktop automation"""
+    if task.get('create_new_chat') and task.get('context_summary'):
+        # run_automation has no summary parameter; the new chat gets it as a preamble
+        prompt = f"Context from the previous conversation:\n{task['context_summary']}\n\n{prompt}"
+    return automation.run_automation(
+        input_text_content=prompt,
+        wait_for_continue=task.get('wait_for_continue', True),
+        create_new_chat=task.get('create_new_chat', False),
+        project_name=task.get('project_name')
+    )
+
+def finish_job(task_id, success, error=None, **extra):
+    """Record a job outcome in the result store and queue, then notify callbacks"""
+    results.set(task_id, 'completed' if error is None else 'failed', {
+        'success': success,
+        'completed_at': datetime.now().isoformat(),
+        'error': error,
+        **extra
+    })
+    job_queue.complete(task_id, error is None, result=success if error is None else None, error=error)
+    metrics.inc("jobs_total", help_text="Finished automation jobs by outcome",
+                status='completed' if error is None else 'failed')
+    send_callbacks(task_id)
+
+def process_jobs(session, jobs):
+    """Run one job, or a batch of compatible jobs as a single composite prompt"""
+    tasks = [job['payload'] for job in jobs]
+    for job in jobs:
+        results.set(job['id'], 'running')
+        metrics.observe("job_queue_wait_seconds", job['started_at'] - job['created_at'],
+                        "Time jobs spent queued before a session claimed them")
+
+    batch_info = [{}]
+    if len(jobs) > 1:
+        batch_id = str(uuid.uuid4())
+        batch_info = [
+            {
+                'batch_id': batch_id,
+                'batch_index': index,
+                'batch_size': len(jobs),
+                'shared_outcome': True,
+                'response_header': f"### Response {index + 1} of {len(jobs)}"
+            }
+            for index in range(len(jobs))
+        ]
+        logger.info(f"Sending {len(jobs)} queued prompts for '{jobs[0]['lane']}' as batch {batch_id}")
+
+    try:
+        prompt = build_batch_prompt(tasks) if len(jobs) > 1 else tasks[0]['prompt']
+        # Execute automation
+        with span("api.process_jobs", session=session.index):
+            result = run_prompt(session.automation, tasks[0], prompt)
+        # run_automation only reports whether the message was sent and answered, not
+        # the reply text, so every job in a batch gets that same outcome. There is no
+        # per-request output; response_header names the job's section in the chat
+        for job, info in zip(jobs, batch_info):
+            finish_job(job['id'], result, **info)
+
+    except Exception as e:
+        logger.error(f"Error processing task(s) {', '.join(job['id'] for job in jobs)}: {str(e)}")
+        for job, info in zip(jobs, batch_info):
+            finish_job(job['id'], False, error=str(e), **info)
+
+# Background worker threads, one per session
+def automation_worker(session):
+    """Background worker to process automation tasks in one session's window"""
+    last_prune = 0.0
+    while not worker_stop.is_set():
+        try:
+            if session.index == 0 and time.monotonic() - last_prune > PRUNE_INTERVAL_S:
+                job_queue.prune(JOB_RETENTION_S)
+                last_prune = time.monotonic()
+
+            # Prefer the project whose chat is already open in this window; chats
+            # opened in another window stay with that window
+            job = job_queue.claim(timeout=1, prefer_lane=session.current_project, owner=session.index)
+            if job is None:
+                continue
+
+            jobs = collect_batch(job)
+            session.begin(job['lane'], [j['id'] for j in jobs])
             try:
-                # Execute automation
-                result = claude_automation.run_automation(
-                    input_text_content=task['prompt'],
-                    wait_for_continue=task.get('wait_for_continue', True),
-                    create_new_chat=task.get('create_new_chat', False),
-                    project_name=task.get('project_name'),
-                    conversation_summary_for_new_chat=task.get('context_summary', '')
-                )
-                
-                task_results[task_id] = {
-                    'success': result,
-                    'completed_at': datetime.now().isoformat(),
-                    'error': None
-                }
-                task_status[task_id] = 'completed'
-                
-            except Exception as e:
-                logger.error(f"Error processing task {task_id}: {str(e)}")
-                task_results[task_id] = {
-                    'success': False,
-                    'completed_at': datetime.now().isoformat(),
-                    'error': str(e)
-                }
-                task_status[task_id] = 'failed'
-                
-        except queue.Empty:
-            continue
+                process_jobs(session, jobs)
+            finally:
+                session.end()
+
         except Exception as e:
-            logger.error(f"Worker thread error: {str(e)}")
+            logger.error(f"Worker thread error (session {session.index}): {str(e)}")
 
 # Initialize automation on startup
-def initialize_automation():
-    global claude_automation
+def initialize_automation(session_count=1, display_backend=None, app_command=None):
+    global claude_automation, session_pool
     try:
-        claude_automation = ClaudeDesktopAutomation()
+        session_pool = SessionPool.create(session_count, display_backend=display_backend, app_command=app_command)
+        claude_automation = session_pool.primary
         logger.info("Claude Desktop Automation initialized successfully")
         return True
     except Exception as e:
         logger.error(f"Failed to initialize Claude Desktop Automation: {str(e)}")
         return False
 
+# Request timing for /metrics
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # The route pattern, not the path, keeps task ids out of the label set
+        metrics.observe("http_request_duration_seconds", time.perf_counter() - started,
+                        "API request latency", method=request.method,
+                        endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                        status=response.status_code)
+    return response
+
 # API Endpoints
 
 @app.route('/health', methods=['GET'])
@@ -108,8 +285,20 @@ def run_automation_api():
         "wait_for_continue": bool (optional, default: true),
         "create_new_chat": bool (optional, default: false),
         "project_name": "string" (optional),
-        "context_summary": "string" (optional)
+        "context_summary": "string" (optional),
+        "priority": "high" | "normal" | "low" | int (optional, default: normal),
+        "callback_url": "string" (optional, POSTed the final status on completion)
     }
+
+    Identical prompts that are still queued or running are not queued twice;
+    the existing task_id is returned with "deduplicated": true.
+
+    Short prompts that continue a chat may be sent together with other prompts
+    already queued for the same project. Their results then carry batch_id,
+    batch_index, batch_size and "shared_outcome": true: success reports whether
+    the combined message was answered, and is the same for every job in the
+    batch. No per-request output is returned; each answer is in the chat under
+    the job's response_header.
     """
     if not claude_automation:
         return jsonify({'error': 'Automation not initialized'}), 503
@@ -120,6 +309,10 @@ def run_automation_api():
         # Validate required fields
         if not data or 'prompt' not in data:
             return jsonify({'error': 'Missing required field: prompt'}), 400
+
+        callback_url = data.get('callback_url')
+        if callback_url and urlparse(callback_url).scheme not in ('http', 'https'):
+            return jsonify({'error': 'callback_url must be an http(s) URL'}), 400
         
         # Create task
         task_id = str(uuid.uuid4())
@@ -134,9 +327,28 @@ def run_automation_api():
         }
         
         # Add to queue
-        task_queue.put(task)
-        task_status[task_id] = 'queued'
-        
+        try:
+            task_id, created = job_queue.enqueue(task, priority=data.get('priority'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if callback_url:
+            job_queue.add_callback(task_id, callback_url)
+
+        if not created:
+            status = job_queue.get(task_id)['status']
+            if callback_url and status in FINISHED_STATUSES:
+                # Finished before the callback was registered; deliveries are at-least-once
+                send_callbacks(task_id, [callback_url])
+            return jsonify({
+                'task_id': task_id,
+                'status': status,
+                'deduplicated': True,
+                'message': 'Identical automation task already pending'
+            }), 200
+
+        results.seed(task_id, 'queued')
+
         return jsonify({
             'task_id': task_id,
             'status': 'queued',
@@ -149,20 +361,64 @@ def run_automation_api():
 
 @app.route('/api/automation/status/<task_id>', methods=['GET'])
 def get_task_status_api(task_id):
-    """Get status of an automation task"""
-    if task_id not in task_status:
+    """Get status of an automation task
+
+    Query parameters:
+        wait: seconds to hold the request until the task finishes (max 60)
+    """
+    response = lookup_task(task_id)
+    if response is None:
         return jsonify({'error': 'Task not found'}), 404
-    
-    response = {
-        'task_id': task_id,
-        'status': task_status[task_id]
-    }
-    
-    if task_id in task_results:
-        response['result'] = task_results[task_id]
+
+    wait = request.args.get('wait', type=float)
+    if wait and wait > 0 and response['status'] not in FINISHED_STATUSES:
+        results.wait(task_id, min(wait, MAX_STATUS_WAIT_S))
+        response = lookup_task(task_id)
     
     return jsonify(response)
 
+@app.route('/api/automation/cancel/<task_id>', methods=['POST'])
+def cancel_task_api(task_id):
+    """Cancel a queued automation task"""
+    status = job_queue.cancel(task_id)
+    if status is None:
+        return jsonify({'error': 'Task not found'}), 404
+
+    if status != 'cancelled':
+        return jsonify({
+            'task_id': task_id,
+            'status': status,
+            'error': f'Task is {status} and can no longer be cancelled'
+        }), 409
+
+    results.set(task_id, 'cancelled')
+    send_callbacks(task_id)
+    return jsonify({'task_id': task_id, 'status': 'cancelled'})
+
+@app.route('/api/automation/queue', methods=['GET'])
+def get_queue_stats_api():
+    """Get job counts by status and queued jobs per project lane"""
+    return jsonify(job_queue.stats())
+
+@app.route('/api/automation/sessions', methods=['GET'])
+def get_sessions_api():
+    """Get what each automation session (Claude window) is working on"""
+    if not session_pool:
+        return jsonify({'error': 'Automation not initialized'}), 503
+    return jsonify({'sessions': session_pool.status()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics_api():
+    """Prometheus text exposition of automation, queue and request metrics"""
+    if job_queue:
+        stats = job_queue.stats()
+        for status in ('queued', 'running'):
+            metrics.set_gauge("jobs", stats['by_status'].get(status, 0), "Jobs in the queue by status", status=status)
+    if session_pool:
+        metrics.set_gauge("sessions_busy", sum(1 for s in session_pool.status() if s['busy']),
+                          "Sessions currently running a prompt")
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/automation/create_new_chat', methods=['POST'])
 def create_new_chat_api():
     """Create a new chat via projects"""
@@ -272,18 +528,44 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=5001, help='Port to listen on')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--queue-db', default=DEFAULT_DB_PATH, help='SQLite file for the job queue')
+    parser.add_argument('--results-max', type=int, default=1000, help='Max job results kept in memory')
+    parser.add_argument('--results-ttl', type=float, default=3600, help='Seconds an unused result stays in memory')
+    parser.add_argument('--results-history', default=None, help='Append finished results to this JSONL file')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW_S,
+                        help='Seconds a batch waits for more compatible prompts once the lane already has '
+                             'one queued (0 disables batching)')
+    parser.add_argument('--batch-max', type=int, default=BATCH_MAX_JOBS, help='Max prompts per batch')
+    parser.add_argument('--sessions', type=int, default=1,
+                        help='Number of Claude windows to drive in parallel (one worker per window)')
+    parser.add_argument('--display-backend', choices=['pyautogui', 'xvfb'], default=None,
+                        help='Screen/input backend (default: display_backend from the automation config); '
+                             'xvfb gives each session its own virtual display')
+    parser.add_argument('--app-command', default=None,
+                        help='Command that starts Claude Desktop on each Xvfb display')
+    parser.add_argument('--trace-file', default=None,
+                        help='Append timing spans of every automation cycle to this JSONL file')
     
     args = parser.parse_args()
+
+    results = ResultStore(args.results_max, args.results_ttl, args.results_history)
+    metrics.configure(trace_file=args.trace_file)
+    BATCH_WINDOW_S = args.batch_window
+    BATCH_MAX_JOBS = args.batch_max
+
+    # Open the job queue and pick up anything a previous run left in flight
+    job_queue = JobQueue(args.queue_db)
+    job_queue.recover_in_flight()
     
     # Initialize automation
-    if not initialize_automation():
+    if not initialize_automation(args.sessions, args.display_backend, args.app_command):
         logger.error("Failed to initialize automation. Exiting.")
         exit(1)
     
-    # Start worker thread
-    worker_thread = threading.Thread(target=automation_worker, daemon=True)
-    worker_thread.start()
-    logger.info("Worker thread started")
+    # Start one worker thread per session
+    for session in session_pool:
+        threading.Thread(target=automation_worker, args=(session,), daemon=True).start()
+    logger.info(f"{len(session_pool)} worker thread(s) started")
     
     # Start Flask app
     logger.info(f"Starting Claude Desktop Automation API Server on {args.host}:{args.port}")
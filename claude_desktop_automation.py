@@ -1,21 +1,16 @@
-import pyautogui
 import time
 import os
 import logging
 import argparse
 import json
-from typing import Optional, Tuple
+import threading
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
-try:
-    import pyperclip
-except ImportError:
-    pyperclip = None
-try:
-    from PIL import ImageGrab
+from display_backend import DisplayBackend, DisplayBackendError, create_backend, NUMPY_AVAILABLE
+from metrics import metrics, span, traced
+from timing_model import TimingModel, DEFAULT_HISTORY_FILE, initial_wait_for, poll_interval_for, timeout_for
+if NUMPY_AVAILABLE:
     import numpy as np
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
 
 # Create logs directory
 LOGS_DIR = "logs"
@@ -34,18 +29,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger("claude_automation")
 
+# Keyboard and mouse are shared by every window on a display, so sessions
+# driving different windows take this lock while they type or click
+DISPLAY_INPUT_LOCK = threading.RLock()
+
 class ClaudeDesktopAutomation:
-    def __init__(self, config_path="claude_desktop_config.json", project_root_path="."):
+    def __init__(self, config_path="claude_desktop_config.json", project_root_path=".",
+                 window_index: Optional[int] = None, region: Optional[Tuple[int, int, int, int]] = None,
+                 input_lock: Optional[threading.RLock] = None, backend: Optional[DisplayBackend] = None):
         """
         Initialize Claude Desktop GUI automation class
         
         Args:
             config_path (str, optional): Configuration file path.
             project_root_path (str, optional): Project root path. Base for assets_dir relative paths.
+            window_index (int, optional): Which of the matching Claude windows to drive. When set,
+                the window keeps its geometry instead of being maximized.
+            region (tuple, optional): (left, top, width, height) screen area to search and watch.
+                Defaults to the bound window's area, or the full screen when unbound.
+            input_lock (RLock, optional): Lock serializing keyboard/mouse input between sessions.
+            backend (DisplayBackend, optional): Screen/input backend. Defaults to the one named by
+                the "display_backend" config key (pyautogui unless configured otherwise).
         """
         self.default_config = {
             "window_title": "Claude",
             "input_delay": 0.5,
+            "paste_verify_timeout_s": 1.0,         # Max wait for pasted text to show up on screen
+            "paste_max_attempts": 2,
+            "input_poll_interval_s": 0.03,
+            "input_baseline_s": 1.0,               # Max time sampling the cleared box; stops early on a caret toggle
+            "input_box_fraction": [0.0, 0.8, 1.0, 0.2],  # Input box as (left, top, width, height) of the session region
             "screenshot_delay": 1.0,
             "max_retries": 3,
             "confidence_threshold": 0.7,
@@ -69,7 +82,15 @@ class ClaudeDesktopAutomation:
             "max_wait_for_complex_tasks_s": 1800,  # 30 minutes for complex tasks
             "activity_timeout_extension_s": 300,    # Extend by 5 minutes on activity
             "max_check_interval_s": 60,            # Max interval between checks
-            "activity_detection_threshold": 0.02    # 2% pixel change threshold
+            "activity_detection_threshold": 0.02,   # 2% pixel change threshold
+            # Learned timing: predict completion from past responses of similar prompts
+            "timing_model_enabled": True,
+            "timing_history_file": DEFAULT_HISTORY_FILE,
+            "timing_dense_interval_s": 2,           # Check interval around the predicted finish
+            "timing_quiet_period_s": 10,            # Screen idle this long near the predicted finish = done
+            # Display backend: "pyautogui" (desktop) or "xvfb" (headless virtual display)
+            "display_backend": "pyautogui",
+            "display_backend_options": {}           # e.g. {"display": ":99"} or {"app_command": [...]}
         }
         
         self.config = self.default_config.copy()
@@ -112,9 +133,20 @@ class ClaudeDesktopAutomation:
         # Check required images
         self._check_required_images()
         
+        self.backend = backend or create_backend(self.config["display_backend"],
+                                                 **self.config.get("display_backend_options", {}))
+        self.window_index = window_index
+        self.fixed_region = region
+        self.region = region
+        self.input_lock = input_lock or DISPLAY_INPUT_LOCK
+        
         self.window_active = False
         self.last_screenshot = None
+        self.empty_box_frames: Dict[Tuple[int, int, int, int], set] = {}  # Cleared-box checksums per box position
         self.task_complexity_score = 5  # Default complexity score
+        self.timing_model = TimingModel.shared(self.config["timing_history_file"]) \
+            if self.config.get("timing_model_enabled", True) else None
+        self.current_prompt_chars = 0
         logger.info("Claude Desktop automation initialization complete")
     
     def _check_required_images(self):
@@ -146,21 +178,31 @@ class ClaudeDesktopAutomation:
         self.task_complexity_score = max(1, min(10, complexity_score))
         logger.info(f"Task complexity set to: {self.task_complexity_score}/10")
     
+    @traced("activate_window")
     def activate_window(self):
         try:
-            windows = pyautogui.getWindowsWithTitle(self.config["window_title"])
-            if windows:
-                window = windows[0]
+            windows = self.backend.get_windows(self.config["window_title"])
+            index = self.window_index or 0
+            if len(windows) > index:
+                window = windows[index]
+                changed = False
                 if not window.isActive: # Don't reactivate if already active
                     window.activate()
-                if not window.isMaximized: # Maximize if not already maximized (optional)
-                    window.maximize()
-                time.sleep(1) 
+                    changed = True
+                if self.window_index is None:
+                    if not window.isMaximized: # Maximize if not already maximized (optional)
+                        window.maximize()
+                        changed = True
+                elif self.fixed_region is None:
+                    # Windows bound to a session stay side by side; watch only this one
+                    self.region = (window.left, window.top, window.width, window.height)
+                if changed:
+                    time.sleep(1)
                 self.window_active = True
-                logger.info(f"'{self.config['window_title']}' window activated successfully")
+                logger.info(f"'{self.config['window_title']}' window #{index} activated successfully")
                 return True
             else:
-                logger.error(f"'{self.config['window_title']}' window not found.")
+                logger.error(f"'{self.config['window_title']}' window #{index} not found.")
                 return False
         except Exception as e:
             logger.error(f"Error activating window: {e}")
@@ -179,19 +221,18 @@ class ClaudeDesktopAutomation:
         
         for attempt in range(max_retries):
             try:
-                # pyautogui.locateCenterOnScreen searches entire screen
-                # To search only within active window, additional logic needed (e.g., capture window area first)
-                # Using simple full screen search here
-                location = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
+                # Searches the session's region (its window), or the whole screen when unbound
+                location = self.backend.locate_center(image_path, confidence=confidence, region=self.region)
                 if location:
-                    pyautogui.click(location)
+                    with self.input_lock:
+                        self.backend.click(*location)
                     logger.info(f"Image clicked successfully: {image_path} at {location}")
                     return True
                 else:
                     logger.warning(f"Image not found on screen ({attempt+1}/{max_retries}): {image_path}")
                     time.sleep(self.config["screenshot_delay"])
-            except pyautogui.PyAutoGUIException as e: # PyAutoGUI specific exceptions
-                logger.error(f"PyAutoGUI error while finding/clicking image ({image_path}): {e}")
+            except DisplayBackendError as e: # Display backend specific exceptions
+                logger.error(f"Display backend error while finding/clicking image ({image_path}): {e}")
                 time.sleep(self.config["screenshot_delay"])
             except Exception as e: # Other exceptions
                 logger.error(f"Unexpected error while finding/clicking image ({image_path}): {e}")
@@ -200,10 +241,11 @@ class ClaudeDesktopAutomation:
         logger.error(f"Failed to find image (max retries exceeded): {image_path}")
         return False
     
+    @traced("detect_activity")
     def _detect_screen_activity(self) -> bool:
         """Detect if Claude is still actively working by checking screen changes"""
-        if not PIL_AVAILABLE:
-            logger.debug("PIL not available, activity detection disabled")
+        if not NUMPY_AVAILABLE:
+            logger.debug("numpy not available, activity detection disabled")
             return False
             
         if not self.config.get("activity_detection_enabled", True):
@@ -211,8 +253,7 @@ class ClaudeDesktopAutomation:
             
         try:
             # Take screenshot
-            current_screenshot = ImageGrab.grab()
-            current_array = np.array(current_screenshot)
+            current_array = self.backend.screenshot(self.region)
             
             if self.last_screenshot is not None:
                 # Calculate difference between screenshots
@@ -294,7 +335,7 @@ class ClaudeDesktopAutomation:
             logger.info(prompt_message)
             logger.info("Please hover mouse over the button to capture and wait 5 seconds...")
             time.sleep(5)
-            x, y = pyautogui.position()
+            x, y = self.backend.cursor_position()
             
             # Capture area around button (could be improved to allow user to adjust size)
             # Example: 100px width, 50px height area
@@ -302,12 +343,13 @@ class ClaudeDesktopAutomation:
             logger.info("Specify button area. First click: top-left, Second click: bottom-right (within 10 seconds)")
             
             # Simple fixed-size capture for simplicity
-            # Could use pyautogui.prompt or tkinter for more sophisticated UI
+            # Could use tkinter for more sophisticated UI
             capture_width = 150 
             capture_height = 60
             region = (x - capture_width // 2, y - capture_height // 2, capture_width, capture_height)
             
-            screenshot = pyautogui.screenshot(region=region)
+            from PIL import Image
+            screenshot = Image.fromarray(self.backend.screenshot(region))
             
             image_path = os.path.join(self.assets_dir, image_file_name)
             screenshot.save(image_path)
@@ -324,38 +366,101 @@ class ClaudeDesktopAutomation:
             logger.error(f"Error capturing button ({image_file_name}): {e}")
             return False
     
+    def _input_box_region(self) -> Tuple[int, int, int, int]:
+        """Screen area of the message input, from input_box_fraction of the session region"""
+        if self.region:
+            left, top, width, height = self.region
+        else:
+            height, width = self.backend.screenshot().shape[:2]
+            left, top = 0, 0
+        x, y, w, h = self.config["input_box_fraction"]
+        return (left + int(width * x), top + int(height * y), max(1, int(width * w)), max(1, int(height * h)))
+
+    def _frame_variants(self, region, duration_s: float, known: set = frozenset()) -> set:
+        """Checksums the region shows for up to duration_s: a late repaint, both caret blink phases.
+
+        Stops once the caret toggles back to a frame already seen, or once two
+        consecutive frames match known (frames recorded for this box before).
+        """
+        interval = self.config["input_poll_interval_s"]
+        deadline = time.monotonic() + duration_s
+        previous = self.backend.frame_checksum(region)
+        variants = {previous}
+        repeats = 0
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            current = self.backend.frame_checksum(region)
+            if current != previous and current in variants:
+                break
+            repeats = repeats + 1 if current in known else 0
+            if repeats >= 2:
+                break
+            variants.add(current)
+            previous = current
+        return variants
+
+    def _wait_for_screen_settle(self, region, baselines, timeout_s: float) -> bool:
+        """Poll region until it differs from every baseline checksum
+        and holds still for one poll. Returns False on timeout."""
+        interval = self.config["input_poll_interval_s"]
+        deadline = time.monotonic() + timeout_s
+        previous = None
+        while time.monotonic() < deadline:
+            current = self.backend.frame_checksum(region)
+            if current not in baselines and current == previous:
+                return True
+            previous = current
+            time.sleep(interval)
+        return False
+
+    @traced("input_text")
     def input_text(self, text):
         if not self.window_active:
             if not self.activate_window():
                 return False
         try:
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.1)
-            pyautogui.press('delete')
-            time.sleep(0.1)
-            
-            # Use clipboard for long text input for better reliability
-            if pyperclip and len(text) > 100:
-                pyperclip.copy(text)
-                pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.2)
-                logger.info(f"Text input complete via clipboard (first 50 chars): {text[:50]}...")
-            else:
-                pyautogui.write(text, interval=0.01)
-                logger.info(f"Text input complete (first 50 chars): {text[:50]}...")
-            
+            # Only the input box is watched, so a response still streaming elsewhere cannot pass for the paste
+            box = self._input_box_region()
+            original = self.backend.frame_checksum(box)
+            # Key events are delivered in order, so the paste never overtakes the clear
+            self.backend.hotkey('ctrl', 'a')
+            self.backend.press('delete')
+            # Baseline: everything the box shows once cleared, however late the clear renders.
+            # Frames from earlier prompts cover caret phases this short sample may miss
+            known = self.empty_box_frames.get(box, set())
+            cleared = self._frame_variants(box, self.config["input_baseline_s"], known)
+            baselines = {original} | cleared | known
+            if len(known) >= 8:
+                known = set()  # Stale frames from a theme or layout change; start over
+            self.empty_box_frames[box] = (known | cleared) - {original}
+
+            if self.backend.set_clipboard(text):
+                for attempt in range(1, self.config["paste_max_attempts"] + 1):
+                    self.backend.hotkey('ctrl', 'v')
+                    if self._wait_for_screen_settle(box, baselines, self.config["paste_verify_timeout_s"]):
+                        logger.info(f"Text input complete via clipboard ({self.backend.clipboard.name}, "
+                                    f"first 50 chars): {text[:50]}...")
+                        return True
+                    logger.warning(f"Paste not visible on screen (attempt {attempt}); clearing and retrying")
+                    self.backend.hotkey('ctrl', 'a')
+                    self.backend.press('delete')
+                logger.warning("Paste could not be verified; falling back to typing")
+
+            self.backend.write(text)
+            logger.info(f"Text input complete via typing (first 50 chars): {text[:50]}...")
             return True
         except Exception as e:
             logger.error(f"Error inputting text: {e}")
             return False
     
+    @traced("press_enter")
     def press_enter(self):
         if not self.window_active: # Check window activation before Enter
             if not self.activate_window():
                 logger.warning("Failed to activate window before pressing Enter.")
                 # Policy needed: fail or continue
         try:
-            pyautogui.press('enter')
+            self.backend.press('enter')
             logger.info("Enter key pressed")
             return True
         except Exception as e:
@@ -374,25 +479,28 @@ class ClaudeDesktopAutomation:
             logger.debug(f"Image file not found for check: {image_path}")
             return False
         try:
-            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+            location = self.backend.locate(image_path, confidence=confidence, region=self.region)
             return location is not None
-        except pyautogui.PyAutoGUIException as e:
-            logger.error(f"PyAutoGUI error checking image {image_path}: {e}")
+        except DisplayBackendError as e:
+            logger.error(f"Display backend error checking image {image_path}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error checking image {image_path}: {e}")
         return False
 
+    @traced("detect_usage_limit")
     def check_usage_limit_message(self) -> bool:
         """Check if usage limit message is displayed."""
         logger.debug(f"Checking for usage limit message: {self.usage_limit_message_image_path}")
         return self.check_image_on_screen(self.usage_limit_message_image_path)
     
+    @traced("detect_max_length")
     def check_max_length_message(self) -> bool:
         """Check if max length message is displayed on screen"""
         max_length_image = os.path.join(self.assets_dir, self.config.get("max_length_message_image", "max_length_message.png"))
         if os.path.exists(max_length_image):
             try:
-                location = pyautogui.locateOnScreen(max_length_image, confidence=self.config["confidence_threshold"])
+                location = self.backend.locate(max_length_image, confidence=self.config["confidence_threshold"],
+                                               region=self.region)
                 if location:
                     logger.info("Max length message detected")
                     return True
@@ -416,6 +524,7 @@ class ClaudeDesktopAutomation:
         logger.info(f"Attempting to find '{project_name}' project button ({project_button_image})...")
         return self.find_and_click_image(project_button_image)
     
+    @traced("new_chat")
     def create_new_chat_via_projects(self, project_name: str) -> bool:
         """Create new chat through Projects for the given project name."""
         logger.info(f"Creating new chat via Projects for project: '{project_name}'")
@@ -445,6 +554,7 @@ class ClaudeDesktopAutomation:
         logger.warning("click_new_chat_button is deprecated. Use create_new_chat_via_projects instead.")
         return False
     
+    @traced("wait_for_response")
     def _wait_for_response_core(self, project_name_for_new_chat: str, wait_for_continue_flag: bool) -> str:
         """
         Enhanced core logic for waiting for Claude's response with dynamic timeout and activity detection.
@@ -454,7 +564,6 @@ class ClaudeDesktopAutomation:
         
         # Calculate dynamic timeout based on task complexity
         max_wait_total = self._calculate_dynamic_timeout()
-        logger.info(f"Dynamic timeout set to {max_wait_total}s based on task complexity: {self.task_complexity_score}/10")
         
         # Timing parameters from config
         initial_wait = self.config.get("response_initial_wait_s", 30)
@@ -462,15 +571,44 @@ class ClaudeDesktopAutomation:
         check_interval_after_continue = self.config.get("response_check_interval_after_continue_s", 5)
         quick_check_duration_after_continue = self.config.get("response_quick_check_duration_s", 60)
         activity_extension = self.config.get("activity_timeout_extension_s", 300)
+        quiet_period = self.config.get("timing_quiet_period_s", 10)
+
+        # Learned prediction for this kind of prompt, if there is enough history
+        prediction = None
+        if self.timing_model:
+            prediction = self.timing_model.predict(project_name_for_new_chat, self.task_complexity_score,
+                                                   self.current_prompt_chars)
+        if prediction:
+            max_wait_total = timeout_for(prediction, self.config.get("response_max_wait_s", 300),
+                                         self.config.get("max_wait_for_complex_tasks_s", 1800))
+            initial_wait = initial_wait_for(prediction, initial_wait)
+            logger.info(f"Predicted response time {prediction.expected_s:.0f}s (p90 {prediction.upper_s:.0f}s, "
+                        f"{prediction.samples} samples from {prediction.key}); timeout {max_wait_total:.0f}s")
+        else:
+            logger.info(f"Dynamic timeout set to {max_wait_total}s based on task complexity: {self.task_complexity_score}/10")
+        # Without activity detection a quiet screen says nothing about completion
+        can_detect_idle = prediction is not None and NUMPY_AVAILABLE and self.config.get("activity_detection_enabled", True)
 
-        time.sleep(initial_wait)
-        elapsed_time = initial_wait
+        started = time.monotonic()
+        with span("initial_wait"):
+            time.sleep(initial_wait)
+        elapsed_time = time.monotonic() - started
         
         last_continue_click_time = 0
         continue_clicked_this_cycle = False
         last_activity_time = elapsed_time
+        activity_seen = False
         extended_timeout = max_wait_total
 
+        def finished(status: str, end_seen: bool) -> str:
+            # Only a seen end (screen went quiet after changing, or a handled Continue) is a
+            # response time; timeout and assumed-complete fallbacks would teach the model the
+            # wait itself and shrink later predictions. The last change marks the end.
+            if status == "success" and end_seen and self.timing_model:
+                self.timing_model.record(project_name_for_new_chat, self.task_complexity_score,
+                                         self.current_prompt_chars, max(last_activity_time, last_continue_click_time))
+            return status
+
         while elapsed_time < extended_timeout:
             # 1. Check for Usage Limit (highest priority)
             if self.check_usage_limit_message():
@@ -483,7 +621,9 @@ class ClaudeDesktopAutomation:
                 if not project_name_for_new_chat:
                     logger.error("Project name not provided, cannot handle max length by creating new chat.")
                     return "failure"
-                if self.create_new_chat_via_projects(project_name_for_new_chat):
+                with self.input_lock:
+                    created = self.create_new_chat_via_projects(project_name_for_new_chat)
+                if created:
                     logger.info("Successfully created new chat to handle max length.")
                     return "max_length_handled"
                 else:
@@ -492,7 +632,9 @@ class ClaudeDesktopAutomation:
 
             # 3. Check for Continue button (if applicable)
             if wait_for_continue_flag:
-                if self.find_and_click_image(self.continue_button_image, max_retries=1):
+                with span("detect_continue"):
+                    continue_clicked = self.find_and_click_image(self.continue_button_image, max_retries=1)
+                if continue_clicked:
                     logger.info("'Continue' button clicked.")
                     continue_clicked_this_cycle = True
                     last_continue_click_time = elapsed_time
@@ -500,11 +642,12 @@ class ClaudeDesktopAutomation:
                     self.last_screenshot = None
                 elif continue_clicked_this_cycle:
                     logger.info("Response generation appears complete after 'Continue' button.")
-                    return "success"
+                    return finished("success", end_seen=True)
             
             # 4. Activity detection - check if Claude is still working
             if self._detect_screen_activity():
                 last_activity_time = elapsed_time
+                activity_seen = True
                 # Extend timeout if activity detected and we're close to timeout
                 if elapsed_time > extended_timeout * 0.8:  # Within 80% of timeout
                     extended_timeout = min(
@@ -512,38 +655,50 @@ class ClaudeDesktopAutomation:
                         max_wait_total * 2  # Never exceed 2x original timeout
                     )
                     logger.info(f"Activity detected - extending timeout to {extended_timeout}s")
+            elif can_detect_idle and elapsed_time >= prediction.expected_s * 0.7 \
+                    and elapsed_time - last_activity_time >= quiet_period:
+                logger.info(f"No screen activity for {elapsed_time - last_activity_time:.0f}s around the "
+                            f"predicted finish - response complete.")
+                return finished("success", end_seen=activity_seen)
             
-            # Calculate progressive check interval
-            base_interval = check_interval_after_continue \
-                           if continue_clicked_this_cycle and (elapsed_time - last_continue_click_time < quick_check_duration_after_continue) \
-                           else check_interval_normal
-            
-            current_interval = self._calculate_check_interval(elapsed_time, base_interval)
+            # Calculate check interval: learned schedule if available, else progressive
+            if prediction:
+                current_interval = poll_interval_for(prediction, elapsed_time,
+                                                     self.config.get("timing_dense_interval_s", 2),
+                                                     self.config.get("max_check_interval_s", 60))
+            else:
+                base_interval = check_interval_after_continue \
+                               if continue_clicked_this_cycle and (elapsed_time - last_continue_click_time < quick_check_duration_after_continue) \
+                               else check_interval_normal
+                current_interval = self._calculate_check_interval(elapsed_time, base_interval)
             
             # Log progress every 5 checks or every 5 minutes
             if elapsed_time % 300 < current_interval:
                 progress_pct = (elapsed_time / extended_timeout) * 100
-                logger.info(f"Progress: {elapsed_time}s / {extended_timeout}s ({progress_pct:.1f}%) - "
-                          f"Last activity: {elapsed_time - last_activity_time}s ago")
+                logger.info(f"Progress: {elapsed_time:.0f}s / {extended_timeout:.0f}s ({progress_pct:.1f}%) - "
+                          f"Last activity: {elapsed_time - last_activity_time:.0f}s ago")
             
-            logger.debug(f"Waiting for {current_interval}s... (Total elapsed: {elapsed_time}s)")
-            time.sleep(current_interval)
-            elapsed_time += current_interval
+            logger.debug(f"Waiting for {current_interval:.1f}s... (Total elapsed: {elapsed_time:.1f}s)")
+            with span("poll_sleep"):
+                time.sleep(current_interval)
+            elapsed_time = time.monotonic() - started
 
         # Check if we should consider it successful based on activity
         if last_activity_time > extended_timeout * 0.9:  # Activity in last 10% of time
             logger.info("Recent activity detected - assuming task completion")
             return "success"
             
+        # The wait itself is no response time, but a screen that changed and then stayed quiet is
+        went_quiet = activity_seen and elapsed_time - last_activity_time >= quiet_period
         if not wait_for_continue_flag and not continue_clicked_this_cycle:
             logger.info("Short prompt response assumed complete.")
-            return "success"
+            return finished("success", end_seen=went_quiet)
             
         if continue_clicked_this_cycle:
             logger.info("Response generation complete (final 'Continue' button likely processed).")
-            return "success"
+            return finished("success", end_seen=went_quiet)
 
-        logger.warning(f"Response timeout after {extended_timeout} seconds (no recent activity for {elapsed_time - last_activity_time}s).")
+        logger.warning(f"Response timeout after {extended_timeout:.0f} seconds (no recent activity for {elapsed_time - last_activity_time:.0f}s).")
         return "timeout"
     
     def get_token_info(self) -> dict:
@@ -612,10 +767,12 @@ class ClaudeDesktopAutomation:
         logger.info("Button image setup complete.")
         logger.info(f"Images saved in {self.assets_dir}.")
     
+    @traced("run_automation")
     def run_automation(self, input_text_content: str, wait_for_continue: bool = True, create_new_chat: bool = False, 
                       project_name: Optional[str] = None, task_complexity: Optional[int] = None):
-        if not self.activate_window():
-            return False
+        with self.input_lock:
+            if not self.activate_window():
+                return False
 
         if not project_name:
             logger.error("Project name is required for Claude Desktop automation.")
@@ -631,24 +788,32 @@ class ClaudeDesktopAutomation:
         # Initial new chat creation if requested
         if create_new_chat:
             logger.info("Explicit request to create a new chat at the beginning.")
-            if not self.create_new_chat_via_projects(project_name):
-                logger.error("Failed to create initial new chat as requested.")
-                return False
+            with self.input_lock:
+                if not self.activate_window() or not self.create_new_chat_via_projects(project_name):
+                    logger.error("Failed to create initial new chat as requested.")
+                    return False
         
         while usage_limit_retry_count <= max_usage_limit_retries:
-            if usage_limit_retry_count > 0:
-                logger.info(f"Retrying after usage limit. Attempt {usage_limit_retry_count}/{max_usage_limit_retries}.")
-                if not self.create_new_chat_via_projects(project_name):
-                    logger.error("Failed to create new chat for retry. Aborting task.")
+            # Focus may have moved to another session's window since the last prompt
+            with self.input_lock:
+                if not self.activate_window():
                     return False
 
-            if not self.input_text(input_text_content):
-                return False
-            
-            if not self.press_enter():
-                return False
+                if usage_limit_retry_count > 0:
+                    logger.info(f"Retrying after usage limit. Attempt {usage_limit_retry_count}/{max_usage_limit_retries}.")
+                    if not self.create_new_chat_via_projects(project_name):
+                        logger.error("Failed to create new chat for retry. Aborting task.")
+                        return False
+
+                if not self.input_text(input_text_content):
+                    return False
+                
+                if not self.press_enter():
+                    return False
             
+            self.current_prompt_chars = len(input_text_content)
             response_status = self._wait_for_response_core(project_name, wait_for_continue)
+            metrics.inc("responses_total", help_text="Response waits by outcome", status=response_status)
 
             if response_status == "success":
                 logger.info("Automation for the current prompt completed successfully.")
@@ -674,8 +839,9 @@ class ClaudeDesktopAutomation:
             elif response_status == "max_length_handled":
                 logger.warning("Max length reached; new chat is ready with context preserved.")
                 # Continue with the same prompt in the new chat
-                if self.input_text(input_text_content):
-                    self.press_enter()
+                with self.input_lock:
+                    sent = self.activate_window() and self.input_text(input_text_content) and self.press_enter()
+                if sent:
                     response_status = self._wait_for_response_core(project_name, wait_for_continue)
                     if response_status == "success":
                         return True
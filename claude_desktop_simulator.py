@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Claude Desktop Simulator - a stand-in Claude window for end-to-end automation tests
+
+Renders a minimal Claude-like chat with tkinter: a Projects menu with project
+buttons, a message input, a streamed response with configurable timings, a
+Continue button for long responses, and max-length / usage-limit banners.
+Every state change is appended to a JSONL event log with wall-clock
+timestamps so a load test can measure how quickly the automation noticed it.
+
+Modes:
+    python claude_desktop_simulator.py                      # run the window
+    python claude_desktop_simulator.py --export-assets DIR  # also capture button images + config
+    python claude_desktop_simulator.py --load-test 20       # drive it with ClaudeDesktopAutomation
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Optional, Any, Callable
+
+try:
+    import tkinter as tk
+    TK_AVAILABLE = True
+except ImportError:
+    TK_AVAILABLE = False
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("claude_simulator")
+
+DEFAULT_SIMULATOR_CONFIG = {
+    "window_title": "Claude",
+    "geometry": "1000x700+0+0",
+    "first_token_delay_s": 1.0,          # Thinking time before text starts streaming
+    "chars_per_second": 400,             # Streaming speed
+    "response_chars_per_prompt_char": 2.0,
+    "min_response_chars": 300,
+    "max_response_chars": 6000,
+    "continue_every_chars": 2500,        # Pause for Continue after this many chars (0 disables)
+    "max_conversation_chars": 40000,     # Max-length banner once the chat exceeds this (0 disables)
+    "usage_limit_after_prompts": 0,      # Usage-limit banner after this many prompts (0 disables)
+    "usage_limit_duration_s": 30,
+    "stream_tick_ms": 50
+}
+
+# Automation settings scaled to the simulator's timings, written next to exported assets
+SIMULATOR_AUTOMATION_CONFIG = {
+    "window_title": "Claude",
+    "screenshot_delay": 0.2,
+    "max_retries": 2,
+    "confidence_threshold": 0.9,
+    "response_initial_wait_s": 1,
+    "response_max_wait_s": 120,
+    "response_check_interval_normal_s": 1,
+    "response_check_interval_after_continue_s": 1,
+    "response_quick_check_duration_s": 10,
+    "max_check_interval_s": 2,
+    "debug_usage_limit_wait_seconds": 5
+}
+
+
+class SimulatedConversation:
+    """Chat state and streaming timeline, independent of any UI.
+
+    Call tick(now) periodically; it returns newly streamed text. Events are
+    reported through on_event(name, **fields).
+    """
+
+    def __init__(self, config: Dict[str, Any], on_event: Callable[..., None]):
+        self.config = config
+        self.on_event = on_event
+        self.project: Optional[str] = None
+        self.conversation_chars = 0
+        self.prompt_times: List[float] = []
+        self.usage_limited_until = 0.0
+        self.max_length_reached = False
+        self._reset_stream()
+
+    def _reset_stream(self):
+        self.streaming = False
+        self.waiting_for_continue = False
+        self._remaining = 0
+        self._since_continue = 0
+        self._emitted = 0
+        self._next_emit_at = 0.0
+        self._last_tick = 0.0
+
+    @property
+    def usage_limited(self) -> bool:
+        return time.time() < self.usage_limited_until
+
+    def new_chat(self, project: str):
+        self.project = project
+        self.conversation_chars = 0
+        self.max_length_reached = False
+        self._reset_stream()
+        self.on_event("new_chat", project=project)
+
+    def submit(self, prompt: str, now: float) -> bool:
+        """Accept a prompt. Returns False if the app would refuse it"""
+        if self.usage_limited:
+            self.on_event("prompt_rejected", reason="usage_limit")
+            return False
+        if self.max_length_reached:
+            self.on_event("prompt_rejected", reason="max_length")
+            return False
+        if self.streaming:
+            self.on_event("prompt_rejected", reason="busy")
+            return False
+
+        limit_after = self.config["usage_limit_after_prompts"]
+        if limit_after and len(self.prompt_times) >= limit_after:
+            self.prompt_times = []
+            self.usage_limited_until = now + self.config["usage_limit_duration_s"]
+            self.on_event("usage_limit_shown", until=self.usage_limited_until)
+            return False
+
+        self.prompt_times.append(now)
+        length = int(len(prompt) * self.config["response_chars_per_prompt_char"])
+        length = max(self.config["min_response_chars"], min(self.config["max_response_chars"], length))
+
+        self.streaming = True
+        self._remaining = length
+        self._since_continue = 0
+        self._emitted = 0
+        self._next_emit_at = now + self.config["first_token_delay_s"]
+        self._last_tick = self._next_emit_at
+        self.conversation_chars += len(prompt)
+        self.on_event("prompt_received", chars=len(prompt), response_chars=length)
+        return True
+
+    def click_continue(self, now: float) -> bool:
+        if not self.waiting_for_continue:
+            return False
+        self.waiting_for_continue = False
+        self._since_continue = 0
+        self._last_tick = now
+        self.on_event("continue_clicked")
+        return True
+
+    def tick(self, now: float) -> int:
+        """Advance streaming to now; returns how many characters were emitted"""
+        if not self.streaming or self.waiting_for_continue or now < self._next_emit_at:
+            return 0
+
+        budget = int((now - self._last_tick) * self.config["chars_per_second"])
+        if budget <= 0:
+            return 0
+        self._last_tick = now
+
+        if self._emitted == 0:
+            self.on_event("response_started")
+
+        continue_every = self.config["continue_every_chars"]
+        if continue_every:
+            budget = min(budget, continue_every - self._since_continue)
+        count = min(budget, self._remaining)
+
+        self._remaining -= count
+        self._since_continue += count
+        self._emitted += count
+        self.conversation_chars += count
+
+        if self._remaining == 0:
+            self.streaming = False
+            self.on_event("response_done", chars=self._emitted)
+            max_chars = self.config["max_conversation_chars"]
+            if max_chars and self.conversation_chars >= max_chars:
+                self.max_length_reached = True
+                self.on_event("max_length_shown", conversation_chars=self.conversation_chars)
+        elif continue_every and self._since_continue >= continue_every:
+            self.waiting_for_continue = True
+            self.on_event("continue_shown", emitted=self._emitted)
+        return count
+
+
+def filler_text(offset: int, count: int) -> str:
+    """Deterministic response text, wrapped into short lines"""
+    line = "Simulated Claude response text for automation load testing. "
+    text = (line * ((offset + count) // len(line) + 2))[offset:offset + count]
+    return "".join(c + ("\n" if (offset + i + 1) % 80 == 0 else "") for i, c in enumerate(text))
+
+
+class ClaudeDesktopSimulator:
+    """tkinter view over SimulatedConversation"""
+
+    USAGE_LIMIT_TEXT = "You've reached your usage limit. Please try again in 2 hours."
+    MAX_LENGTH_TEXT = "Claude hit the maximum length for this conversation. Please start a new chat."
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, projects: Optional[List[str]] = None,
+                 event_log: Optional[str] = None):
+        if not TK_AVAILABLE:
+            raise RuntimeError("tkinter is required for the simulator")
+        self.config = {**DEFAULT_SIMULATOR_CONFIG, **(config or {})}
+        self.projects = projects or ["My Project"]
+        self.event_log = event_log
+        if event_log:
+            os.makedirs(os.path.dirname(os.path.abspath(event_log)), exist_ok=True)
+
+        self.conversation = SimulatedConversation(self.config, self._log)
+        self._streamed = 0
+
+        self.root = tk.Tk()
+        self.root.title(self.config["window_title"])
+        self.root.geometry(self.config["geometry"])
+        self._build_ui()
+        self.root.after(self.config["stream_tick_ms"], self._tick)
+
+    def _build_ui(self):
+        root = self.root
+        top = tk.Frame(root, bg="#f5f4ef")
+        top.pack(side=tk.TOP, fill=tk.X)
+        self.projects_button = tk.Button(top, text="Projects", width=10, command=self._toggle_projects,
+                                         relief=tk.FLAT, bg="#e8e6dc")
+        self.projects_button.pack(side=tk.LEFT, padx=8, pady=6)
+
+        self.project_menu = tk.Frame(root, bg="#f5f4ef")
+        self.project_buttons = {}
+        for name in self.projects:
+            button = tk.Button(self.project_menu, text=name, width=20, relief=tk.FLAT, bg="#dcd9cc",
+                               command=lambda project=name: self._open_project(project))
+            button.pack(side=tk.LEFT, padx=8, pady=4)
+            self.project_buttons[name] = button
+
+        self.usage_banner = tk.Label(root, text=self.USAGE_LIMIT_TEXT, bg="#fde2e1", fg="#8a1c1c", pady=8)
+        self.max_length_banner = tk.Label(root, text=self.MAX_LENGTH_TEXT, bg="#fff4ce", fg="#6b5200", pady=8)
+
+        bottom = tk.Frame(root)
+        bottom.pack(side=tk.BOTTOM, fill=tk.X)
+        self.continue_button = tk.Button(bottom, text="Continue", width=12, bg="#d97757", fg="white",
+                                         relief=tk.FLAT, command=self._continue)
+        self.input = tk.Text(bottom, height=4, wrap=tk.WORD)
+        self.input.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=8)
+        self.input.bind("<Return>", self._submit)
+        self.input.bind("<Control-a>", self._select_all)
+
+        self.chat = tk.Text(root, wrap=tk.WORD, state=tk.DISABLED, bg="white")
+        self.chat.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=8)
+        self.input.focus_set()
+
+    def _log(self, event: str, **fields):
+        record = {"ts": time.time(), "event": event, **fields}
+        logger.debug(f"Simulator event: {record}")
+        if self.event_log:
+            with open(self.event_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _append_chat(self, text: str):
+        self.chat.configure(state=tk.NORMAL)
+        self.chat.insert(tk.END, text)
+        self.chat.see(tk.END)
+        self.chat.configure(state=tk.DISABLED)
+
+    def _select_all(self, event=None):
+        # Tk's default Ctrl+A moves to line start; Claude selects everything
+        self.input.tag_add(tk.SEL, "1.0", tk.END)
+        return "break"
+
+    def _submit(self, event=None):
+        prompt = self.input.get("1.0", tk.END).strip()
+        if prompt and self.conversation.submit(prompt, time.time()):
+            self.input.delete("1.0", tk.END)
+            self._streamed = 0
+            self._append_chat(f"\nYou: {prompt}\n\nClaude: ")
+        self._refresh_banners()
+        return "break"
+
+    def _continue(self):
+        if self.conversation.click_continue(time.time()):
+            self.continue_button.pack_forget()
+
+    def _toggle_projects(self):
+        if self.project_menu.winfo_ismapped():
+            self.project_menu.pack_forget()
+        else:
+            self.project_menu.pack(side=tk.TOP, fill=tk.X, after=self.projects_button.master)
+
+    def _open_project(self, project: str):
+        self.project_menu.pack_forget()
+        self.conversation.new_chat(project)
+        self.chat.configure(state=tk.NORMAL)
+        self.chat.delete("1.0", tk.END)
+        self.chat.configure(state=tk.DISABLED)
+        self.continue_button.pack_forget()
+        self._refresh_banners()
+
+    def _refresh_banners(self):
+        for banner, visible in ((self.usage_banner, self.conversation.usage_limited),
+                                (self.max_length_banner, self.conversation.max_length_reached)):
+            if visible and not banner.winfo_ismapped():
+                banner.pack(side=tk.BOTTOM, fill=tk.X, before=self.input.master)
+            elif not visible and banner.winfo_ismapped():
+                banner.pack_forget()
+
+    def _tick(self):
+        count = self.conversation.tick(time.time())
+        if count:
+            self._append_chat(filler_text(self._streamed, count))
+            self._streamed += count
+            if self.conversation.waiting_for_continue:
+                self.continue_button.pack(side=tk.TOP, pady=4)
+            if not self.conversation.streaming:
+                self._refresh_banners()
+        elif self.usage_banner.winfo_ismapped() and not self.conversation.usage_limited:
+            self._refresh_banners()
+        self.root.after(self.config["stream_tick_ms"], self._tick)
+
+    def export_assets(self, assets_dir: str) -> str:
+        """Capture the simulator's buttons and banners as template images and
+        write a matching automation config. Returns the config path."""
+        from PIL import ImageGrab
+
+        os.makedirs(assets_dir, exist_ok=True)
+
+        def capture(widget, file_name):
+            self.root.update()
+            time.sleep(0.2)
+            self.root.update()
+            left, top = widget.winfo_rootx(), widget.winfo_rooty()
+            bbox = (left, top, left + widget.winfo_width(), top + widget.winfo_height())
+            ImageGrab.grab(bbox=bbox).save(os.path.join(assets_dir, file_name))
+
+        capture(self.projects_button, "projects_button.png")
+        self._toggle_projects()
+        for name, button in self.project_buttons.items():
+            capture(button, f"{name}_button.png")
+        capture(self.project_buttons[self.projects[0]], "project_button.png")
+        self._toggle_projects()
+
+        self.continue_button.pack(side=tk.TOP, pady=4)
+        capture(self.continue_button, "continue_button.png")
+        self.continue_button.pack_forget()
+
+        for banner, file_name in ((self.usage_banner, "usage_limit_message.png"),
+                                  (self.max_length_banner, "max_length_message.png")):
+            banner.pack(side=tk.BOTTOM, fill=tk.X, before=self.input.master)
+            capture(banner, file_name)
+            banner.pack_forget()
+
+        config_path = os.path.join(assets_dir, "simulator_automation_config.json")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                **SIMULATOR_AUTOMATION_CONFIG,
+                "window_title": self.config["window_title"],
+                "assets_dir": os.path.abspath(assets_dir),
+                # Simulated ~1 s responses must not land in the timing buckets real projects share
+                "timing_history_file": os.path.join(os.path.abspath(assets_dir), "response_timings.json")
+            }, f, indent=2)
+        self._log("assets_exported", config_path=config_path)
+        logger.info(f"Simulator assets exported to {assets_dir}")
+        return config_path
+
+    def run(self):
+        self._log("started", pid=os.getpid())
+        self.root.mainloop()
+
+
+# --- Load test driver ---------------------------------------------------------
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)
+
+
+def _read_events(event_log: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(event_log):
+        return []
+    with open(event_log, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_load_test(runs: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Throughput and detection latency from the driver's timings and the simulator's events"""
+    continue_latency = []
+    shown_at = None
+    for event in events:
+        if event["event"] == "continue_shown":
+            shown_at = event["ts"]
+        elif event["event"] == "continue_clicked" and shown_at is not None:
+            continue_latency.append(event["ts"] - shown_at)
+            shown_at = None
+
+    done_times = [event["ts"] for event in events if event["event"] == "response_done"]
+    completion_latency, input_latency = [], []
+    for run in runs:
+        done = [ts for ts in done_times if run["started"] <= ts <= run["finished"]]
+        if done:
+            completion_latency.append(run["finished"] - done[-1])
+        received = [e["ts"] for e in events
+                    if e["event"] == "prompt_received" and run["started"] <= e["ts"] <= run["finished"]]
+        if received:
+            input_latency.append(received[0] - run["started"])
+
+    succeeded = sum(1 for run in runs if run["success"])
+    elapsed = (runs[-1]["finished"] - runs[0]["started"]) if runs else 0
+    durations = [run["finished"] - run["started"] for run in runs]
+    return {
+        "prompts": len(runs),
+        "succeeded": succeeded,
+        "elapsed_s": round(elapsed, 2),
+        "prompts_per_hour": round(succeeded / elapsed * 3600, 1) if elapsed else 0,
+        "prompt_duration_s": {"p50": _percentile(durations, 50), "p95": _percentile(durations, 95)},
+        "input_latency_s": {"p50": _percentile(input_latency, 50), "p95": _percentile(input_latency, 95)},
+        "continue_detection_latency_s": {
+            "count": len(continue_latency),
+            "p50": _percentile(continue_latency, 50),
+            "p95": _percentile(continue_latency, 95)
+        },
+        "completion_detection_latency_s": {
+            "p50": _percentile(completion_latency, 50),
+            "p95": _percentile(completion_latency, 95)
+        }
+    }
+
+
+def run_load_test(prompt_count: int, display_backend: str = "pyautogui", simulator_config: Optional[str] = None,
+                  project: str = "My Project", prompt_chars: int = 400, wait_for_continue: bool = True,
+                  startup_timeout_s: float = 30) -> Dict[str, Any]:
+    """Start the simulator, export its assets and push prompts through ClaudeDesktopAutomation"""
+    from claude_desktop_automation import ClaudeDesktopAutomation
+    from display_backend import create_backend
+
+    workdir = tempfile.mkdtemp(prefix="claude_simulator_")
+    assets_dir = os.path.join(workdir, "assets")
+    event_log = os.path.join(workdir, "events.jsonl")
+    config_path = os.path.join(assets_dir, "simulator_automation_config.json")
+
+    backend = create_backend(display_backend)
+    command = [sys.executable, os.path.abspath(__file__), "--event-log", event_log,
+               "--export-assets", assets_dir, "--projects", project]
+    if simulator_config:
+        command += ["--config", simulator_config]
+    simulator = backend.spawn(command) if hasattr(backend, "spawn") else subprocess.Popen(command)
+
+    try:
+        deadline = time.monotonic() + startup_timeout_s
+        while not os.path.exists(config_path):
+            if simulator.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Simulator did not start (is a display available?)")
+            time.sleep(0.2)
+
+        automation = ClaudeDesktopAutomation(config_path, backend=backend)
+        prompt_body = ("Please review the following change and summarize the risks. " * 50)[:prompt_chars]
+        runs = []
+        for i in range(prompt_count):
+            started = time.time()
+            success = automation.run_automation(
+                f"[{i + 1}/{prompt_count}] {prompt_body}",
+                wait_for_continue=wait_for_continue,
+                create_new_chat=(i == 0),
+                project_name=project
+            )
+            runs.append({"started": started, "finished": time.time(), "success": bool(success)})
+            logger.info(f"Prompt {i + 1}/{prompt_count}: {'ok' if success else 'failed'} "
+                        f"in {runs[-1]['finished'] - started:.1f}s")
+
+        report = summarize_load_test(runs, _read_events(event_log))
+        report["event_log"] = event_log
+        return report
+    finally:
+        simulator.terminate()
+        backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Claude Desktop simulator for automation testing')
+    parser.add_argument('--config', help='JSON file overriding simulator timings (see DEFAULT_SIMULATOR_CONFIG)')
+    parser.add_argument('--projects', default="My Project", help='Comma-separated project names')
+    parser.add_argument('--event-log', help='Append simulator events to this JSONL file')
+    parser.add_argument('--export-assets', metavar='DIR', help='Capture button/banner images and an automation config')
+    parser.add_argument('--export-only', action='store_true', help='Exit after exporting assets')
+    parser.add_argument('--load-test', type=int, metavar='N', help='Run N prompts through ClaudeDesktopAutomation')
+    parser.add_argument('--display-backend', default="pyautogui", choices=["pyautogui", "xvfb"],
+                        help='Display for the load test (xvfb runs headless)')
+    parser.add_argument('--prompt-chars', type=int, default=400, help='Prompt length for the load test')
+    parser.add_argument('--no-continue', action='store_true', help="Load test without waiting for 'Continue'")
+    parser.add_argument('--report', help='Write the load test report to this JSON file')
+    args = parser.parse_args()
+
+    if args.load_test:
+        report = run_load_test(args.load_test, args.display_backend, args.config,
+                               project=args.projects.split(",")[0].strip(),
+                               prompt_chars=args.prompt_chars, wait_for_continue=not args.no_continue)
+        print(json.dumps(report, indent=2))
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+    simulator = ClaudeDesktopSimulator(config, [p.strip() for p in args.projects.split(",") if p.strip()],
+                                       args.event_log)
+    if args.export_assets:
+        simulator.root.update()
+        simulator.export_assets(args.export_assets)
+        if args.export_only:
+            return
+    simulator.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Clipboard - system clipboard access without hard dependencies
+
+Text is pasted rather than typed, so a clipboard must always be available.
+Providers are tried in order of preference for the current platform: the
+native command-line tools (wl-copy, xclip, xsel, pbcopy, PowerShell), then
+pyperclip if installed, then a tkinter window that owns the X selection
+itself (and keeps serving it from a background thread until replaced).
+"""
+
+import os
+import sys
+import queue
+import shutil
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional
+
+try:
+    import pyperclip
+    PYPERCLIP_AVAILABLE = True
+except ImportError:
+    PYPERCLIP_AVAILABLE = False
+
+try:
+    import tkinter as tk
+    TK_AVAILABLE = True
+except ImportError:
+    TK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMMAND_TIMEOUT_S = 5
+
+# name -> (copy command, paste command, environment variable it needs)
+COMMAND_PROVIDERS = {
+    "wl-copy": (["wl-copy"], ["wl-paste", "--no-newline"], "WAYLAND_DISPLAY"),
+    "xclip": (["xclip", "-selection", "clipboard"], ["xclip", "-selection", "clipboard", "-o"], "DISPLAY"),
+    "xsel": (["xsel", "--clipboard", "--input"], ["xsel", "--clipboard", "--output"], "DISPLAY"),
+    "pbcopy": (["pbcopy"], ["pbpaste"], None),
+    "powershell": (["powershell", "-NoProfile", "-Command", "$input | Set-Clipboard"],
+                   ["powershell", "-NoProfile", "-Command", "Get-Clipboard -Raw"], None)
+}
+
+
+class ClipboardError(Exception):
+    """Raised when no clipboard provider can be used"""
+
+
+class CommandProvider:
+    """Clipboard through a pair of copy/paste command-line tools"""
+
+    def __init__(self, name: str, env: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.copy_command, self.paste_command, _ = COMMAND_PROVIDERS[name]
+        self.env = env
+
+    def copy(self, text: str) -> bool:
+        # xclip/xsel fork a child that keeps owning the selection, so only stdin is waited on
+        process = subprocess.Popen(self.copy_command, stdin=subprocess.PIPE, env=self.env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            process.communicate(text.encode("utf-8"), timeout=COMMAND_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return False
+        return process.returncode == 0
+
+    def paste(self) -> Optional[str]:
+        try:
+            result = subprocess.run(self.paste_command, env=self.env, capture_output=True,
+                                    timeout=COMMAND_TIMEOUT_S)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.decode("utf-8", errors="replace")
+
+
+class PyperclipProvider:
+    """Clipboard through pyperclip (desktop session only)"""
+
+    name = "pyperclip"
+
+    def copy(self, text: str) -> bool:
+        pyperclip.copy(text)
+        return True
+
+    def paste(self) -> Optional[str]:
+        return pyperclip.paste()
+
+
+class TkProvider:
+    """Owns the clipboard selection from a hidden Tk window.
+
+    X11 clipboards are served by their owner, so the window lives on a
+    background thread that keeps processing selection requests.
+    """
+
+    name = "tkinter"
+
+    def __init__(self, display: Optional[str] = None):
+        self.display = display
+        self._requests: "queue.Queue" = queue.Queue()
+        self._ready = threading.Event()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="clipboard-tk", daemon=True)
+        self._thread.start()
+        self._ready.wait(COMMAND_TIMEOUT_S)
+        if self._error or not self._ready.is_set():
+            raise ClipboardError(f"tkinter clipboard unavailable: {self._error}")
+
+    def _run(self):
+        try:
+            root = tk.Tk(screenName=self.display) if self.display else tk.Tk()
+            root.withdraw()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        while True:
+            try:
+                action, text, reply = self._requests.get(timeout=0.02)
+                try:
+                    if action == "copy":
+                        root.clipboard_clear()
+                        root.clipboard_append(text)
+                        root.update()
+                        reply.put(True)
+                    else:
+                        reply.put(root.clipboard_get())
+                except Exception:
+                    reply.put(False if action == "copy" else None)
+            except queue.Empty:
+                pass
+            root.update()
+
+    def _call(self, action: str, text: Optional[str] = None):
+        reply: "queue.Queue" = queue.Queue()
+        self._requests.put((action, text, reply))
+        try:
+            return reply.get(timeout=COMMAND_TIMEOUT_S)
+        except queue.Empty:
+            return False if action == "copy" else None
+
+    def copy(self, text: str) -> bool:
+        return self._call("copy", text)
+
+    def paste(self) -> Optional[str]:
+        return self._call("paste")
+
+
+def available_providers(env: Optional[Dict[str, str]] = None, desktop: bool = True) -> List[str]:
+    """Provider names usable in env, most preferred first.
+
+    desktop=False (a private display such as Xvfb) skips providers that can
+    only reach the user's desktop session.
+    """
+    env = env if env is not None else dict(os.environ)
+    names = []
+    for name, (copy_command, _, needs) in COMMAND_PROVIDERS.items():
+        if needs and not env.get(needs):
+            continue
+        if not needs and not desktop:
+            continue
+        if name == "powershell" and sys.platform != "win32":
+            continue
+        if shutil.which(copy_command[0]):
+            names.append(name)
+    if desktop and PYPERCLIP_AVAILABLE:
+        names.append("pyperclip")
+    if TK_AVAILABLE and (sys.platform in ("win32", "darwin") or env.get("DISPLAY")):
+        names.append("tkinter")
+    return names
+
+
+class Clipboard:
+    """First working clipboard provider for a display"""
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, desktop: bool = True,
+                 preferred: Optional[str] = None):
+        self.env = env
+        self.desktop = desktop
+        self.preferred = preferred
+        self._provider = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._provider.name if self._provider else None
+
+    def _create(self, name: str):
+        if name == "pyperclip":
+            return PyperclipProvider()
+        if name == "tkinter":
+            display = (self.env or {}).get("DISPLAY") if not self.desktop else None
+            return TkProvider(display)
+        return CommandProvider(name, self.env)
+
+    def _candidates(self) -> List[str]:
+        names = available_providers(self.env, self.desktop)
+        if self.preferred in names:
+            names.remove(self.preferred)
+            names.insert(0, self.preferred)
+        return names
+
+    def copy(self, text: str) -> bool:
+        """Put text on the clipboard, settling on the first provider that works"""
+        with self._lock:
+            if self._provider is not None:
+                return self._provider.copy(text)
+            for name in self._candidates():
+                try:
+                    provider = self._create(name)
+                    if provider.copy(text):
+                        self._provider = provider
+                        logger.info(f"Using clipboard provider: {name}")
+                        return True
+                except Exception as e:
+                    logger.debug(f"Clipboard provider {name} failed: {e}")
+            logger.warning("No working clipboard provider found")
+            return False
+
+    def paste(self) -> Optional[str]:
+        """Current clipboard text, or None if it cannot be read"""
+        with self._lock:
+            if self._provider is None:
+                return None
+            try:
+                return self._provider.paste()
+            except Exception as e:
+                logger.debug(f"Clipboard read failed ({self._provider.name}): {e}")
+                return None
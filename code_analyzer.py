@@ -4,7 +4,53 @@ import ast
 import logging
 import json
 import sys
+import mmap
+import hashlib
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from analyzer_languages import SCAN_CATEGORIES, build_registry
+from comment_detector import find_commented_code
+from file_discovery import FileDiscovery
+
+# JWT-related patterns
+JWT_PATTERNS = [
+    r"import\s+jwt",
+    r"from\s+jwt\s+import",
+    r"\.jwt\.",
+    r"JwtService",
+    r"JWTService",
+    r"TokenService",
+    r"accessToken",
+    r"refreshToken",
+    r"access_token",
+    r"refresh_token"
+]
+JWT_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in JWT_PATTERNS))
+JWT_BYTES_REGEX = re.compile(JWT_REGEX.pattern.encode('utf-8'))
+
+# Newlines are counted over memory-mapped files in windows of this size
+NEWLINE_COUNT_WINDOW = 1 << 20
+
+# Streaming analysis writes new results to the cache in batches of this size
+CACHE_FLUSH_RESULTS = 256
+
+# Part of the cache signature; bump when analyze_file returns different results for the same input
+ANALYSIS_VERSION = 2
+
+# Analyzer used by pool worker processes, built once per process from the parent's config
+_worker_analyzer = None
+
+
+def _init_worker(config):
+    global _worker_analyzer
+    _worker_analyzer = CodeAnalyzer()
+    _worker_analyzer.config = config
+
+
+def _analyze_chunk(file_paths):
+    return [_worker_analyzer.analyze_file(file_path) for file_path in file_paths]
+
 
 class CodeAnalyzer:
     def __init__(self, config_path=None):
@@ -13,8 +59,18 @@ class CodeAnalyzer:
         self.default_config = {
             "src_dir": "src",
             "test_dir": "tests",
+            # Enabled languages (analyzer_languages.LANGUAGES); each file is scanned only with the
+            # rules of the language its extension maps to. language_rules overrides or adds rule sets.
+            # An optional "extensions" list further restricts which files are discovered.
+            "languages": ["python", "java"],
+            "language_rules": {},
             "ignore_dirs": ["venv", "__pycache__", ".git"],
             "ignore_files": ["__init__.py"],
+            # "git": tracked + untracked files from git ls-files (honors .gitignore, tracked list
+            # cached while the index is unchanged); "walk": os.walk; git falls back to a walk
+            "file_discovery": "git",
+            "file_list_cache": "logs/file_list_cache.json",
+            # Python's patterns, also used for explicitly analyzed files of unregistered extensions
             "mock_patterns": [
                 r"# TODO:",
                 r"# FIXME:",
@@ -23,6 +79,9 @@ class CodeAnalyzer:
                 r"unittest\.mock",
                 r"pytest\.monkeypatch"
             ],
+            # "tokens": commented-out code is found by tokenizing comments (Python, Java and
+            # other C-style sources); "regex": commented_code_patterns over the whole file
+            "commented_code_detector": "tokens",
             "commented_code_patterns": [
                 r"# [a-zA-Z_][a-zA-Z0-9_]*\s*\(",
                 r"# def ",
@@ -30,7 +89,16 @@ class CodeAnalyzer:
                 r"# if ",
                 r"# for ",
                 r"# while "
-            ]
+            ],
+            # Parallel analysis: files are sharded across a process pool above this count
+            "max_workers": None,          # None = all cores
+            "parallel_min_files": 200,
+            "parallel_chunk_size": 0,     # 0 = about four chunks per worker
+            # Large files are scanned through mmap with byte regexes; only matched lines are decoded
+            # (commented code there always uses commented_code_patterns)
+            "mmap_min_bytes": 1 << 20,
+            "max_file_bytes": 64 << 20,   # Larger files are skipped (0 = no limit)
+            "binary_sniff_bytes": 8192    # A NUL byte in this prefix marks a file as binary
         }
         
         # Load configuration file
@@ -44,86 +112,351 @@ class CodeAnalyzer:
             except Exception as e:
                 logging.error(f"Failed to load configuration file: {e}")
         
+        self._registry = None
+        self._registry_key = None
+        self._discovery = None
         logging.info("Code analyzer initialization complete")
     
-    def find_files(self, directory, extensions=None):
-        """Find files in the specified directory."""
-        if extensions is None:
-            extensions = ['.py']
+    def _get_discovery(self):
+        if self._discovery is None:
+            self._discovery = FileDiscovery(self.config["ignore_dirs"], self.config.get("file_list_cache"),
+                                            use_git=self.config.get("file_discovery", "git") == "git")
+        return self._discovery
+
+    def get_registry(self):
+        """Language registry for the current config (rebuilt when the pattern config changes)."""
+        key = json.dumps([self.config.get(name) for name in
+                          ("languages", "language_rules", "mock_patterns", "commented_code_patterns")])
+        if key != self._registry_key:
+            self._registry = build_registry(self.config)
+            self._registry_key = key
+        return self._registry
+
+    def source_extensions(self):
+        """Extensions of the files to analyze: the "extensions" config key, else every enabled language's."""
+        return self.config.get("extensions") or self.get_registry().extensions()
+
+    def _accepts(self, path, extensions, ignore_files):
+        filename = os.path.basename(path)
+        return (filename.endswith(extensions) and filename not in ignore_files
+                and self.get_registry().for_path(path) is not None)
+
+    def iter_files(self, directory, extensions=None):
+        """Yield files to analyze as they are discovered."""
+        extensions = tuple(extensions or self.source_extensions())
+        ignore_files = set(self.config["ignore_files"])
+        for path in self._get_discovery().iter_paths(directory):
+            if self._accepts(path, extensions, ignore_files):
+                yield path
+
+    def _walk(self, directory, extensions=None):
+        """Files to analyze and every directory containing a file, from a single discovery pass."""
+        extensions = tuple(extensions or self.source_extensions())
+        ignore_files = set(self.config["ignore_files"])
         
+        directory = os.path.normpath(directory)
         files = []
-        for root, dirs, filenames in os.walk(directory):
-            # Exclude directories to ignore
-            dirs[:] = [d for d in dirs if d not in self.config["ignore_dirs"]]
+        roots = {directory}
+        for path in self._get_discovery().iter_paths(directory):
+            parent = os.path.dirname(path)
+            # Record the parent and its ancestors up to directory (stop at the first one already known)
+            while parent and parent not in roots:
+                roots.add(parent)
+                parent = os.path.dirname(parent)
             
-            for filename in filenames:
-                # Check extensions
-                if any(filename.endswith(ext) for ext in extensions):
-                    # Exclude files to ignore
-                    if filename not in self.config["ignore_files"]:
-                        files.append(os.path.join(root, filename))
+            if self._accepts(path, extensions, ignore_files):
+                files.append(path)
         
-        return files
+        return files, sorted(roots)
+
+    def find_files(self, directory, extensions=None):
+        """Find files in the specified directory."""
+        return list(self.iter_files(directory, extensions))
     
+    @staticmethod
+    def _find_all(combined, entries, content):
+        """Per-pattern finditer() results from a single pass over content.
+
+        The combined regex visits every offset where any pattern matches. Each
+        pattern is tried there with match(), and only at or beyond the end of
+        its own previous match, so results equal a separate finditer() per pattern.
+        """
+        found = [[] for _ in entries]
+        if combined is None:
+            for index, (_, _, regex) in enumerate(entries):
+                found[index] = [(m.start(), m.end()) for m in regex.finditer(content)]
+            return found
+
+        next_allowed = [0] * len(entries)
+        position = 0
+        length = len(content)
+        while position <= length:
+            candidate = combined.search(content, position)
+            if candidate is None:
+                break
+            start = candidate.start()
+            for index, (_, _, regex) in enumerate(entries):
+                if start < next_allowed[index]:
+                    continue
+                match = regex.match(content, start)
+                if match:
+                    found[index].append((start, match.end()))
+                    next_allowed[index] = match.end() if match.end() > start else start + 1
+            position = start + 1
+        return found
+
+    def scan_content(self, content, language=None):
+        """Find mock and commented-code patterns in text; returns results by category.
+
+        language: analyzer_languages.Language whose rules apply (default: the generic
+        rule set). If it has a comment syntax and the token detector is enabled,
+        commented-out code comes from the comment tokens instead of regexes.
+        """
+        language = language or self.get_registry().fallback
+        syntax = language.comment_syntax
+        tokens = syntax is not None and self.config.get("commented_code_detector", "tokens") == "tokens"
+        combined, entries = language.scanner(categories=["mocks"] if tokens else None)
+        line_starts = [0]
+        line_starts.extend(m.end() for m in re.finditer("\n", content))
+
+        result = {category: [] for category, _ in SCAN_CATEGORIES}
+        for (category, pattern, _), matches in zip(entries, self._find_all(combined, entries, content)):
+            for start, _ in matches:
+                line_number = bisect_right(line_starts, start)
+                line_end = line_starts[line_number] - 1 if line_number < len(line_starts) else len(content)
+                result[category].append({
+                    "line": line_number,
+                    "content": content[line_starts[line_number - 1]:line_end],
+                    "pattern": pattern
+                })
+
+        if tokens:
+            for line_number, _ in find_commented_code(content, syntax):
+                line_end = line_starts[line_number] - 1 if line_number < len(line_starts) else len(content)
+                result["commented_code"].append({
+                    "line": line_number,
+                    "content": content[line_starts[line_number - 1]:line_end],
+                    "pattern": f"{syntax}-comment-tokens"
+                })
+        return result
+
+    @staticmethod
+    def _count_newlines(buffer, start, end):
+        count = 0
+        for offset in range(start, end, NEWLINE_COUNT_WINDOW):
+            count += buffer[offset:min(end, offset + NEWLINE_COUNT_WINDOW)].count(b"\n")
+        return count
+
+    def scan_buffer(self, buffer, language=None):
+        """scan_content() for bytes or a memory map, without decoding the whole buffer.
+
+        Line numbers are found by counting newlines between consecutive match
+        offsets, and only the matched lines are decoded.
+        """
+        combined, entries = (language or self.get_registry().fallback).scanner(binary=True)
+        found = self._find_all(combined, entries, buffer)
+
+        lines = {}
+        line_number, previous = 1, 0
+        for start in sorted({start for matches in found for start, _ in matches}):
+            line_number += self._count_newlines(buffer, previous, start)
+            previous = start
+            line_begin = buffer.rfind(b"\n", 0, start) + 1
+            line_end = buffer.find(b"\n", start)
+            line = buffer[line_begin:line_end if line_end >= 0 else len(buffer)]
+            lines[start] = (line_number, line.rstrip(b"\r").decode('utf-8', errors='replace'))
+
+        result = {category: [] for category, _ in SCAN_CATEGORIES}
+        for (category, pattern, _), matches in zip(entries, found):
+            for start, _ in matches:
+                line_number, line = lines[start]
+                result[category].append({"line": line_number, "content": line, "pattern": pattern})
+        return result
+
+    def scan_file(self, file_path):
+        """Read a file once and scan it for every pattern category."""
+        result = self.analyze_file(file_path)
+        return {category: result[category] for category, _ in SCAN_CATEGORIES}
+
     def detect_mocks(self, file_path):
         """Detect mock usage in a file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Search for mock patterns
-            mock_instances = []
-            for pattern in self.config["mock_patterns"]:
-                for match in re.finditer(pattern, content):
-                    line_number = content[:match.start()].count('\n') + 1
-                    line_content = content.splitlines()[line_number - 1]
-                    mock_instances.append({
-                        "line": line_number,
-                        "content": line_content,
-                        "pattern": pattern
-                    })
-            
-            return mock_instances
-        
-        except Exception as e:
-            logging.error(f"Error detecting mocks: {e}")
-            return []
+        return self.scan_file(file_path)["mocks"]
     
     def detect_commented_code(self, file_path):
         """Detect commented out code in a file."""
+        return self.scan_file(file_path)["commented_code"]
+    
+    def analyze_file(self, file_path):
+        """Everything the project checks need from one file, from a single read.
+
+        Binary and oversized files are skipped; files of mmap_min_bytes or more
+        are scanned through a memory map so memory stays flat.
+        """
+        result = {"file": file_path, "mocks": [], "commented_code": [], "has_jwt": False}
+        # Files of unregistered extensions only get here when analyzed explicitly
+        language = self.get_registry().for_path(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Search for commented code patterns
-            commented_code = []
-            for pattern in self.config["commented_code_patterns"]:
-                for match in re.finditer(pattern, content):
-                    line_number = content[:match.start()].count('\n') + 1
-                    line_content = content.splitlines()[line_number - 1]
-                    commented_code.append({
-                        "line": line_number,
-                        "content": line_content,
-                        "pattern": pattern
-                    })
-            
-            return commented_code
-        
+            size = os.path.getsize(file_path)
+            max_bytes = self.config.get("max_file_bytes", 0)
+            if max_bytes and size > max_bytes:
+                logging.warning(f"Skipping {file_path}: {size} bytes exceeds max_file_bytes")
+                return result
+
+            with open(file_path, 'rb') as f:
+                head = f.read(self.config.get("binary_sniff_bytes", 8192))
+                if b"\0" in head:
+                    logging.debug(f"Skipping binary file {file_path}")
+                    return result
+                if size and size >= self.config.get("mmap_min_bytes", 1 << 20):
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        result.update(self.scan_buffer(mapped, language))
+                        result["has_jwt"] = JWT_BYTES_REGEX.search(mapped) is not None
+                    return result
+                data = head + f.read()
+
+            # Same newline handling as reading in text mode; undecodable bytes are replaced,
+            # as on the mmap path, so results do not depend on file size
+            content = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+            result.update(self.scan_content(content, language))
+            result["has_jwt"] = JWT_REGEX.search(content) is not None
         except Exception as e:
-            logging.error(f"Error detecting commented code: {e}")
-            return []
-    
-    def analyze_project(self, directory=None):
-        """Analyze the entire project."""
-        if directory is None:
-            directory = self.config["src_dir"]
-        
-        # Get file list
-        files = self.find_files(directory)
-        
-        # Analysis results
+            logging.error(f"Error analyzing {file_path}: {e}")
+        return result
+
+    def _drain(self, running, wait):
+        """Results of finished pool chunks (of all chunks, as they finish, if wait).
+        A chunk whose worker failed is analyzed here instead."""
+        futures = as_completed(list(running)) if wait else [future for future in list(running) if future.done()]
+        for future in futures:
+            chunk = running.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                logging.warning(f"Parallel analysis of {len(chunk)} files failed ({e}); analyzing them sequentially")
+                results = [self.analyze_file(file_path) for file_path in chunk]
+            yield from results
+
+    def config_signature(self):
+        """Hash of everything that affects per-file results, for cache invalidation"""
+        material = json.dumps([ANALYSIS_VERSION, self.get_registry().describe(), JWT_PATTERNS,
+                               self.config.get("max_file_bytes", 0), self.config.get("commented_code_detector", "tokens")])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def iter_analysis(self, files, cache=None, changed_files=None):
+        """Yield analyze_file() results as they are produced, in completion order.
+
+        files may be any iterable (e.g. iter_files()) and is consumed lazily. Once
+        parallel_min_files files need analysis they are sharded across a process pool.
+        Closing the generator early cancels the chunks not yet started.
+        cache and changed_files: see analyze_files.
+        """
+        workers = self.config.get("max_workers") or os.cpu_count() or 1
+        min_files = self.config.get("parallel_min_files", 200)
+        known_total = len(files) if hasattr(files, "__len__") else None
+        chunk_size = self.config.get("parallel_chunk_size") or max(1, (known_total or min_files) // (workers * 4))
+        # None = undecided: files are held back until enough need analysis to justify a pool
+        parallel = False if workers <= 1 or (known_total is not None and known_total < min_files) else None
+
+        backlog = []      # Files needing analysis, not yet analyzed or submitted
+        fresh = []        # New results not yet written to the cache
+        running = {}      # Pool future -> its chunk of files
+        executor = None
+        cached_count = analyzed_count = 0
+        completed = False
+        try:
+            for file_path in files:
+                if cache is not None:
+                    changed = changed_files is None or os.path.abspath(file_path) in changed_files
+                    result = cache.get(file_path, trust=not changed)
+                    if result is not None:
+                        cached_count += 1
+                        yield result
+                        continue
+
+                if parallel is False:
+                    result = self.analyze_file(file_path)
+                    analyzed_count += 1
+                    fresh.append(result)
+                    yield result
+                    continue
+
+                backlog.append(file_path)
+                if parallel is None and len(backlog) >= min_files:
+                    try:
+                        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                       initargs=(self.config,))
+                        parallel = True
+                    except Exception as e:
+                        logging.warning(f"Could not start analysis workers ({e}); analyzing sequentially")
+                        parallel = False
+                if parallel and len(backlog) >= chunk_size:
+                    try:
+                        running[executor.submit(_analyze_chunk, backlog)] = backlog
+                    except Exception as e:
+                        logging.warning(f"Parallel analysis failed ({e}); analyzing sequentially")
+                        parallel = False
+                        continue  # The backlog is analyzed below
+                    backlog = []
+                    for result in self._drain(running, wait=False):
+                        analyzed_count += 1
+                        fresh.append(result)
+                        yield result
+
+                if parallel is False:
+                    for pending_path in backlog:
+                        result = self.analyze_file(pending_path)
+                        analyzed_count += 1
+                        fresh.append(result)
+                        yield result
+                    backlog = []
+                if cache is not None and len(fresh) >= CACHE_FLUSH_RESULTS:
+                    cache.put_many(fresh)
+                    fresh = []
+
+            if backlog and parallel:
+                try:
+                    running[executor.submit(_analyze_chunk, backlog)] = backlog
+                    backlog = []
+                except Exception as e:
+                    logging.warning(f"Parallel analysis failed ({e}); analyzing sequentially")
+            # Fewer files than parallel_min_files needed analysis: no pool
+            for pending_path in backlog:
+                result = self.analyze_file(pending_path)
+                analyzed_count += 1
+                fresh.append(result)
+                yield result
+            for result in self._drain(running, wait=True):
+                analyzed_count += 1
+                fresh.append(result)
+                yield result
+            completed = True
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=completed, cancel_futures=not completed)
+            if cache is not None and fresh:
+                cache.put_many(fresh)
+
+        if executor is not None:
+            logging.info(f"Analyzed {analyzed_count} files with {workers} worker processes")
+        if cache is not None:
+            logging.info(f"Analysis cache: {cached_count} unchanged, {analyzed_count} analyzed")
+
+    def analyze_files(self, files, cache=None, changed_files=None):
+        """Per-file results for files, in input order.
+
+        cache: AnalysisCache; unchanged files are served from it and new results stored.
+        changed_files: absolute paths known to have changed (e.g. from git diff). Other
+            files are trusted from the cache without checking, and analyzed if it has no
+            entry for them. Ignored without a cache: every file is analyzed.
+        """
+        files = list(files)
+        position = {file_path: index for index, file_path in enumerate(files)}
+        return sorted(self.iter_analysis(files, cache, changed_files), key=lambda result: position[result["file"]])
+
+    def _summarize_scans(self, file_results):
+        """Mock/commented-code result schema of analyze_project"""
         analysis_result = {
-            "total_files": len(files),
+            "total_files": len(file_results),
             "files_with_mocks": 0,
             "files_with_commented_code": 0,
             "total_mocks": 0,
@@ -131,12 +464,11 @@ class CodeAnalyzer:
             "details": []
         }
         
-        # Analyze each file
-        for file_path in files:
+        for analyzed in file_results:
             file_result = {
-                "file": file_path,
-                "mocks": self.detect_mocks(file_path),
-                "commented_code": self.detect_commented_code(file_path)
+                "file": analyzed["file"],
+                "mocks": analyzed["mocks"],
+                "commented_code": analyzed["commented_code"]
             }
             
             # Update statistics
@@ -154,6 +486,29 @@ class CodeAnalyzer:
         
         logging.info(f"Project analysis complete: {analysis_result['total_files']} files, {analysis_result['total_mocks']} mocks, {analysis_result['total_commented_code']} commented code blocks")
         return analysis_result
+
+    def _summarize_jwt(self, file_results):
+        """Result schema of check_jwt_implementation"""
+        jwt_files = [analyzed["file"] for analyzed in file_results if analyzed["has_jwt"]]
+        result = {
+            "has_jwt": len(jwt_files) > 0,
+            "jwt_files": jwt_files,
+            "jwt_file_count": len(jwt_files)
+        }
+        
+        if result["has_jwt"]:
+            logging.info(f"JWT implementation confirmed: {result['jwt_file_count']} files")
+        else:
+            logging.warning("JWT implementation not found")
+        
+        return result
+
+    def analyze_project(self, directory=None, cache=None, changed_files=None):
+        """Analyze the entire project (see analyze_files for cache and changed_files)."""
+        if directory is None:
+            directory = self.config["src_dir"]
+        
+        return self._summarize_scans(self.analyze_files(self.find_files(directory), cache, changed_files))
     
     def get_analysis_summary(self, analysis_result):
         """Return analysis result summary."""
@@ -189,10 +544,13 @@ class CodeAnalyzer:
         
         return "\n".join(summary) if summary else "No temporary code found"
     
-    def check_hexagonal_architecture(self, directory=None):
-        """Check hexagonal architecture compliance."""
+    def check_hexagonal_architecture(self, directory=None, roots=None, symbol_index=None):
+        """Check hexagonal architecture compliance. roots: directories already walked.
+        symbol_index: a synced SymbolIndex; imports against the layer rules are then checked too."""
         if directory is None:
             directory = self.config["src_dir"]
+        if roots is None:
+            roots = [root for root, _, _ in os.walk(directory)]
         
         # Hexagonal architecture layers
         hexagonal_layers = {
@@ -204,89 +562,114 @@ class CodeAnalyzer:
         }
         
         # Check directory structure
-        for root, dirs, files in os.walk(directory):
+        for root in roots:
             for layer in hexagonal_layers:
                 if layer in os.path.basename(root).lower():
                     hexagonal_layers[layer] = True
         
+        # Check dependency direction between layers
+        violations = symbol_index.violations() if symbol_index is not None else []
+        
         # Results
         result = {
-            "is_hexagonal": all(hexagonal_layers.values()),
+            "is_hexagonal": all(hexagonal_layers.values()) and not violations,
             "layers": hexagonal_layers,
-            "missing_layers": [layer for layer, exists in hexagonal_layers.items() if not exists]
+            "missing_layers": [layer for layer, exists in hexagonal_layers.items() if not exists],
+            "dependency_violations": violations
         }
         
         if result["is_hexagonal"]:
             logging.info("Hexagonal architecture compliance confirmed")
         else:
-            logging.warning(f"Hexagonal architecture non-compliance: missing layers {result['missing_layers']}")
+            if result["missing_layers"]:
+                logging.warning(f"Hexagonal architecture non-compliance: missing layers {result['missing_layers']}")
+            for violation in violations[:10]:
+                logging.warning(f"Layer violation: {violation['path']}:{violation['line']} "
+                                f"({violation['source_layer']}) imports {violation['target']} ({violation['target_layer']})")
         
         return result
     
-    def check_jwt_implementation(self, directory=None):
-        """Check JWT implementation."""
+    def check_jwt_implementation(self, directory=None, first_match=False, cache=None):
+        """Check JWT implementation. first_match=True stops at the first JWT file
+        (enough to decide has_jwt; jwt_files then holds at most one file)."""
         if directory is None:
             directory = self.config["src_dir"]
         
-        # JWT-related patterns
-        jwt_patterns = [
-            r"import\s+jwt",
-            r"from\s+jwt\s+import",
-            r"\.jwt\.",
-            r"JwtService",
-            r"JWTService",
-            r"TokenService",
-            r"accessToken",
-            r"refreshToken",
-            r"access_token",
-            r"refresh_token"
-        ]
-        
-        # Get file list
-        files = self.find_files(directory)
-        
-        # Check JWT implementation
-        jwt_files = []
-        for file_path in files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                for pattern in jwt_patterns:
-                    if re.search(pattern, content):
-                        jwt_files.append(file_path)
-                        break
-            
-            except Exception as e:
-                logging.error(f"Error checking JWT implementation: {e}")
+        if first_match:
+            gate = self.run_quality_gate(directory, stop_on_jwt=True, cache=cache)
+            return self._summarize_jwt([{"file": file_path, "has_jwt": True} for file_path in gate["jwt_files"]])
+        return self._summarize_jwt(self.analyze_files(self.find_files(directory), cache))
+    
+    def run_quality_gate(self, directory=None, max_mocks=None, max_commented_code=None, stop_on_jwt=False,
+                         cache=None, changed_files=None):
+        """Stream the analysis of directory and stop as soon as a gate condition is met.
+
+        max_mocks / max_commented_code: stop once this many findings have been seen.
+        stop_on_jwt: stop at the first file with a JWT implementation.
+        Files after the stopping point are not analyzed. Totals cover the analyzed files only.
+        """
+        if directory is None:
+            directory = self.config["src_dir"]
         
-        # Results
         result = {
-            "has_jwt": len(jwt_files) > 0,
-            "jwt_files": jwt_files,
-            "jwt_file_count": len(jwt_files)
+            "triggered": False,
+            "reason": None,
+            "files_analyzed": 0,
+            "total_mocks": 0,
+            "total_commented_code": 0,
+            "jwt_files": [],
+            "details": []
         }
-        
-        if result["has_jwt"]:
-            logging.info(f"JWT implementation confirmed: {result['jwt_file_count']} files")
+        analysis = self.iter_analysis(self.iter_files(directory), cache, changed_files)
+        try:
+            for analyzed in analysis:
+                result["files_analyzed"] += 1
+                result["total_mocks"] += len(analyzed["mocks"])
+                result["total_commented_code"] += len(analyzed["commented_code"])
+                if analyzed["mocks"] or analyzed["commented_code"]:
+                    result["details"].append({
+                        "file": analyzed["file"],
+                        "mocks": analyzed["mocks"],
+                        "commented_code": analyzed["commented_code"]
+                    })
+                if analyzed["has_jwt"]:
+                    result["jwt_files"].append(analyzed["file"])
+                
+                if max_mocks is not None and result["total_mocks"] >= max_mocks:
+                    result["reason"] = f"{result['total_mocks']} mocks found (limit {max_mocks})"
+                elif max_commented_code is not None and result["total_commented_code"] >= max_commented_code:
+                    result["reason"] = (f"{result['total_commented_code']} commented code blocks found "
+                                        f"(limit {max_commented_code})")
+                elif stop_on_jwt and analyzed["has_jwt"]:
+                    result["reason"] = f"JWT implementation found in {analyzed['file']}"
+                if result["reason"]:
+                    result["triggered"] = True
+                    break
+        finally:
+            analysis.close()  # Cancels the remaining work
+        
+        if result["triggered"]:
+            logging.info(f"Quality gate triggered after {result['files_analyzed']} files: {result['reason']}")
         else:
-            logging.warning("JWT implementation not found")
-        
+            logging.info(f"Quality gate not triggered: {result['files_analyzed']} files analyzed")
         return result
     
-    def analyze_code_quality(self, directory=None):
-        """Analyze code quality comprehensively."""
+    def analyze_code_quality(self, directory=None, cache=None, changed_files=None, symbol_index=None):
+        """Analyze code quality comprehensively. symbol_index: SymbolIndex of directory,
+        synced with the discovered files and used for the layer dependency check."""
         if directory is None:
             directory = self.config["src_dir"]
         
-        # Analyze mocks and commented code
-        mock_analysis = self.analyze_project(directory)
+        # One walk and one read per file feed both the mock and JWT checks
+        files, roots = self._walk(directory)
+        file_results = self.analyze_files(files, cache, changed_files)
+        mock_analysis = self._summarize_scans(file_results)
+        jwt_check = self._summarize_jwt(file_results)
         
         # Check hexagonal architecture
-        hexagonal_check = self.check_hexagonal_architecture(directory)
-        
-        # Check JWT implementation
-        jwt_check = self.check_jwt_implementation(directory)
+        if symbol_index is not None:
+            symbol_index.sync(files)
+        hexagonal_check = self.check_hexagonal_architecture(directory, roots, symbol_index)
         
         # Comprehensive results
         result = {
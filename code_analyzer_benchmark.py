@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Code Analyzer Benchmark - synthetic corpora and a scaling report for CodeAnalyzer
+
+Generates hexagonal Python/Java source trees of a given size with a
+controlled density of mock lines, commented-out code, JWT references and
+layer violations, then times the analyzer entry points on them:
+
+    find_files, analyze_project, check_jwt_implementation, analyze_code_quality
+
+each with a cold cache (analysis cache, file list cache and symbol index
+deleted) and a warm one (the same caches, second run), plus analyze_project
+without a cache across worker counts. Every measurement runs in a fresh
+Python process so its peak RSS is its own; the peak RSS of its child
+processes (pool workers, git) is reported separately. The OS page cache is
+not dropped between runs.
+
+    python code_analyzer_benchmark.py --sizes 1000,10000,100000 --workers 1,2,4
+    python code_analyzer_benchmark.py --sizes 1000 --report logs/analyzer_benchmark.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("analyzer_benchmark")
+
+OPERATIONS = ("find_files", "analyze_project", "check_jwt_implementation", "analyze_code_quality")
+LAYERS = ("domain", "application", "ports", "infrastructure", "adapters")
+
+DEFAULT_CORPUS_CONFIG = {
+    "java_ratio": 0.5,            # Share of Java files; the rest is Python
+    "lines_per_file": 60,         # Body lines per file
+    "mock_density": 0.02,         # Probability of a body line being a mock line
+    "comment_density": 0.05,      # Probability of a body line being commented-out code
+    "jwt_ratio": 0.01,            # Share of files referencing JWT tokens
+    "violation_ratio": 0.01,      # Share of domain files importing infrastructure
+    "files_per_package": 100,
+    "seed": 1
+}
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+RSS_UNIT_MB = 1 / (1024 * 1024) if sys.platform == "darwin" else 1 / 1024
+
+
+def _python_file(index: int, layer: str, config: Dict, rng: random.Random, counts: Dict) -> str:
+    lines = [f'"""Synthetic {layer} module {index}"""', "import os", "from typing import List"]
+    if layer == "domain" and rng.random() < config["violation_ratio"]:
+        lines.append("from bench.infrastructure.anchor import Anchor")
+        counts["violations"] += 1
+    if rng.random() < config["jwt_ratio"]:
+        lines.append("access_token = os.environ.get('TOKEN')")
+        counts["jwt_files"] += 1
+    lines += ["", "", f"class Service{index}:", f"    def handle_{index}(self, value: int) -> List[int]:"]
+    for line in range(config["lines_per_file"]):
+        roll = rng.random()
+        if roll < config["mock_density"]:
+            lines.append("        helper = mock.MagicMock()")
+            counts["mocks"] += 1
+        elif roll < config["mock_density"] + config["comment_density"]:
+            lines.append(f"        # process_{line}(value)")
+            counts["commented_code"] += 1
+        else:
+            lines.append(f"        value = value * {line % 7 + 1} + {line}  # step {line}")
+    lines.append("        return [value]")
+    return "\n".join(lines) + "\n"
+
+
+def _java_file(index: int, layer: str, package: str, config: Dict, rng: random.Random, counts: Dict) -> str:
+    lines = [f"package {package};", "", "import java.util.List;"]
+    if layer == "domain" and rng.random() < config["violation_ratio"]:
+        lines.append("import com.bench.infrastructure.Anchor;")
+        counts["violations"] += 1
+    lines += ["", f"public class Service{index} {{"]
+    if rng.random() < config["jwt_ratio"]:
+        lines.append("    private String accessToken;")
+        counts["jwt_files"] += 1
+    lines.append(f"    public int handle{index}(int value) {{")
+    for line in range(config["lines_per_file"]):
+        roll = rng.random()
+        if roll < config["mock_density"]:
+            lines.append("        Object stub = mock.create(Object.class);")
+            counts["mocks"] += 1
+        elif roll < config["mock_density"] + config["comment_density"]:
+            lines.append(f"        // value = process{line}(value);")
+            counts["commented_code"] += 1
+        else:
+            lines.append(f"        value = value * {line % 7 + 1} + {line}; // step {line}")
+    lines += ["        return value;", "    }", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(root: str, file_count: int, config: Optional[Dict] = None, git: bool = False) -> Dict[str, Any]:
+    """Write a synthetic source tree under root/src (reused if root holds one with the same
+    parameters) and return its manifest with the generated finding counts."""
+    config = {**DEFAULT_CORPUS_CONFIG, **(config or {})}
+    manifest_path = os.path.join(root, "manifest.json")
+    wanted = {"files": file_count, "config": config, "git": git}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if {key: manifest.get(key) for key in wanted} == wanted:
+            return manifest
+        shutil.rmtree(root)
+
+    start = time.perf_counter()
+    rng = random.Random(config["seed"])
+    counts = {"mocks": 0, "commented_code": 0, "jwt_files": 0, "violations": 0}
+    src = os.path.join(root, "src")
+    # Infrastructure classes the generated layer violations import; they count towards file_count
+    anchors = {
+        os.path.join(src, "main", "java", "com", "bench", "infrastructure", "Anchor.java"):
+            "package com.bench.infrastructure;\n\npublic class Anchor {}\n",
+        os.path.join(src, "bench", "infrastructure", "anchor.py"): "class Anchor:\n    pass\n"
+    }
+    for path, content in anchors.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    for index in range(max(0, file_count - len(anchors))):
+        layer = LAYERS[index % len(LAYERS)]
+        sub_package = f"p{index // (config['files_per_package'] * len(LAYERS))}"
+        if rng.random() < config["java_ratio"]:
+            package = f"com.bench.{layer}.{sub_package}"
+            directory = os.path.join(src, "main", "java", *package.split("."))
+            filename, content = f"Service{index}.java", _java_file(index, layer, package, config, rng, counts)
+        else:
+            directory = os.path.join(src, "bench", layer, sub_package)
+            filename, content = f"mod_{index}.py", _python_file(index, layer, config, rng, counts)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    if git:
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(["git", "add", "src"], cwd=root, check=True)
+        subprocess.run(["git", "-c", "user.name=benchmark", "-c", "user.email=benchmark@localhost",
+                        "commit", "-q", "-m", "Synthetic corpus"], cwd=root, check=True)
+
+    manifest = {**wanted, "expected": counts, "generated_in_s": round(time.perf_counter() - start, 2)}
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Generated {file_count} files under {src} in {manifest['generated_in_s']}s")
+    return manifest
+
+
+def _peak_rss_mb(who) -> Optional[float]:
+    if not RESOURCE_AVAILABLE:
+        return None
+    return round(resource.getrusage(who).ru_maxrss * RSS_UNIT_MB, 1)
+
+
+def measure(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one operation in this process (see run_isolated) and return its timings"""
+    from code_analyzer import CodeAnalyzer
+    from analysis_cache import AnalysisCache
+    from symbol_index import SymbolIndex
+
+    logging.getLogger().setLevel(logging.WARNING)
+    src = os.path.join(spec["corpus"], "src")
+    cache_dir = spec["cache_dir"]
+    analyzer = CodeAnalyzer()
+    analyzer.config["max_workers"] = spec["workers"]
+    analyzer.config["file_list_cache"] = os.path.join(cache_dir, "file_list_cache.json") if spec["cache"] else None
+    cache = AnalysisCache(os.path.join(cache_dir, "analysis_cache.db"), analyzer.config_signature()) \
+        if spec["cache"] else None
+
+    operation = spec["operation"]
+    findings: Dict[str, Any] = {}
+    start = time.perf_counter()
+    if operation == "find_files":
+        findings["files"] = len(analyzer.find_files(src))
+    elif operation == "analyze_project":
+        result = analyzer.analyze_project(src, cache=cache)
+        findings = {"files": result["total_files"], "mocks": result["total_mocks"],
+                    "commented_code": result["total_commented_code"]}
+    elif operation == "check_jwt_implementation":
+        findings["jwt_files"] = analyzer.check_jwt_implementation(src, cache=cache)["jwt_file_count"]
+    elif operation == "analyze_code_quality":
+        symbol_index = SymbolIndex(src, os.path.join(cache_dir, "symbol_index.db")) if spec["cache"] else None
+        result = analyzer.analyze_code_quality(src, cache=cache, symbol_index=symbol_index)
+        findings = {"files": result["mock_analysis"]["total_files"], "score": result["overall_quality"]["score"],
+                    "violations": len(result["hexagonal_check"]["dependency_violations"])}
+    else:
+        raise ValueError(f"Unknown operation: {operation}")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "operation": operation,
+        "workers": spec["workers"],
+        "cache": spec["label"],
+        "seconds": round(elapsed, 3),
+        "files_per_s": round(spec["files"] / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF) if RESOURCE_AVAILABLE else None,
+        "peak_children_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN) if RESOURCE_AVAILABLE else None,
+        "findings": findings
+    }
+
+
+def run_isolated(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """measure(spec) in a fresh interpreter, so peak RSS and caches start from zero"""
+    script = os.path.abspath(__file__)
+    completed = subprocess.run([sys.executable, script, "--measure", json.dumps(spec)],
+                               cwd=os.path.dirname(script), capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Measurement {spec['operation']} failed: {completed.stderr.strip()[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(sizes: List[int], workers_list: List[int], corpus_dir: str,
+                  operations=OPERATIONS, corpus_config: Optional[Dict] = None, git: bool = False) -> Dict[str, Any]:
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "sizes": {}
+    }
+    default_workers = max(workers_list)
+    for size in sizes:
+        corpus = os.path.join(corpus_dir, f"corpus_{size}")
+        manifest = generate_corpus(corpus, size, corpus_config, git)
+        cache_dir = os.path.join(corpus, "cache")
+        base = {"corpus": corpus, "cache_dir": cache_dir, "files": size, "workers": default_workers}
+
+        results = []
+        for operation in operations:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.makedirs(cache_dir)
+            for label in ("cold", "warm"):
+                result = run_isolated({**base, "operation": operation, "cache": True, "label": label})
+                logger.info(f"{size} files, {operation} ({label}): {result['seconds']}s, "
+                            f"{result['files_per_s']} files/s")
+                results.append(result)
+
+        scaling = []
+        for workers in workers_list:
+            result = run_isolated({**base, "operation": "analyze_project", "cache": False, "label": "none",
+                                   "workers": workers})
+            scaling.append(result)
+            logger.info(f"{size} files, analyze_project with {workers} worker(s): {result['seconds']}s")
+        baseline = scaling[0]["seconds"] if scaling else None
+        for result in scaling:
+            result["speedup"] = round(baseline / result["seconds"], 2) if baseline and result["seconds"] else None
+
+        report["sizes"][str(size)] = {"corpus": manifest, "operations": results, "scaling": scaling}
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"CodeAnalyzer benchmark {report['generated_at']} (Python {report['python']}, "
+             f"{report['cpu_count']} CPUs)"]
+    for size, section in report["sizes"].items():
+        expected = section["corpus"]["expected"]
+        lines.append("")
+        lines.append(f"== {size} files (generated: {expected['mocks']} mocks, {expected['commented_code']} "
+                     f"commented code, {expected['jwt_files']} JWT files, {expected['violations']} violations)")
+        lines.append(f"{'operation':<26}{'cache':<7}{'seconds':>9}{'files/s':>11}{'rss MB':>9}{'children MB':>13}  findings")
+        for r in section["operations"]:
+            lines.append(f"{r['operation']:<26}{r['cache']:<7}{r['seconds']:>9}{r['files_per_s'] or '-':>11}"
+                         f"{r['peak_rss_mb'] or '-':>9}{r['peak_children_rss_mb'] or '-':>13}  {r['findings']}")
+        lines.append(f"{'workers':<10}{'seconds':>9}{'files/s':>11}{'speedup':>9}{'rss MB':>9}{'children MB':>13}")
+        for r in section["scaling"]:
+            lines.append(f"{r['workers']:<10}{r['seconds']:>9}{r['files_per_s'] or '-':>11}{r['speedup'] or '-':>9}"
+                         f"{r['peak_rss_mb'] or '-':>9}{r['peak_children_rss_mb'] or '-':>13}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CodeAnalyzer on synthetic source trees')
+    parser.add_argument('--sizes', default="1000,10000", help='Comma-separated corpus sizes (files)')
+    parser.add_argument('--workers', default=f"1,{os.cpu_count() or 1}", help='Comma-separated worker counts')
+    parser.add_argument('--operations', default=",".join(OPERATIONS), help='Comma-separated operations to time')
+    parser.add_argument('--corpus-dir', default=os.path.join("logs", "analyzer_benchmark"),
+                        help='Where corpora are generated (reused across runs)')
+    parser.add_argument('--corpus-config', help='JSON file overriding DEFAULT_CORPUS_CONFIG')
+    parser.add_argument('--git', action='store_true', help='Commit each corpus to git (exercises git file discovery)')
+    parser.add_argument('--report', help='Write the report to this JSON file')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)  # Internal: one measurement as JSON
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(json.loads(args.measure))))
+        return
+
+    corpus_config = None
+    if args.corpus_config:
+        with open(args.corpus_config, 'r', encoding='utf-8') as f:
+            corpus_config = json.load(f)
+
+    report = run_benchmark(
+        [int(size) for size in args.sizes.split(",") if size.strip()],
+        sorted({int(workers) for workers in args.workers.split(",") if workers.strip()}),
+        os.path.abspath(args.corpus_dir),
+        [operation.strip() for operation in args.operations.split(",") if operation.strip()],
+        corpus_config,
+        args.git
+    )
+    print(format_report(report))
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,63 @@ Dashboard API Server
 Provides REST API endpoints for monitoring automation tasks and system status
 """
 
-from flask import Flask, jsonify, request, Response
+from flask import Flask, jsonify, request, Response, make_response
 from flask_cors import CORS
+from functools import wraps
 import json
 import os
+import time
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-import subprocess
+from typing import Optional, List
 
 # Add current directory to Python path for imports
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from task_versioning import changes_since
+from task_index import get_task_index
+# Paths, file helpers and response builders shared with dashboard_api_async
+from dashboard_common import (
+    PROJECT_ROOT,
+    TASKS_FILE,
+    ORCHESTRATOR_PROGRESS_FILE,
+    TEST_HISTORY_FILE,
+    ORCHESTRATOR_LOG_FILE,
+    CLAUDE_LOG_FILE,
+    CHANGES_MAX_WAIT_S,
+    CHANGES_POLL_INTERVAL_S,
+    SSE_KEEPALIVE_S,
+    ORCHESTRATOR_COMMAND,
+    orchestrator_supervisor,
+    read_json_file,
+    write_tasks_file,
+    read_log_tail,
+    file_signature,
+    has_changes,
+    GZIP_MIN_SIZE,
+    compute_etag,
+    accepts_gzip,
+    gzip_body,
+    build_tasks_payload,
+    wants_page,
+    build_tasks_page,
+    find_task,
+    find_subtask,
+    add_task_record,
+    apply_task_status,
+    build_progress_payload,
+    build_history_payload,
+    build_stats_payload,
+    build_test_history_payload,
+    build_taskmaster_show_payload,
+    build_taskmaster_list_payload,
+    build_taskmaster_page,
+    build_taskmaster_status_payload,
+    apply_task_reset,
+)
+
 # Import Task Master functionality - with error handling
 try:
     from task_master_wrapper import TaskMasterWrapper
@@ -37,49 +80,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Configuration
-PROJECT_ROOT = Path(__file__).resolve().parent
-TASKS_FILE = PROJECT_ROOT / "tasks.json"
-ORCHESTRATOR_PROGRESS_FILE = PROJECT_ROOT / "logs" / "orchestrator_progress.json"
-TEST_HISTORY_FILE = PROJECT_ROOT / "logs" / "test_history.json"
-ORCHESTRATOR_LOG_FILE = PROJECT_ROOT / "logs" / "automation_orchestrator.log"
-CLAUDE_LOG_FILE = PROJECT_ROOT / "logs" / "claude_automation.log"
-
-# --- Helper Functions ---
-
-def read_json_file(file_path: Path, default_data: Any = None) -> Any:
-    """Read JSON file with error handling"""
-    if not file_path.exists():
-        return default_data if default_data is not None else {}
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"Error reading {file_path}: {e}")
-        return default_data if default_data is not None else {}
-
-def write_json_file(file_path: Path, data: Any) -> bool:
-    """Write JSON file with error handling"""
-    try:
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
-        logger.error(f"Error writing {file_path}: {e}")
-        return False
-
-def read_log_tail(file_path: Path, lines: int = 100) -> List[str]:
-    """Read the last N lines from a log file"""
-    if not file_path.exists():
-        return []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            all_lines = f.readlines()
-            return all_lines[-lines:]
-    except Exception as e:
-        logger.error(f"Error reading log {file_path}: {e}")
-        return []
+# --- Conditional GET ---
+
+def conditional_get(*paths: Path, compress: bool = False):
+    """Serve 304 Not Modified when none of the source files changed.
+
+    The ETag is checked before the view runs. With compress=True, 200
+    responses are gzipped for clients that accept it.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(paths, request.full_path)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+            
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            
+            response.set_etag(etag, weak=True)
+            if compress:
+                response.vary.add('Accept-Encoding')
+                data = response.get_data()
+                if len(data) >= GZIP_MIN_SIZE and accepts_gzip(request.headers.get('Accept-Encoding')):
+                    response.set_data(gzip_body(data))
+                    response.headers['Content-Encoding'] = 'gzip'
+            return response
+        return wrapper
+    return decorator
 
 # --- API Endpoints ---
 
@@ -95,56 +126,102 @@ def health_check():
 # Task Management Endpoints
 
 @app.route('/api/tasks', methods=['GET'])
+@conditional_get(TASKS_FILE, compress=True)
 def get_tasks():
-    """Get all tasks with optional filtering"""
-    status_filter = request.args.get('status')
-    priority_filter = request.args.get('priority')
+    """Get all tasks with optional filtering.
+    
+    Passing limit, cursor, fields, ready or updated_since returns a cursor
+    paginated page served from the task index instead of the full list
+    (ordered by update time, oldest first, when updated_since is given).
+    """
+    if wants_page(request.args):
+        try:
+            return jsonify(build_tasks_page(get_task_index(TASKS_FILE), request.args))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     
     tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
-    tasks_list = tasks_data.get("tasks", [])
-    
-    # Apply filters
-    if status_filter:
-        tasks_list = [task for task in tasks_list if task.get("status") == status_filter]
-    if priority_filter:
-        tasks_list = [task for task in tasks_list if task.get("priority") == priority_filter]
+    return jsonify(build_tasks_payload(
+        tasks_data,
+        request.args.get('status'),
+        request.args.get('priority')
+    ))
+
+@app.route('/api/tasks/changes', methods=['GET'])
+def get_task_changes():
+    """Get tasks and subtasks changed since a version.
+    
+    Query: since=<version> (omit for a full snapshot), wait=<seconds> to
+    long-poll until something changes.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        wait = min(float(request.args.get('wait', 0)), CHANGES_MAX_WAIT_S)
+    except ValueError:
+        return jsonify({'error': 'since and wait must be numeric'}), 400
+    
+    deadline = time.monotonic() + wait
+    while True:
+        signature = file_signature(TASKS_FILE)
+        changes = changes_since(read_json_file(TASKS_FILE, {"tasks": []}), since)
+        if has_changes(changes) or time.monotonic() >= deadline:
+            return jsonify(changes)
+        
+        while file_signature(TASKS_FILE) == signature and time.monotonic() < deadline:
+            time.sleep(CHANGES_POLL_INTERVAL_S)
+
+@app.route('/api/tasks/changes/stream', methods=['GET'])
+def stream_task_changes():
+    """Push task changes as Server-Sent Events.
+    
+    Resumes from ?since=<version> or the Last-Event-ID header.
+    """
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'since must be numeric'}), 400
     
-    # Add subtask counts
-    for task in tasks_list:
-        subtasks = task.get("subtasks", [])
-        task['subtask_count'] = len(subtasks)
-        task['completed_subtasks'] = len([st for st in subtasks if st.get("status") == "done"])
+    def generate():
+        last_version = since
+        signature = None
+        last_sent = time.monotonic()
+        while True:
+            current = file_signature(TASKS_FILE)
+            if current != signature:
+                signature = current
+                changes = changes_since(read_json_file(TASKS_FILE, {"tasks": []}), last_version)
+                if has_changes(changes):
+                    last_version = changes['version']
+                    last_sent = time.monotonic()
+                    yield f"id: {last_version}\nevent: changes\ndata: {json.dumps(changes)}\n\n"
+            elif time.monotonic() - last_sent > SSE_KEEPALIVE_S:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+            time.sleep(CHANGES_POLL_INTERVAL_S)
     
-    return jsonify({
-        'tasks': tasks_list,
-        'total': len(tasks_list)
-    })
+    return Response(generate(), mimetype='text/event-stream')
 
 @app.route('/api/tasks/<string:task_id>', methods=['GET'])
+@conditional_get(TASKS_FILE)
 def get_task_detail(task_id: str):
     """Get detailed information about a specific task"""
     tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
     
-    for task in tasks_data.get("tasks", []):
-        if str(task.get("id")) == task_id:
-            return jsonify(task)
+    task = find_task(tasks_data, task_id)
+    if task:
+        return jsonify(task)
     
     return jsonify({'error': 'Task not found'}), 404
 
 @app.route('/api/tasks/<string:task_id>/subtasks/<string:subtask_id>', methods=['GET'])
+@conditional_get(TASKS_FILE)
 def get_subtask_detail(task_id: str, subtask_id: str):
     """Get detailed information about a specific subtask"""
     tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
     
-    for task in tasks_data.get("tasks", []):
-        if str(task.get("id")) == task_id:
-            for subtask in task.get("subtasks", []):
-                if str(subtask.get("id")) == subtask_id:
-                    return jsonify({
-                        **subtask,
-                        'parent_task_id': task_id,
-                        'parent_task_name': task.get('name')
-                    })
+    subtask = find_subtask(tasks_data, task_id, subtask_id)
+    if subtask:
+        return jsonify(subtask)
     
     return jsonify({'error': 'Subtask not found'}), 404
 
@@ -157,26 +234,9 @@ def create_task():
             return jsonify({'error': 'Task name is required'}), 400
         
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
-        tasks_list = tasks_data.get("tasks", [])
-        
-        # Generate new ID
-        max_id = max([int(task.get("id", 0)) for task in tasks_list], default=0)
-        new_id = str(max_id + 1)
-        
-        new_task = {
-            'id': new_id,
-            'name': data['name'],
-            'description': data.get('description', ''),
-            'priority': data.get('priority', 'medium'),
-            'status': data.get('status', 'pending'),
-            'created_at': datetime.now().isoformat(),
-            'subtasks': []
-        }
-        
-        tasks_list.append(new_task)
-        tasks_data['tasks'] = tasks_list
+        new_task = add_task_record(tasks_data, data)
         
-        if write_json_file(TASKS_FILE, tasks_data):
+        if write_tasks_file(TASKS_FILE, tasks_data):
             return jsonify(new_task), 201
         else:
             return jsonify({'error': 'Failed to save task'}), 500
@@ -194,21 +254,11 @@ def update_task_status(task_id: str):
             return jsonify({'error': 'Status is required'}), 400
         
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
-        tasks_list = tasks_data.get("tasks", [])
         
-        task_found = False
-        for task in tasks_list:
-            if str(task.get("id")) == task_id:
-                task['status'] = data['status']
-                task['updated_at'] = datetime.now().isoformat()
-                task_found = True
-                break
-        
-        if not task_found:
+        if not apply_task_status(tasks_data, task_id, data['status']):
             return jsonify({'error': 'Task not found'}), 404
         
-        tasks_data['tasks'] = tasks_list
-        if write_json_file(TASKS_FILE, tasks_data):
+        if write_tasks_file(TASKS_FILE, tasks_data):
             return jsonify({'message': 'Task status updated'}), 200
         else:
             return jsonify({'error': 'Failed to update task'}), 500
@@ -220,78 +270,26 @@ def update_task_status(task_id: str):
 # Progress and History Endpoints
 
 @app.route('/api/progress/current', methods=['GET'])
+@conditional_get(ORCHESTRATOR_PROGRESS_FILE)
 def get_current_progress():
     """Get current automation progress"""
     progress_data = read_json_file(ORCHESTRATOR_PROGRESS_FILE)
-    
-    # Calculate overall progress
-    if progress_data:
-        total_tasks = progress_data.get('total_tasks', 0)
-        completed_tasks = progress_data.get('completed_tasks', 0)
-        progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        progress_data['progress_percentage'] = progress_percentage
-    
-    return jsonify(progress_data)
+    return jsonify(build_progress_payload(progress_data))
 
 @app.route('/api/progress/history', methods=['GET'])
+@conditional_get(ORCHESTRATOR_LOG_FILE, compress=True)
 def get_progress_history():
     """Get historical execution data"""
     # This would typically query a database, but for now we'll use log parsing
-    history = []
-    
-    # Parse orchestrator log for execution history
     log_lines = read_log_tail(ORCHESTRATOR_LOG_FILE, 1000)
-    
-    for line in log_lines:
-        if "Task completed:" in line or "Task failed:" in line:
-            # Simple parsing - in production, use structured logging
-            parts = line.split(' - ')
-            if len(parts) >= 4:
-                timestamp = parts[0]
-                status = 'completed' if 'completed' in line else 'failed'
-                history.append({
-                    'timestamp': timestamp,
-                    'status': status,
-                    'message': parts[-1].strip()
-                })
-    
-    return jsonify({
-        'history': history[-50:],  # Last 50 entries
-        'total_entries': len(history)
-    })
+    return jsonify(build_history_payload(log_lines))
 
 @app.route('/api/progress/stats', methods=['GET'])
+@conditional_get(TASKS_FILE)
 def get_progress_stats():
     """Get automation statistics"""
     tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
-    tasks_list = tasks_data.get("tasks", [])
-    
-    # Calculate statistics
-    stats = {
-        'total_tasks': len(tasks_list),
-        'completed_tasks': len([t for t in tasks_list if t.get('status') == 'done']),
-        'pending_tasks': len([t for t in tasks_list if t.get('status') == 'pending']),
-        'in_progress_tasks': len([t for t in tasks_list if t.get('status') == 'in-progress']),
-        'failed_tasks': len([t for t in tasks_list if t.get('status') == 'failed']),
-        'priority_breakdown': {
-            'high': len([t for t in tasks_list if t.get('priority') == 'high']),
-            'medium': len([t for t in tasks_list if t.get('priority') == 'medium']),
-            'low': len([t for t in tasks_list if t.get('priority') == 'low'])
-        }
-    }
-    
-    # Add subtask statistics
-    total_subtasks = sum(len(task.get('subtasks', [])) for task in tasks_list)
-    completed_subtasks = sum(
-        len([st for st in task.get('subtasks', []) if st.get('status') == 'done'])
-        for task in tasks_list
-    )
-    
-    stats['total_subtasks'] = total_subtasks
-    stats['completed_subtasks'] = completed_subtasks
-    
-    return jsonify(stats)
+    return jsonify(build_stats_payload(tasks_data))
 
 # Log Endpoints
 
@@ -352,19 +350,14 @@ def stream_logs():
 # Test Results Endpoints
 
 @app.route('/api/tests/history', methods=['GET'])
+@conditional_get(TEST_HISTORY_FILE, compress=True)
 def get_test_history():
     """Get test execution history"""
     test_history = read_json_file(TEST_HISTORY_FILE, [])
-    
-    # Sort by timestamp (most recent first)
-    test_history.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    
-    return jsonify({
-        'test_runs': test_history[:50],  # Last 50 test runs
-        'total_runs': len(test_history)
-    })
+    return jsonify(build_test_history_payload(test_history))
 
 @app.route('/api/tests/latest', methods=['GET'])
+@conditional_get(TEST_HISTORY_FILE)
 def get_latest_tests():
     """Get the most recent test results"""
     test_history = read_json_file(TEST_HISTORY_FILE, [])
@@ -384,14 +377,7 @@ def get_latest_tests():
 def get_orchestrator_status():
     """Get orchestrator process status"""
     try:
-        # Check if orchestrator process is running
-        result = subprocess.run(['pgrep', '-f', 'task_orchestrator'], capture_output=True, text=True)
-        is_running = result.returncode == 0
-        
-        return jsonify({
-            'running': is_running,
-            'pid': result.stdout.strip() if is_running else None
-        })
+        return jsonify(orchestrator_supervisor.status())
     except Exception as e:
         logger.error(f"Error checking orchestrator status: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -400,22 +386,13 @@ def get_orchestrator_status():
 def start_orchestrator():
     """Start the orchestrator process"""
     try:
-        # Check if already running
-        status_result = subprocess.run(['pgrep', '-f', 'task_orchestrator'], capture_output=True)
-        if status_result.returncode == 0:
-            return jsonify({'message': 'Orchestrator already running'}), 200
-        
-        # Start orchestrator in background
-        process = subprocess.Popen(
-            ['python', 'task_orchestrator_enhanced.py'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            start_new_session=True
-        )
+        result = orchestrator_supervisor.start(ORCHESTRATOR_COMMAND, cwd=str(PROJECT_ROOT))
+        if not result['started']:
+            return jsonify({'message': 'Orchestrator already running', 'pid': result['pid']}), 200
         
         return jsonify({
             'message': 'Orchestrator started',
-            'pid': process.pid
+            'pid': result['pid']
         }), 202
         
     except Exception as e:
@@ -426,9 +403,7 @@ def start_orchestrator():
 def stop_orchestrator():
     """Stop the orchestrator process"""
     try:
-        result = subprocess.run(['pkill', '-f', 'task_orchestrator'], capture_output=True)
-        
-        if result.returncode == 0:
+        if orchestrator_supervisor.stop():
             return jsonify({'message': 'Orchestrator stopped'}), 200
         else:
             return jsonify({'message': 'Orchestrator not running'}), 200
@@ -446,46 +421,9 @@ def taskmaster_show_task(task_id: str):
         # Read tasks data directly
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
         
-        # Find the task
-        for task in tasks_data.get("tasks", []):
-            if str(task.get("id")) == task_id:
-                # Format the output similar to task_master_wrapper.py show command
-                status_emoji = {
-                    "pending": "⏳",
-                    "in_progress": "🔄", 
-                    "completed": "✅",
-                    "failed": "❌"
-                }.get(task.get("status", "pending"), "❓")
-                
-                result = {
-                    "task_id": task_id,
-                    "name": task.get("name", "Unnamed Task"),
-                    "description": task.get("description", ""),
-                    "status": task.get("status", "pending"),
-                    "status_emoji": status_emoji,
-                    "priority": task.get("priority", "medium"),
-                    "subtasks": task.get("subtasks", []),
-                    "started_at": task.get("started_at"),
-                    "completed_at": task.get("completed_at"),
-                    "created_at": task.get("created_at"),
-                    "updated_at": task.get("updated_at")
-                }
-                
-                # Add subtask progress
-                subtasks = task.get("subtasks", [])
-                if subtasks:
-                    completed_subtasks = sum(1 for st in subtasks if st.get("status") == "completed")
-                    result["subtask_progress"] = {
-                        "total": len(subtasks),
-                        "completed": completed_subtasks,
-                        "percentage": (completed_subtasks / len(subtasks) * 100) if subtasks else 0
-                    }
-                
-                return jsonify({
-                    "success": True,
-                    "task": result,
-                    "stdout": f"Task {task_id}: {task.get('name', 'Unnamed Task')}\nStatus: {task.get('status', 'pending')}\nDescription: {task.get('description', '')}"
-                })
+        payload = build_taskmaster_show_payload(tasks_data, task_id)
+        if payload:
+            return jsonify(payload)
         
         return jsonify({
             "success": False,
@@ -502,59 +440,25 @@ def taskmaster_show_task(task_id: str):
         }), 500
 
 @app.route('/api/taskmaster/list', methods=['GET'])
+@conditional_get(TASKS_FILE, compress=True)
 def taskmaster_list_tasks():
     """List all tasks via Task Master"""
     try:
+        show_details = request.args.get('details', 'false').lower() == 'true'
+        if wants_page(request.args):
+            return jsonify(build_taskmaster_page(get_task_index(TASKS_FILE), request.args, show_details))
+        
         # Read tasks data directly
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
         status_filter = request.args.get('status')
-        show_details = request.args.get('details', 'false').lower() == 'true'
         
-        tasks = []
-        for task in tasks_data.get("tasks", []):
-            if status_filter and task.get("status") != status_filter:
-                continue
-                
-            status_emoji = {
-                "pending": "⏳",
-                "in_progress": "🔄",
-                "completed": "✅", 
-                "failed": "❌"
-            }.get(task.get("status", "pending"), "❓")
-            
-            task_info = {
-                "id": task["id"],
-                "name": task.get("name", "Unnamed Task"),
-                "status": task.get("status", "pending"),
-                "status_emoji": status_emoji,
-                "priority": task.get("priority", "medium")
-            }
-            
-            if show_details:
-                task_info["description"] = task.get("description", "")
-                task_info["started_at"] = task.get("started_at")
-                task_info["completed_at"] = task.get("completed_at")
-            
-            # Subtask information
-            subtasks = task.get("subtasks", [])
-            if subtasks:
-                completed_subtasks = sum(1 for st in subtasks if st.get("status") == "completed")
-                task_info["subtasks"] = {
-                    "total": len(subtasks),
-                    "completed": completed_subtasks,
-                    "percentage": (completed_subtasks / len(subtasks) * 100) if subtasks else 0
-                }
-                
-                if show_details:
-                    task_info["subtask_details"] = subtasks
-            
-            tasks.append(task_info)
+        return jsonify(build_taskmaster_list_payload(tasks_data, status_filter, show_details))
         
+    except ValueError as e:
         return jsonify({
-            "success": True,
-            "tasks": tasks,
-            "total": len(tasks)
-        })
+            "success": False,
+            "error": str(e)
+        }), 400
         
     except Exception as e:
         logger.error(f"Error in taskmaster list: {str(e)}")
@@ -570,68 +474,10 @@ def taskmaster_project_status():
         # Read tasks data directly
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
         
-        total_tasks = len(tasks_data.get("tasks", []))
-        if total_tasks == 0:
-            return jsonify({
-                "success": True,
-                "message": "No tasks registered",
-                "stats": {
-                    "total_tasks": 0,
-                    "progress": 0
-                }
-            })
-        
-        # Calculate statistics
-        status_counts = {
-            "pending": 0,
-            "in_progress": 0, 
-            "completed": 0,
-            "failed": 0
-        }
-        
-        total_subtasks = 0
-        completed_subtasks = 0
-        
-        for task in tasks_data.get("tasks", []):
-            status = task.get("status", "pending")
-            status_counts[status] = status_counts.get(status, 0) + 1
-            
-            subtasks = task.get("subtasks", [])
-            total_subtasks += len(subtasks)
-            completed_subtasks += sum(1 for st in subtasks if st.get("status") == "completed")
-        
-        # Calculate progress
-        completed_tasks = status_counts["completed"]
-        task_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        subtask_progress = (completed_subtasks / total_subtasks * 100) if total_subtasks > 0 else 0
-        
-        stats = {
-            "total_tasks": total_tasks,
-            "task_counts": status_counts,
-            "task_progress": round(task_progress, 1),
-            "total_subtasks": total_subtasks,
-            "completed_subtasks": completed_subtasks,
-            "subtask_progress": round(subtask_progress, 1)
-        }
-        
         # Add test history if available
-        test_history_file = PROJECT_ROOT / "logs" / "test_history.json"
-        if test_history_file.exists():
-            try:
-                test_history = read_json_file(test_history_file, {})
-                stats["test_stats"] = {
-                    "total_runs": test_history.get("total_runs", 0),
-                    "total_passes": test_history.get("total_passes", 0),
-                    "total_failures": test_history.get("total_failures", 0),
-                    "last_run": test_history.get("last_run")
-                }
-            except Exception:
-                pass
+        test_history = read_json_file(TEST_HISTORY_FILE, {}) if TEST_HISTORY_FILE.exists() else None
         
-        return jsonify({
-            "success": True,
-            "stats": stats
-        })
+        return jsonify(build_taskmaster_status_payload(tasks_data, test_history))
         
     except Exception as e:
         logger.error(f"Error in taskmaster status: {str(e)}")
@@ -651,35 +497,9 @@ def taskmaster_reset_task():
         # Read tasks data directly
         tasks_data = read_json_file(TASKS_FILE, {"tasks": []})
         
-        task_found = False
-        for task in tasks_data.get("tasks", []):
-            if str(task.get("id")) == str(task_id):
-                if subtask_id:
-                    # Reset specific subtask
-                    for subtask in task.get("subtasks", []):
-                        if str(subtask.get("id")) == str(subtask_id):
-                            subtask["status"] = "pending"
-                            subtask["failure_count"] = 0
-                            task_found = True
-                            break
-                else:
-                    # Reset entire task
-                    task["status"] = "pending"
-                    task["failure_count"] = 0
-                    task.pop("started_at", None)
-                    task.pop("completed_at", None)
-                    
-                    # Reset all subtasks too
-                    for subtask in task.get("subtasks", []):
-                        subtask["status"] = "pending"
-                        subtask["failure_count"] = 0
-                    
-                    task_found = True
-                break
-        
-        if task_found:
+        if apply_task_reset(tasks_data, task_id, subtask_id):
             # Save the updated data
-            if write_json_file(TASKS_FILE, tasks_data):
+            if write_tasks_file(TASKS_FILE, tasks_data):
                 return jsonify({
                     "success": True,
                     "message": f"Reset {'subtask' if subtask_id else 'task'} status successfully"
@@ -0,0 +1,526 @@
+"""
+Dashboard Common - paths, file helpers and response builders shared by both dashboard servers
+
+dashboard_api (Flask) and dashboard_api_async (Quart) import everything that
+does not depend on a web framework from here, so both serving modes return
+identical payloads and either can run without the other's framework installed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from process_supervisor import OrchestratorSupervisor
+from task_versioning import mark_changed, save_tasks_file
+from task_index import project_fields, DEFAULT_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+PROJECT_ROOT = Path(__file__).resolve().parent
+TASKS_FILE = PROJECT_ROOT / "tasks.json"
+ORCHESTRATOR_PROGRESS_FILE = PROJECT_ROOT / "logs" / "orchestrator_progress.json"
+TEST_HISTORY_FILE = PROJECT_ROOT / "logs" / "test_history.json"
+ORCHESTRATOR_LOG_FILE = PROJECT_ROOT / "logs" / "automation_orchestrator.log"
+CLAUDE_LOG_FILE = PROJECT_ROOT / "logs" / "claude_automation.log"
+
+# Change feed tuning
+CHANGES_MAX_WAIT_S = 60
+CHANGES_POLL_INTERVAL_S = 0.25
+SSE_KEEPALIVE_S = 15
+
+# Orchestrator process supervision
+ORCHESTRATOR_PID_FILE = PROJECT_ROOT / "logs" / "orchestrator.pid"
+ORCHESTRATOR_HEARTBEAT_FILE = PROJECT_ROOT / "logs" / "orchestrator_heartbeat.json"
+ORCHESTRATOR_COMMAND = [sys.executable, 'task_orchestrator_enhanced.py']
+
+# Orchestrator liveness is tracked from its PID/heartbeat files, not pgrep
+orchestrator_supervisor = OrchestratorSupervisor(ORCHESTRATOR_PID_FILE, ORCHESTRATOR_HEARTBEAT_FILE)
+
+# --- Helper Functions ---
+
+def read_json_file(file_path: Path, default_data: Any = None) -> Any:
+    """Read JSON file with error handling"""
+    if not file_path.exists():
+        return default_data if default_data is not None else {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading {file_path}: {e}")
+        return default_data if default_data is not None else {}
+
+def write_json_file(file_path: Path, data: Any) -> bool:
+    """Write JSON file with error handling"""
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing {file_path}: {e}")
+        return False
+
+def write_tasks_file(file_path: Path, tasks_data: Dict) -> bool:
+    """Save tasks.json, stamping tasks flagged by mark_changed with a new change version"""
+    try:
+        save_tasks_file(file_path, tasks_data)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing {file_path}: {e}")
+        return False
+
+def read_log_tail(file_path: Path, lines: int = 100) -> List[str]:
+    """Read the last N lines from a log file"""
+    if not file_path.exists():
+        return []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            all_lines = f.readlines()
+            return all_lines[-lines:]
+    except Exception as e:
+        logger.error(f"Error reading log {file_path}: {e}")
+        return []
+
+def file_signature(file_path: Path):
+    """Cheap change detector for a file: (mtime_ns, size), or None if missing"""
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def has_changes(changes: Dict) -> bool:
+    """Whether a change-feed payload is worth sending"""
+    return changes['full'] or bool(changes['tasks']) or bool(changes['subtasks'])
+
+# --- Conditional GET Helpers ---
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+def compute_etag(paths, request_key: str) -> str:
+    """Derive an ETag from source file versions (mtime + size) and the request URL.
+
+    Only stat() is needed, so a matching If-None-Match can be answered before
+    any file is read or any JSON is serialized.
+    """
+    digest = hashlib.sha1(request_key.encode('utf-8'))
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode('utf-8'))
+        except OSError:
+            digest.update(f"{path}:missing;".encode('utf-8'))
+    return digest.hexdigest()
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether the client advertised gzip support"""
+    return 'gzip' in (accept_encoding or '').lower()
+
+def gzip_body(data: bytes) -> bytes:
+    """Compress a response body"""
+    return gzip.compress(data, compresslevel=5)
+
+# --- Response Builders ---
+
+STATUS_EMOJI = {
+    "pending": "⏳",
+    "in_progress": "🔄",
+    "completed": "✅",
+    "failed": "❌"
+}
+
+def build_tasks_payload(tasks_data: Dict, status_filter: Optional[str] = None,
+                        priority_filter: Optional[str] = None) -> Dict[str, Any]:
+    """Build the /api/tasks response body"""
+    tasks_list = tasks_data.get("tasks", [])
+    
+    # Apply filters
+    if status_filter:
+        tasks_list = [task for task in tasks_list if task.get("status") == status_filter]
+    if priority_filter:
+        tasks_list = [task for task in tasks_list if task.get("priority") == priority_filter]
+    
+    # Add subtask counts
+    for task in tasks_list:
+        subtasks = task.get("subtasks", [])
+        task['subtask_count'] = len(subtasks)
+        task['completed_subtasks'] = len([st for st in subtasks if st.get("status") == "done"])
+    
+    return {
+        'tasks': tasks_list,
+        'total': len(tasks_list)
+    }
+
+# Any of these query parameters switches a listing to indexed, paged mode
+PAGE_QUERY_PARAMS = ('limit', 'cursor', 'fields', 'ready', 'updated_since')
+
+def wants_page(args) -> bool:
+    """Whether a listing request asked for pagination, projection or index filters"""
+    return any(param in args for param in PAGE_QUERY_PARAMS)
+
+def parse_page_query(args):
+    """Parse listing query parameters into (TaskIndex.query kwargs, fields).
+    
+    status and priority accept comma-separated values. Raises ValueError for
+    malformed input.
+    """
+    def split(value):
+        return [part for part in value.split(',') if part] if value else None
+    
+    ready = args.get('ready')
+    if ready is not None and ready.lower() not in ('true', 'false'):
+        raise ValueError("ready must be true or false")
+    
+    query = {
+        'status': split(args.get('status')),
+        'priority': split(args.get('priority')),
+        'ready': None if ready is None else ready.lower() == 'true',
+        'updated_since': args.get('updated_since'),
+        'cursor': args.get('cursor'),
+        'limit': int(args.get('limit', DEFAULT_PAGE_SIZE))
+    }
+    return query, split(args.get('fields'))
+
+def build_tasks_page(index, args) -> Dict[str, Any]:
+    """Build one page of the /api/tasks listing from the task index"""
+    query, fields = parse_page_query(args)
+    page = index.query(**query)
+    
+    tasks = []
+    for task in page['tasks']:
+        # Index entries are shared between requests, so annotate a copy
+        subtasks = task.get("subtasks", [])
+        task = {
+            **task,
+            'subtask_count': len(subtasks),
+            'completed_subtasks': len([st for st in subtasks if st.get("status") == "done"])
+        }
+        tasks.append(project_fields(task, fields))
+    
+    return {
+        'tasks': tasks,
+        'total': page['total'],
+        'count': len(tasks),
+        'next_cursor': page['next_cursor']
+    }
+
+def find_task(tasks_data: Dict, task_id: str) -> Optional[Dict]:
+    """Find a top-level task by ID"""
+    for task in tasks_data.get("tasks", []):
+        if str(task.get("id")) == task_id:
+            return task
+    return None
+
+def find_subtask(tasks_data: Dict, task_id: str, subtask_id: str) -> Optional[Dict]:
+    """Find a subtask and annotate it with its parent task"""
+    task = find_task(tasks_data, task_id)
+    if task:
+        for subtask in task.get("subtasks", []):
+            if str(subtask.get("id")) == subtask_id:
+                return {
+                    **subtask,
+                    'parent_task_id': task_id,
+                    'parent_task_name': task.get('name')
+                }
+    return None
+
+def add_task_record(tasks_data: Dict, data: Dict) -> Dict:
+    """Append a new task built from request data and return it"""
+    tasks_list = tasks_data.get("tasks", [])
+    
+    # Generate new ID
+    max_id = max([int(task.get("id", 0)) for task in tasks_list], default=0)
+    new_id = str(max_id + 1)
+    
+    new_task = {
+        'id': new_id,
+        'name': data['name'],
+        'description': data.get('description', ''),
+        'priority': data.get('priority', 'medium'),
+        'status': data.get('status', 'pending'),
+        'created_at': datetime.now().isoformat(),
+        'subtasks': []
+    }
+    
+    tasks_list.append(new_task)
+    tasks_data['tasks'] = tasks_list
+    mark_changed(tasks_data, new_task)
+    return new_task
+
+def apply_task_status(tasks_data: Dict, task_id: str, status: str) -> bool:
+    """Set a task status in place. Returns False if the task does not exist"""
+    task = find_task(tasks_data, task_id)
+    if not task:
+        return False
+    task['status'] = status
+    task['updated_at'] = datetime.now().isoformat()
+    mark_changed(tasks_data, task)
+    return True
+
+def build_progress_payload(progress_data: Dict) -> Dict:
+    """Add overall progress percentage to orchestrator progress data"""
+    if progress_data:
+        total_tasks = progress_data.get('total_tasks', 0)
+        completed_tasks = progress_data.get('completed_tasks', 0)
+        progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        
+        progress_data['progress_percentage'] = progress_percentage
+    
+    return progress_data
+
+def build_history_payload(log_lines: List[str]) -> Dict[str, Any]:
+    """Parse orchestrator log lines into execution history"""
+    history = []
+    
+    for line in log_lines:
+        if "Task completed:" in line or "Task failed:" in line:
+            # Simple parsing - in production, use structured logging
+            parts = line.split(' - ')
+            if len(parts) >= 4:
+                timestamp = parts[0]
+                status = 'completed' if 'completed' in line else 'failed'
+                history.append({
+                    'timestamp': timestamp,
+                    'status': status,
+                    'message': parts[-1].strip()
+                })
+    
+    return {
+        'history': history[-50:],  # Last 50 entries
+        'total_entries': len(history)
+    }
+
+def build_stats_payload(tasks_data: Dict) -> Dict[str, Any]:
+    """Calculate automation statistics"""
+    tasks_list = tasks_data.get("tasks", [])
+    
+    stats = {
+        'total_tasks': len(tasks_list),
+        'completed_tasks': len([t for t in tasks_list if t.get('status') == 'done']),
+        'pending_tasks': len([t for t in tasks_list if t.get('status') == 'pending']),
+        'in_progress_tasks': len([t for t in tasks_list if t.get('status') == 'in-progress']),
+        'failed_tasks': len([t for t in tasks_list if t.get('status') == 'failed']),
+        'priority_breakdown': {
+            'high': len([t for t in tasks_list if t.get('priority') == 'high']),
+            'medium': len([t for t in tasks_list if t.get('priority') == 'medium']),
+            'low': len([t for t in tasks_list if t.get('priority') == 'low'])
+        }
+    }
+    
+    # Add subtask statistics
+    total_subtasks = sum(len(task.get('subtasks', [])) for task in tasks_list)
+    completed_subtasks = sum(
+        len([st for st in task.get('subtasks', []) if st.get('status') == 'done'])
+        for task in tasks_list
+    )
+    
+    stats['total_subtasks'] = total_subtasks
+    stats['completed_subtasks'] = completed_subtasks
+    
+    return stats
+
+def build_test_history_payload(test_history: List[Dict]) -> Dict[str, Any]:
+    """Sort test runs, most recent first"""
+    test_history.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    
+    return {
+        'test_runs': test_history[:50],  # Last 50 test runs
+        'total_runs': len(test_history)
+    }
+
+def build_taskmaster_show_payload(tasks_data: Dict, task_id: str) -> Optional[Dict[str, Any]]:
+    """Format a task like the task_master_wrapper.py show command. None if not found"""
+    task = find_task(tasks_data, task_id)
+    if not task:
+        return None
+    
+    result = {
+        "task_id": task_id,
+        "name": task.get("name", "Unnamed Task"),
+        "description": task.get("description", ""),
+        "status": task.get("status", "pending"),
+        "status_emoji": STATUS_EMOJI.get(task.get("status", "pending"), "❓"),
+        "priority": task.get("priority", "medium"),
+        "subtasks": task.get("subtasks", []),
+        "started_at": task.get("started_at"),
+        "completed_at": task.get("completed_at"),
+        "created_at": task.get("created_at"),
+        "updated_at": task.get("updated_at")
+    }
+    
+    # Add subtask progress
+    subtasks = task.get("subtasks", [])
+    if subtasks:
+        completed_subtasks = sum(1 for st in subtasks if st.get("status") == "completed")
+        result["subtask_progress"] = {
+            "total": len(subtasks),
+            "completed": completed_subtasks,
+            "percentage": (completed_subtasks / len(subtasks) * 100) if subtasks else 0
+        }
+    
+    return {
+        "success": True,
+        "task": result,
+        "stdout": f"Task {task_id}: {task.get('name', 'Unnamed Task')}\nStatus: {task.get('status', 'pending')}\nDescription: {task.get('description', '')}"
+    }
+
+def build_taskmaster_task_info(task: Dict, show_details: bool = False) -> Dict[str, Any]:
+    """Format a single task entry for the Task Master list"""
+    task_info = {
+        "id": task["id"],
+        "name": task.get("name", "Unnamed Task"),
+        "status": task.get("status", "pending"),
+        "status_emoji": STATUS_EMOJI.get(task.get("status", "pending"), "❓"),
+        "priority": task.get("priority", "medium")
+    }
+    
+    if show_details:
+        task_info["description"] = task.get("description", "")
+        task_info["started_at"] = task.get("started_at")
+        task_info["completed_at"] = task.get("completed_at")
+    
+    # Subtask information
+    subtasks = task.get("subtasks", [])
+    if subtasks:
+        completed_subtasks = sum(1 for st in subtasks if st.get("status") == "completed")
+        task_info["subtasks"] = {
+            "total": len(subtasks),
+            "completed": completed_subtasks,
+            "percentage": (completed_subtasks / len(subtasks) * 100) if subtasks else 0
+        }
+        
+        if show_details:
+            task_info["subtask_details"] = subtasks
+    
+    return task_info
+
+def build_taskmaster_list_payload(tasks_data: Dict, status_filter: Optional[str] = None,
+                                  show_details: bool = False) -> Dict[str, Any]:
+    """Build the /api/taskmaster/list response body"""
+    tasks = []
+    for task in tasks_data.get("tasks", []):
+        if status_filter and task.get("status") != status_filter:
+            continue
+        tasks.append(build_taskmaster_task_info(task, show_details))
+    
+    return {
+        "success": True,
+        "tasks": tasks,
+        "total": len(tasks)
+    }
+
+def build_taskmaster_page(index, args, show_details: bool = False) -> Dict[str, Any]:
+    """Build one page of the /api/taskmaster/list listing from the task index"""
+    query, fields = parse_page_query(args)
+    page = index.query(**query)
+    
+    tasks = [project_fields(build_taskmaster_task_info(task, show_details), fields)
+             for task in page['tasks']]
+    
+    return {
+        "success": True,
+        "tasks": tasks,
+        "total": page['total'],
+        "count": len(tasks),
+        "next_cursor": page['next_cursor']
+    }
+
+def build_taskmaster_status_payload(tasks_data: Dict, test_history: Optional[Dict] = None) -> Dict[str, Any]:
+    """Build the /api/taskmaster/status response body"""
+    total_tasks = len(tasks_data.get("tasks", []))
+    if total_tasks == 0:
+        return {
+            "success": True,
+            "message": "No tasks registered",
+            "stats": {
+                "total_tasks": 0,
+                "progress": 0
+            }
+        }
+    
+    # Calculate statistics
+    status_counts = {
+        "pending": 0,
+        "in_progress": 0, 
+        "completed": 0,
+        "failed": 0
+    }
+    
+    total_subtasks = 0
+    completed_subtasks = 0
+    
+    for task in tasks_data.get("tasks", []):
+        status = task.get("status", "pending")
+        status_counts[status] = status_counts.get(status, 0) + 1
+        
+        subtasks = task.get("subtasks", [])
+        total_subtasks += len(subtasks)
+        completed_subtasks += sum(1 for st in subtasks if st.get("status") == "completed")
+    
+    # Calculate progress
+    completed_tasks = status_counts["completed"]
+    task_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    subtask_progress = (completed_subtasks / total_subtasks * 100) if total_subtasks > 0 else 0
+    
+    stats = {
+        "total_tasks": total_tasks,
+        "task_counts": status_counts,
+        "task_progress": round(task_progress, 1),
+        "total_subtasks": total_subtasks,
+        "completed_subtasks": completed_subtasks,
+        "subtask_progress": round(subtask_progress, 1)
+    }
+    
+    # Add test history if available
+    if test_history is not None:
+        try:
+            stats["test_stats"] = {
+                "total_runs": test_history.get("total_runs", 0),
+                "total_passes": test_history.get("total_passes", 0),
+                "total_failures": test_history.get("total_failures", 0),
+                "last_run": test_history.get("last_run")
+            }
+        except Exception:
+            pass
+    
+    return {
+        "success": True,
+        "stats": stats
+    }
+
+def apply_task_reset(tasks_data: Dict, task_id: Any, subtask_id: Any = None) -> bool:
+    """Reset a task (and its subtasks) or a single subtask to pending in place"""
+    for task in tasks_data.get("tasks", []):
+        if str(task.get("id")) == str(task_id):
+            if subtask_id:
+                # Reset specific subtask
+                for subtask in task.get("subtasks", []):
+                    if str(subtask.get("id")) == str(subtask_id):
+                        subtask["status"] = "pending"
+                        subtask["failure_count"] = 0
+                        mark_changed(tasks_data, subtask)
+                        return True
+                return False
+            
+            # Reset entire task
+            task["status"] = "pending"
+            task["failure_count"] = 0
+            task.pop("started_at", None)
+            task.pop("completed_at", None)
+            
+            # Reset all subtasks too
+            for subtask in task.get("subtasks", []):
+                subtask["status"] = "pending"
+                subtask["failure_count"] = 0
+            
+            mark_changed(tasks_data, task, *task.get("subtasks", []))
+            return True
+    return False
@@ -0,0 +1,720 @@
+"""
+Display Backend - screen capture, image search and input for GUI automation
+
+ClaudeDesktopAutomation reaches the screen only through a DisplayBackend.
+PyAutoGUIBackend drives the interactive desktop as before. XvfbBackend starts
+(or attaches to) an X virtual framebuffer and talks to it directly through
+Xlib: frames are read from a MIT-SHM shared memory segment and input is
+injected with XTest, so several isolated displays can run side by side on one
+Linux machine without a desktop session.
+"""
+
+import os
+import time
+import zlib
+import shutil
+import ctypes
+import ctypes.util
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Tuple, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:  # pyautogui raises at import time when there is no display
+    pyautogui = None
+    PYAUTOGUI_AVAILABLE = False
+
+try:
+    from PIL import ImageGrab
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from clipboard import Clipboard
+
+logger = logging.getLogger(__name__)
+
+# (left, top, width, height)
+Region = Tuple[int, int, int, int]
+
+
+class DisplayBackendError(Exception):
+    """Raised when a backend cannot capture, search or inject input"""
+
+
+class DisplayBackend:
+    """Screen access for one display. Screenshots are RGB numpy arrays."""
+
+    name = "base"
+
+    def __init__(self):
+        self._templates: Dict[str, Tuple[int, Any]] = {}
+        self.clipboard = Clipboard()
+
+    def screenshot(self, region: Optional[Region] = None):
+        raise NotImplementedError
+
+    def get_windows(self, title: str) -> List[Any]:
+        """Windows whose title contains title (pygetwindow-like objects)"""
+        raise NotImplementedError
+
+    def click(self, x: int, y: int):
+        raise NotImplementedError
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str):
+        raise NotImplementedError
+
+    def write(self, text: str, interval: float = 0.0):
+        raise NotImplementedError
+
+    def cursor_position(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def set_clipboard(self, text: str) -> bool:
+        """Put text on the clipboard; False if no clipboard is available"""
+        return self.clipboard.copy(text)
+
+    def frame_checksum(self, region: Optional[Region] = None) -> int:
+        """Cheap fingerprint of the screen area, for detecting that it changed"""
+        frame = self.screenshot(region)
+        return zlib.crc32(frame[::2, ::2].tobytes())
+
+    def close(self):
+        pass
+
+    def _load_template(self, image_path: str):
+        mtime = os.stat(image_path).st_mtime_ns
+        cached = self._templates.get(image_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        template = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if template is None:
+            raise DisplayBackendError(f"Cannot read image: {image_path}")
+        self._templates[image_path] = (mtime, template)
+        return template
+
+    def locate(self, image_path: str, confidence: float = 0.7, region: Optional[Region] = None) -> Optional[Region]:
+        """Find a template image on screen; returns its box or None"""
+        if not (NUMPY_AVAILABLE and CV2_AVAILABLE):
+            raise DisplayBackendError("Image search requires numpy and opencv-python")
+        template = self._load_template(image_path)
+        screen = self.screenshot(region)
+        height, width = template.shape[:2]
+        if height > screen.shape[0] or width > screen.shape[1]:
+            return None
+
+        scores = cv2.matchTemplate(cv2.cvtColor(screen, cv2.COLOR_RGB2BGR), template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (x, y) = cv2.minMaxLoc(scores)
+        if best < confidence:
+            return None
+        left, top = (region[0], region[1]) if region else (0, 0)
+        return (left + x, top + y, width, height)
+
+    def locate_center(self, image_path: str, confidence: float = 0.7,
+                      region: Optional[Region] = None) -> Optional[Tuple[int, int]]:
+        box = self.locate(image_path, confidence, region)
+        if not box:
+            return None
+        return (box[0] + box[2] // 2, box[1] + box[3] // 2)
+
+
+class PyAutoGUIBackend(DisplayBackend):
+    """The interactive desktop, through pyautogui and PIL"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        super().__init__()
+        if not PYAUTOGUI_AVAILABLE:
+            raise DisplayBackendError("pyautogui is not available (is a desktop session running?)")
+
+    def screenshot(self, region: Optional[Region] = None):
+        if PIL_AVAILABLE:
+            bbox = None
+            if region:
+                left, top, width, height = region
+                bbox = (left, top, left + width, top + height)
+            image = ImageGrab.grab(bbox=bbox)
+        else:
+            image = pyautogui.screenshot(region=region)
+        return np.array(image.convert("RGB"))
+
+    def locate(self, image_path: str, confidence: float = 0.7, region: Optional[Region] = None) -> Optional[Region]:
+        try:
+            box = pyautogui.locateOnScreen(image_path, confidence=confidence, region=region)
+        except getattr(pyautogui, "ImageNotFoundException", ()):
+            return None  # Newer pyscreeze raises instead of returning None
+        except pyautogui.PyAutoGUIException as e:
+            raise DisplayBackendError(str(e))
+        return tuple(box) if box else None
+
+    def get_windows(self, title: str) -> List[Any]:
+        return pyautogui.getWindowsWithTitle(title)
+
+    def click(self, x: int, y: int):
+        pyautogui.click(x, y)
+
+    def press(self, key: str):
+        pyautogui.press(key)
+
+    def hotkey(self, *keys: str):
+        pyautogui.hotkey(*keys)
+
+    def write(self, text: str, interval: float = 0.0):
+        pyautogui.write(text, interval=interval)
+
+    def cursor_position(self) -> Tuple[int, int]:
+        return tuple(pyautogui.position())
+
+
+# --- Xlib bindings for XvfbBackend -----------------------------------------
+
+_ZPIXMAP = 2
+_ALL_PLANES = ctypes.c_ulong(-1).value
+_REVERT_TO_PARENT = 2
+_CURRENT_TIME = 0
+_IS_VIEWABLE = 2
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+# pyautogui key names -> X keysym names
+_KEY_NAMES = {
+    "enter": "Return", "return": "Return", "tab": "Tab", "space": "space",
+    "backspace": "BackSpace", "delete": "Delete", "del": "Delete", "esc": "Escape", "escape": "Escape",
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+    "win": "Super_L", "command": "Super_L", "super": "Super_L",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next", "insert": "Insert"
+}
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int), ("height", ctypes.c_int), ("xoffset", ctypes.c_int), ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p), ("byte_order", ctypes.c_int), ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int), ("bitmap_pad", ctypes.c_int), ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int), ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong), ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p), ("funcs", ctypes.c_void_p * 6)
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong), ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p), ("readOnly", ctypes.c_int)
+    ]
+
+
+class _XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_int), ("y", ctypes.c_int), ("width", ctypes.c_int), ("height", ctypes.c_int),
+        ("border_width", ctypes.c_int), ("depth", ctypes.c_int), ("visual", ctypes.c_void_p),
+        ("root", ctypes.c_ulong), ("class_", ctypes.c_int), ("bit_gravity", ctypes.c_int),
+        ("win_gravity", ctypes.c_int), ("backing_store", ctypes.c_int), ("backing_planes", ctypes.c_ulong),
+        ("backing_pixel", ctypes.c_ulong), ("save_under", ctypes.c_int), ("colormap", ctypes.c_ulong),
+        ("map_installed", ctypes.c_int), ("map_state", ctypes.c_int), ("all_event_masks", ctypes.c_long),
+        ("your_event_mask", ctypes.c_long), ("do_not_propagate_mask", ctypes.c_long),
+        ("override_redirect", ctypes.c_int), ("screen", ctypes.c_void_p)
+    ]
+
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def _load_library(name: str) -> ctypes.CDLL:
+    path = ctypes.util.find_library(name)
+    if not path:
+        raise DisplayBackendError(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+def _bind(lib: ctypes.CDLL, name: str, restype, *argtypes):
+    func = getattr(lib, name)
+    func.restype = restype
+    func.argtypes = list(argtypes)
+    return func
+
+
+class _Xlib:
+    """The handful of libX11/libXext/libXtst/libc calls XvfbBackend needs"""
+
+    def __init__(self):
+        x11 = _load_library("X11")
+        xext = _load_library("Xext")
+        xtst = _load_library("Xtst")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        P, I, U, UL, B = ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong, ctypes.c_int
+        PI, PUL = ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong)
+        PXImage = ctypes.POINTER(_XImage)
+
+        self.XInitThreads = _bind(x11, "XInitThreads", I)
+        self.XOpenDisplay = _bind(x11, "XOpenDisplay", P, ctypes.c_char_p)
+        self.XCloseDisplay = _bind(x11, "XCloseDisplay", I, P)
+        self.XSetErrorHandler = _bind(x11, "XSetErrorHandler", P, _X_ERROR_HANDLER)
+        self.XDefaultScreen = _bind(x11, "XDefaultScreen", I, P)
+        self.XRootWindow = _bind(x11, "XRootWindow", UL, P, I)
+        self.XDisplayWidth = _bind(x11, "XDisplayWidth", I, P, I)
+        self.XDisplayHeight = _bind(x11, "XDisplayHeight", I, P, I)
+        self.XDefaultVisual = _bind(x11, "XDefaultVisual", P, P, I)
+        self.XDefaultDepth = _bind(x11, "XDefaultDepth", I, P, I)
+        self.XGetImage = _bind(x11, "XGetImage", PXImage, P, UL, I, I, U, U, UL, I)
+        self.XDestroyImage = _bind(x11, "XDestroyImage", I, PXImage)
+        self.XSync = _bind(x11, "XSync", I, P, B)
+        self.XFlush = _bind(x11, "XFlush", I, P)
+        self.XFree = _bind(x11, "XFree", I, P)
+        self.XStringToKeysym = _bind(x11, "XStringToKeysym", UL, ctypes.c_char_p)
+        self.XKeysymToKeycode = _bind(x11, "XKeysymToKeycode", ctypes.c_ubyte, P, UL)
+        self.XDisplayKeycodes = _bind(x11, "XDisplayKeycodes", I, P, PI, PI)
+        self.XGetKeyboardMapping = _bind(x11, "XGetKeyboardMapping", PUL, P, ctypes.c_ubyte, I, PI)
+        self.XChangeKeyboardMapping = _bind(x11, "XChangeKeyboardMapping", I, P, I, I, PUL, I)
+        self.XQueryTree = _bind(x11, "XQueryTree", I, P, UL, PUL, PUL, ctypes.POINTER(PUL), ctypes.POINTER(U))
+        self.XFetchName = _bind(x11, "XFetchName", I, P, UL, ctypes.POINTER(ctypes.c_char_p))
+        self.XGetWindowAttributes = _bind(x11, "XGetWindowAttributes", I, P, UL, ctypes.POINTER(_XWindowAttributes))
+        self.XRaiseWindow = _bind(x11, "XRaiseWindow", I, P, UL)
+        self.XSetInputFocus = _bind(x11, "XSetInputFocus", I, P, UL, I, UL)
+        self.XGetInputFocus = _bind(x11, "XGetInputFocus", I, P, PUL, PI)
+        self.XMoveResizeWindow = _bind(x11, "XMoveResizeWindow", I, P, UL, I, I, U, U)
+        self.XQueryPointer = _bind(x11, "XQueryPointer", B, P, UL, PUL, PUL, PI, PI, PI, PI, ctypes.POINTER(U))
+
+        self.XShmQueryExtension = _bind(xext, "XShmQueryExtension", B, P)
+        self.XShmCreateImage = _bind(xext, "XShmCreateImage", PXImage, P, P, U, I, P,
+                                     ctypes.POINTER(_XShmSegmentInfo), U, U)
+        self.XShmAttach = _bind(xext, "XShmAttach", B, P, ctypes.POINTER(_XShmSegmentInfo))
+        self.XShmDetach = _bind(xext, "XShmDetach", B, P, ctypes.POINTER(_XShmSegmentInfo))
+        self.XShmGetImage = _bind(xext, "XShmGetImage", B, P, UL, PXImage, I, I, UL)
+
+        self.XTestFakeMotionEvent = _bind(xtst, "XTestFakeMotionEvent", I, P, I, I, I, UL)
+        self.XTestFakeButtonEvent = _bind(xtst, "XTestFakeButtonEvent", I, P, U, B, UL)
+        self.XTestFakeKeyEvent = _bind(xtst, "XTestFakeKeyEvent", I, P, U, B, UL)
+
+        self.shmget = _bind(libc, "shmget", I, I, ctypes.c_size_t, I)
+        self.shmat = _bind(libc, "shmat", P, I, P, I)
+        self.shmdt = _bind(libc, "shmdt", I, P)
+        self.shmctl = _bind(libc, "shmctl", I, I, I, P)
+
+
+_xlib: Optional[_Xlib] = None
+_x_errors: List[int] = []
+
+
+@_X_ERROR_HANDLER
+def _on_x_error(display, event):
+    # The default handler exits the process; windows vanishing mid-query is normal
+    # XErrorEvent: int type, Display *, XID resourceid, unsigned long serial, unsigned char error_code
+    offset = ctypes.sizeof(ctypes.c_void_p) * 4
+    error_code = ctypes.cast(event, ctypes.POINTER(ctypes.c_ubyte * (offset + 1))).contents[offset]
+    _x_errors.append(error_code)
+    logger.debug(f"X error {error_code} ignored")
+    return 0
+
+
+def _get_xlib() -> _Xlib:
+    global _xlib
+    if _xlib is None:
+        _xlib = _Xlib()
+        _xlib.XInitThreads()
+        _xlib.XSetErrorHandler(_on_x_error)
+    return _xlib
+
+
+class XWindow:
+    """Top-level window on an X display with the pygetwindow attributes the automation uses"""
+
+    def __init__(self, backend: "XvfbBackend", window_id: int, title: str):
+        self._backend = backend
+        self.id = window_id
+        self.title = title
+
+    def _attributes(self) -> _XWindowAttributes:
+        attributes = _XWindowAttributes()
+        with self._backend._lock:
+            self._backend._x.XGetWindowAttributes(self._backend._display, self.id, ctypes.byref(attributes))
+        return attributes
+
+    @property
+    def left(self) -> int:
+        return self._attributes().x
+
+    @property
+    def top(self) -> int:
+        return self._attributes().y
+
+    @property
+    def width(self) -> int:
+        return self._attributes().width
+
+    @property
+    def height(self) -> int:
+        return self._attributes().height
+
+    @property
+    def isActive(self) -> bool:
+        return self._backend._focused_window() == self.id
+
+    @property
+    def isMaximized(self) -> bool:
+        attributes = self._attributes()
+        return (attributes.x, attributes.y, attributes.width, attributes.height) == \
+            (0, 0, self._backend.width, self._backend.height)
+
+    def activate(self):
+        backend = self._backend
+        with backend._lock:
+            backend._x.XRaiseWindow(backend._display, self.id)
+            backend._x.XSetInputFocus(backend._display, self.id, _REVERT_TO_PARENT, _CURRENT_TIME)
+            backend._x.XSync(backend._display, 0)
+
+    def maximize(self):
+        # Without a window manager "maximized" just means covering the screen
+        backend = self._backend
+        with backend._lock:
+            backend._x.XMoveResizeWindow(backend._display, self.id, 0, 0, backend.width, backend.height)
+            backend._x.XSync(backend._display, 0)
+
+
+class XvfbBackend(DisplayBackend):
+    """Headless X virtual framebuffer driven through XShm capture and XTest input.
+
+    With display=None a free display number is chosen and Xvfb is started;
+    app_command (e.g. the Claude Desktop launcher) is then started on it.
+    """
+
+    name = "xvfb"
+
+    def __init__(self, display: Optional[str] = None, width: int = 1920, height: int = 1080, depth: int = 24,
+                 app_command: Optional[List[str]] = None, xvfb_path: str = "Xvfb", startup_timeout_s: float = 10):
+        super().__init__()
+        if not NUMPY_AVAILABLE:
+            raise DisplayBackendError("XvfbBackend requires numpy")
+        self._x = _get_xlib()
+        self._lock = threading.RLock()
+        self._server: Optional[subprocess.Popen] = None
+        self._children: List[subprocess.Popen] = []
+        self._shm_image = None
+
+        if display is None:
+            display = f":{self._free_display_number()}"
+            self._start_server(display, width, height, depth, xvfb_path, startup_timeout_s)
+        self.display_name = display
+        self.env = {**os.environ, "DISPLAY": display}
+        # Only X selection providers can reach this display, never the desktop clipboard
+        self.clipboard = Clipboard(env={k: v for k, v in self.env.items() if k != "WAYLAND_DISPLAY"},
+                                   desktop=False)
+
+        self._display = self._x.XOpenDisplay(display.encode())
+        if not self._display:
+            self.close()
+            raise DisplayBackendError(f"Cannot open X display {display}")
+        self._screen = self._x.XDefaultScreen(self._display)
+        self._root = self._x.XRootWindow(self._display, self._screen)
+        self.width = self._x.XDisplayWidth(self._display, self._screen)
+        self.height = self._x.XDisplayHeight(self._display, self._screen)
+
+        self._init_shm()
+        self._init_keyboard()
+        logger.info(f"Xvfb backend ready on {display} ({self.width}x{self.height}, "
+                    f"capture via {'XShm' if self._shm_image else 'XGetImage'})")
+
+        if app_command:
+            self.spawn(app_command)
+
+    @staticmethod
+    def _free_display_number(start: int = 99) -> int:
+        number = start
+        while os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            number += 1
+        return number
+
+    def _start_server(self, display: str, width: int, height: int, depth: int, xvfb_path: str, timeout_s: float):
+        if not shutil.which(xvfb_path):
+            raise DisplayBackendError(f"{xvfb_path} not found; install Xvfb (e.g. the xvfb package)")
+        self._server = subprocess.Popen(
+            [xvfb_path, display, "-screen", "0", f"{width}x{height}x{depth}", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        socket_path = f"/tmp/.X11-unix/X{display.lstrip(':')}"
+        deadline = time.monotonic() + timeout_s
+        while not os.path.exists(socket_path):
+            if self._server.poll() is not None or time.monotonic() > deadline:
+                self.close()
+                raise DisplayBackendError(f"Xvfb failed to start on {display}")
+            time.sleep(0.05)
+
+    def _init_shm(self):
+        """Map one screen-sized shared memory image; fall back to XGetImage if unavailable"""
+        x = self._x
+        if not x.XShmQueryExtension(self._display):
+            return
+        self._shm_info = _XShmSegmentInfo()
+        image = x.XShmCreateImage(self._display, x.XDefaultVisual(self._display, self._screen),
+                                  x.XDefaultDepth(self._display, self._screen), _ZPIXMAP, None,
+                                  ctypes.byref(self._shm_info), self.width, self.height)
+        if not image:
+            return
+        size = image.contents.bytes_per_line * image.contents.height
+        shmid = x.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        address = x.shmat(shmid, None, 0) if shmid >= 0 else None
+        if not address or address == ctypes.c_void_p(-1).value:
+            x.XDestroyImage(image)
+            return
+
+        self._shm_info.shmid = shmid
+        self._shm_info.shmaddr = address
+        self._shm_info.readOnly = 0
+        image.contents.data = address
+        errors_before = len(_x_errors)
+        attached = x.XShmAttach(self._display, ctypes.byref(self._shm_info))
+        x.XSync(self._display, 0)
+        # Marked for removal now; the kernel frees it once both sides detach
+        x.shmctl(shmid, _IPC_RMID, None)
+        if not attached or len(_x_errors) > errors_before:
+            x.shmdt(address)
+            image.contents.data = None
+            x.XDestroyImage(image)
+            return
+        self._shm_image = image
+
+    def _init_keyboard(self):
+        x = self._x
+        min_code, max_code = ctypes.c_int(), ctypes.c_int()
+        x.XDisplayKeycodes(self._display, ctypes.byref(min_code), ctypes.byref(max_code))
+        per_code = ctypes.c_int()
+        count = max_code.value - min_code.value + 1
+        mapping = x.XGetKeyboardMapping(self._display, min_code.value, count, ctypes.byref(per_code))
+        self._keymap: Dict[int, Tuple[int, int]] = {}
+        self._spare_keycode = None
+        for i in range(count):
+            syms = [mapping[i * per_code.value + j] for j in range(per_code.value)]
+            keycode = min_code.value + i
+            self._keymap[keycode] = (syms[0] if syms else 0, syms[1] if len(syms) > 1 else 0)
+            if not any(syms):
+                self._spare_keycode = keycode  # Unused; remapped for characters not on the keyboard
+        x.XFree(mapping)
+        self._shift = x.XKeysymToKeycode(self._display, x.XStringToKeysym(b"Shift_L"))
+
+    def spawn(self, command: List[str]) -> subprocess.Popen:
+        """Start a process (e.g. Claude Desktop) on this display"""
+        process = subprocess.Popen(command, env=self.env, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, start_new_session=True)
+        self._children.append(process)
+        logger.info(f"Started {command[0]} on {self.display_name} (PID {process.pid})")
+        return process
+
+    def close(self):
+        for process in self._children:
+            if process.poll() is None:
+                process.terminate()
+        self._children = []
+        if getattr(self, "_display", None):
+            with self._lock:
+                if self._shm_image:
+                    self._x.XShmDetach(self._display, ctypes.byref(self._shm_info))
+                    self._x.shmdt(self._shm_info.shmaddr)
+                    self._shm_image.contents.data = None
+                    self._x.XDestroyImage(self._shm_image)
+                    self._shm_image = None
+                self._x.XCloseDisplay(self._display)
+                self._display = None
+        if self._server and self._server.poll() is None:
+            self._server.terminate()
+            try:
+                self._server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._server.kill()
+        self._server = None
+
+    # Capture
+
+    @staticmethod
+    def _image_to_array(image, width: int, height: int):
+        contents = image.contents
+        if contents.bits_per_pixel != 32:
+            raise DisplayBackendError(f"Unsupported X image format: {contents.bits_per_pixel} bpp")
+        buffer = (ctypes.c_ubyte * (contents.bytes_per_line * height)).from_address(contents.data)
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(height, contents.bytes_per_line)[:, :width * 4] \
+            .reshape(height, width, 4)
+
+    def screenshot(self, region: Optional[Region] = None):
+        left, top, width, height = region or (0, 0, self.width, self.height)
+        left, top = max(0, left), max(0, top)
+        width, height = min(width, self.width - left), min(height, self.height - top)
+
+        with self._lock:
+            if self._shm_image:
+                # One round trip copies the frame into shared memory; no pixel data crosses the socket
+                if not self._x.XShmGetImage(self._display, self._root, self._shm_image, 0, 0, _ALL_PLANES):
+                    raise DisplayBackendError("XShmGetImage failed")
+                frame = self._image_to_array(self._shm_image, self.width, self.height)
+                # BGRX -> RGB, copied out of the shared buffer
+                return frame[top:top + height, left:left + width, 2::-1].copy()
+
+            image = self._x.XGetImage(self._display, self._root, left, top, width, height, _ALL_PLANES, _ZPIXMAP)
+            if not image:
+                raise DisplayBackendError("XGetImage failed")
+            try:
+                return self._image_to_array(image, width, height)[:, :, 2::-1].copy()
+            finally:
+                self._x.XDestroyImage(image)
+
+    # Windows
+
+    def _focused_window(self) -> int:
+        window, revert = ctypes.c_ulong(), ctypes.c_int()
+        with self._lock:
+            self._x.XGetInputFocus(self._display, ctypes.byref(window), ctypes.byref(revert))
+        return window.value
+
+    def _children_of(self, window: int) -> List[int]:
+        root, parent = ctypes.c_ulong(), ctypes.c_ulong()
+        children, count = ctypes.POINTER(ctypes.c_ulong)(), ctypes.c_uint()
+        if not self._x.XQueryTree(self._display, window, ctypes.byref(root), ctypes.byref(parent),
+                                  ctypes.byref(children), ctypes.byref(count)):
+            return []
+        result = [children[i] for i in range(count.value)]
+        if children:
+            self._x.XFree(children)
+        return result
+
+    def _window_name(self, window: int) -> Optional[str]:
+        name = ctypes.c_char_p()
+        if not self._x.XFetchName(self._display, window, ctypes.byref(name)) or not name.value:
+            return None
+        title = name.value.decode("utf-8", "replace")
+        self._x.XFree(name)
+        return title
+
+    def get_windows(self, title: str) -> List[XWindow]:
+        windows = []
+        with self._lock:
+            for window in self._children_of(self._root):
+                attributes = _XWindowAttributes()
+                if not self._x.XGetWindowAttributes(self._display, window, ctypes.byref(attributes)) \
+                        or attributes.map_state != _IS_VIEWABLE:
+                    continue
+                # Look one level down as well, for windows reparented by a window manager
+                for candidate in [window] + self._children_of(window):
+                    name = self._window_name(candidate)
+                    if name and title in name:
+                        windows.append(XWindow(self, window, name))
+                        break
+        return windows
+
+    # Input
+
+    def click(self, x: int, y: int):
+        with self._lock:
+            self._x.XTestFakeMotionEvent(self._display, self._screen, int(x), int(y), 0)
+            self._x.XTestFakeButtonEvent(self._display, 1, 1, 0)
+            self._x.XTestFakeButtonEvent(self._display, 1, 0, 0)
+            self._x.XFlush(self._display)
+
+    def cursor_position(self) -> Tuple[int, int]:
+        root, child = ctypes.c_ulong(), ctypes.c_ulong()
+        root_x, root_y, win_x, win_y = ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        mask = ctypes.c_uint()
+        with self._lock:
+            self._x.XQueryPointer(self._display, self._root, ctypes.byref(root), ctypes.byref(child),
+                                  ctypes.byref(root_x), ctypes.byref(root_y), ctypes.byref(win_x),
+                                  ctypes.byref(win_y), ctypes.byref(mask))
+        return (root_x.value, root_y.value)
+
+    def _keysym(self, key: str) -> int:
+        if len(key) == 1:
+            if key == "\n":
+                return self._x.XStringToKeysym(b"Return")
+            if key == "\t":
+                return self._x.XStringToKeysym(b"Tab")
+            code = ord(key)
+            # Latin-1 keysyms equal their code point; everything else uses the Unicode range
+            return code if 0x20 <= code <= 0xFF else 0x01000000 | code
+        keysym = self._x.XStringToKeysym(_KEY_NAMES.get(key.lower(), key).encode())
+        if not keysym:
+            raise DisplayBackendError(f"Unknown key: {key}")
+        return keysym
+
+    def _key_event(self, keycode: int, down: bool):
+        self._x.XTestFakeKeyEvent(self._display, keycode, 1 if down else 0, 0)
+
+    def _tap_keysym(self, keysym: int):
+        """Press and release the key producing keysym, adding Shift or remapping as needed"""
+        keycode = self._x.XKeysymToKeycode(self._display, keysym)
+        plain, shifted = self._keymap.get(keycode, (0, 0))
+        if keycode and keysym == plain:
+            self._key_event(keycode, True)
+            self._key_event(keycode, False)
+        elif keycode and keysym == shifted:
+            self._key_event(self._shift, True)
+            self._key_event(keycode, True)
+            self._key_event(keycode, False)
+            self._key_event(self._shift, False)
+        elif self._spare_keycode:
+            # Not on the keyboard (e.g. Hangul): bind it to the spare keycode for one keystroke
+            spare = self._spare_keycode
+            self._x.XChangeKeyboardMapping(self._display, spare, 1, (ctypes.c_ulong * 1)(keysym), 1)
+            self._x.XSync(self._display, 0)
+            self._key_event(spare, True)
+            self._key_event(spare, False)
+            self._x.XSync(self._display, 0)
+            self._x.XChangeKeyboardMapping(self._display, spare, 1, (ctypes.c_ulong * 1)(0), 1)
+        else:
+            raise DisplayBackendError(f"Cannot type keysym {keysym:#x}: no spare keycode")
+
+    def press(self, key: str):
+        with self._lock:
+            self._tap_keysym(self._keysym(key))
+            self._x.XFlush(self._display)
+
+    def hotkey(self, *keys: str):
+        with self._lock:
+            keycodes = [self._x.XKeysymToKeycode(self._display, self._keysym(key)) for key in keys]
+            for keycode in keycodes:
+                self._key_event(keycode, True)
+            for keycode in reversed(keycodes):
+                self._key_event(keycode, False)
+            self._x.XFlush(self._display)
+
+    def write(self, text: str, interval: float = 0.0):
+        for char in text:
+            with self._lock:
+                self._tap_keysym(self._keysym(char))
+                self._x.XFlush(self._display)
+            if interval:
+                time.sleep(interval)
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "xvfb": XvfbBackend
+}
+
+
+def create_backend(name: str = "pyautogui", **options) -> DisplayBackend:
+    """Instantiate a backend by name with backend-specific options"""
+    if name not in BACKENDS:
+        raise DisplayBackendError(f"Unknown display backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
@@ -0,0 +1,158 @@
+"""
+File Discovery - list a project's source files the way git sees them
+
+Inside a git work tree, tracked files come from `git ls-files` (the index,
+no directory walk) and untracked files from `git ls-files --others
+--exclude-standard`, so everything .gitignore excludes - build/, .gradle/,
+node_modules/ - is skipped without being descended into. The tracked list is
+cached between runs and reused while the index file is unchanged. Outside
+git, a pruned os.walk is used instead. Files are yielded as they are found.
+"""
+
+import os
+import json
+import logging
+import subprocess
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("logs", "file_list_cache.json")
+
+# Pruned by the fallback walk in addition to the caller's ignore_dirs (git gets these from .gitignore)
+FALLBACK_IGNORE_DIRS = {".git", ".gradle", ".idea", "build", "target", "node_modules"}
+
+GIT_TIMEOUT_S = 30
+
+
+class FileDiscovery:
+    """Git-aware file listing with a persistent tracked-file cache"""
+
+    def __init__(self, ignore_dirs: Iterable[str] = (), cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 use_git: bool = True):
+        self.ignore_dirs = set(ignore_dirs)
+        self.cache_path = cache_path
+        self.use_git = use_git
+        self._lock = threading.Lock()
+        self._cache: Optional[Dict[str, Dict]] = None
+
+    @staticmethod
+    def _git(directory: str, *args: str) -> Optional[bytes]:
+        try:
+            result = subprocess.run(["git", "-C", directory, *args], capture_output=True, timeout=GIT_TIMEOUT_S)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def _index_stat(self, directory: str) -> Optional[Tuple[str, int, int]]:
+        """(index path, size, mtime_ns) of the git index, or None if directory is not in a work tree"""
+        output = self._git(directory, "rev-parse", "--is-inside-work-tree", "--git-path", "index")
+        if output is None:
+            return None
+        lines = os.fsdecode(output).splitlines()
+        if len(lines) < 2 or lines[0] != "true":
+            return None
+        index_path = os.path.join(directory, lines[1])
+        try:
+            stat = os.stat(index_path)
+        except OSError:
+            return os.path.abspath(index_path), 0, 0  # Fresh repository without an index yet
+        return os.path.abspath(index_path), stat.st_size, stat.st_mtime_ns
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path and os.path.exists(self.cache_path):
+                try:
+                    with open(self.cache_path, 'r', encoding='utf-8') as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable file list cache ({self.cache_path}): {e}")
+        return self._cache
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write file list cache ({self.cache_path}): {e}")
+
+    def _tracked_files(self, directory: str, index: Tuple[str, int, int]) -> Optional[List[str]]:
+        """Tracked paths under directory (relative to it), from the cache while the index is unchanged"""
+        key = os.path.abspath(directory)
+        with self._lock:
+            entry = self._load_cache().get(key)
+            if entry and tuple(entry["index"]) == tuple(index):
+                return entry["files"]
+
+        output = self._git(directory, "ls-files", "-z", "--cached")
+        if output is None:
+            return None
+        files = [os.fsdecode(path) for path in output.split(b"\0") if path]
+        with self._lock:
+            self._load_cache()[key] = {"index": list(index), "files": files}
+            self._save_cache()
+        return files
+
+    def _untracked_files(self, directory: str) -> Iterator[str]:
+        """Untracked, non-ignored paths under directory, streamed while git is still walking"""
+        try:
+            process = subprocess.Popen(["git", "-C", directory, "ls-files", "-z", "--others", "--exclude-standard"],
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            return
+        pending = b""
+        try:
+            for block in iter(lambda: process.stdout.read1(1 << 16), b""):
+                *paths, pending = (pending + block).split(b"\0")
+                for path in paths:
+                    yield os.fsdecode(path)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()  # The consumer stopped early
+            process.wait()
+
+    def _ignored(self, relative_path: str) -> bool:
+        return any(part in self.ignore_dirs for part in relative_path.split("/")[:-1])
+
+    def _walk(self, directory: str) -> Iterator[str]:
+        pruned = self.ignore_dirs | FALLBACK_IGNORE_DIRS
+        for root, dirs, filenames in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in pruned]
+            for filename in filenames:
+                yield os.path.normpath(os.path.join(root, filename))
+
+    def iter_paths(self, directory: str) -> Iterator[str]:
+        """Every file under directory (any extension), tracked files first"""
+        directory = os.path.normpath(directory)
+        index = self._index_stat(directory) if self.use_git else None
+        tracked = self._tracked_files(directory, index) if index else None
+        if tracked is None:
+            yield from self._walk(directory)
+            return
+
+        for relative_path in tracked:
+            if self._ignored(relative_path):
+                continue
+            path = os.path.normpath(os.path.join(directory, relative_path))
+            if os.path.isfile(path):  # Deleted in the work tree but still in the index
+                yield path
+        for relative_path in self._untracked_files(directory):
+            if not self._ignored(relative_path):
+                yield os.path.normpath(os.path.join(directory, relative_path))
+
+    def iter_files(self, directory: str, extensions: Iterable[str], ignore_files: Iterable[str] = ()) -> Iterator[str]:
+        """Files under directory with one of extensions, except those named in ignore_files"""
+        extensions = tuple(extensions)
+        ignore_files = set(ignore_files)
+        for path in self.iter_paths(directory):
+            filename = os.path.basename(path)
+            if filename.endswith(extensions) and filename not in ignore_files:
+                yield path
@@ -0,0 +1,299 @@
+"""
+Job Queue - durable, prioritized queue for Claude Desktop automation jobs
+
+Jobs are stored in SQLite so queued prompts survive a server restart. Each job
+belongs to a lane (its project); claims take the highest priority first, then
+rotate between lanes so one busy project cannot starve the others, and stay
+FIFO within a lane. A lane with a running job is skipped, so prompts for one
+project (which continue the same chat) never run in two sessions at once.
+Claims made on behalf of a session bind the lane to it: jobs that continue the
+lane's chat are only claimable by that session, since the chat is open in its
+window, while jobs that start a new chat may move the lane to any session.
+Identical pending prompts are deduplicated, queued jobs can be cancelled, and
+jobs that were running when the process died are requeued on startup.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join("logs", "automation_jobs.db")
+
+PRIORITY_LEVELS = {
+    "high": 10,
+    "normal": 5,
+    "low": 0
+}
+
+DEFAULT_LANE = "default"
+
+# Fields that make two prompts interchangeable for deduplication
+DEDUP_FIELDS = ("prompt", "project_name", "create_new_chat", "wait_for_continue", "context_summary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    lane TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedup_key TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, seq);
+CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs (dedup_key, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_lane ON jobs (status, lane);
+CREATE TABLE IF NOT EXISTS lanes (
+    lane TEXT PRIMARY KEY,
+    last_served REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS callbacks (
+    job_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (job_id, url)
+);
+"""
+
+
+def parse_priority(value: Any) -> int:
+    """Accept a priority name ("high"/"normal"/"low") or an integer"""
+    if value is None:
+        return PRIORITY_LEVELS["normal"]
+    if isinstance(value, str) and value.lower() in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value.lower()]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid priority: {value}")
+
+
+def dedup_key_for(payload: Dict[str, Any]) -> str:
+    """Hash of the fields that define what a job will do"""
+    material = json.dumps({field: payload.get(field) for field in DEDUP_FIELDS}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class JobQueue:
+    """SQLite-backed job queue shared by the API handlers and automation workers"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_attempts: int = 3):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        # Session that owns each lane's chat; sessions only live as long as the process
+        self._lane_owners: Dict[str, Any] = {}
+        logger.info(f"Job queue opened: {db_path}")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, payload: Dict[str, Any], priority: Any = None, lane: Optional[str] = None,
+                dedup: bool = True) -> Tuple[str, bool]:
+        """Add a job. Returns (job_id, created); created is False when an
+        identical job is already queued or running and its id is returned instead."""
+        priority = parse_priority(priority)
+        lane = lane or payload.get("project_name") or DEFAULT_LANE
+        dedup_key = dedup_key_for(payload) if dedup else None
+
+        with self._available:
+            if dedup_key:
+                row = self._conn.execute(
+                    "SELECT id, priority FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running') "
+                    "ORDER BY seq LIMIT 1",
+                    (dedup_key,)
+                ).fetchone()
+                if row:
+                    if priority > row["priority"]:
+                        # A more urgent duplicate promotes the pending job
+                        self._conn.execute(
+                            "UPDATE jobs SET priority = ? WHERE id = ? AND status = 'queued'",
+                            (priority, row["id"])
+                        )
+                    return row["id"], False
+
+            job_id = payload.get("id") or str(uuid.uuid4())
+            self._conn.execute(
+                "INSERT INTO jobs (id, lane, priority, status, payload, dedup_key, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, lane, priority, json.dumps({**payload, "id": job_id}), dedup_key, time.time())
+            )
+            self._available.notify()
+            return job_id, True
+
+    def claim(self, timeout: Optional[float] = None, prefer_lane: Optional[str] = None,
+              owner: Any = None) -> Optional[Dict[str, Any]]:
+        """Take the next job and mark it running, waiting up to timeout seconds.
+
+        Among jobs of equal priority, prefer_lane is served first; a session
+        passes the project its window last worked on to keep chat affinity.
+        With owner set (the claiming session), the claimed lane is bound to it
+        and jobs that continue a chat owned by another session are skipped;
+        only create_new_chat jobs can move a lane between sessions.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                foreign = [] if owner is None else [
+                    lane for lane, lane_owner in self._lane_owners.items() if lane_owner != owner
+                ]
+                row = self._conn.execute(
+                    "SELECT j.* FROM jobs j LEFT JOIN lanes l ON l.lane = j.lane "
+                    "WHERE j.status = 'queued' "
+                    "AND j.lane NOT IN (SELECT lane FROM jobs WHERE status = 'running') "
+                    f"AND (j.lane NOT IN ({', '.join('?' * len(foreign))}) "
+                    "OR json_extract(j.payload, '$.create_new_chat')) "
+                    "ORDER BY j.priority DESC, j.lane = ? DESC, COALESCE(l.last_served, 0) ASC, j.seq ASC LIMIT 1",
+                    (*foreign, prefer_lane)
+                ).fetchone()
+                if row:
+                    if owner is not None:
+                        self._lane_owners[row["lane"]] = owner
+                    return self._mark_running(row)
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._available.wait(remaining)
+
+    def claim_matching(self, lane: str, predicate: Callable[[Dict[str, Any]], bool],
+                       limit: int) -> List[Dict[str, Any]]:
+        """Claim up to limit queued jobs from one lane whose payload satisfies predicate"""
+        claimed = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' AND lane = ? ORDER BY priority DESC, seq ASC",
+                (lane,)
+            ).fetchall()
+            for row in rows:
+                if len(claimed) >= limit:
+                    break
+                if predicate(json.loads(row["payload"])):
+                    claimed.append(self._mark_running(row))
+        return claimed
+
+    def _mark_running(self, row: sqlite3.Row) -> Dict[str, Any]:
+        now = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE seq = ?",
+            (now, row["seq"])
+        )
+        self._conn.execute(
+            "INSERT INTO lanes (lane, last_served) VALUES (?, ?) "
+            "ON CONFLICT(lane) DO UPDATE SET last_served = excluded.last_served",
+            (row["lane"], now)
+        )
+        job = self._row_to_job(row)
+        job.update(status="running", started_at=now, attempts=row["attempts"] + 1)
+        return job
+
+    def complete(self, job_id: str, success: bool, result: Any = None, error: Optional[str] = None):
+        """Record the outcome of a running job"""
+        with self._available:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                ("completed" if success else "failed", time.time(),
+                 json.dumps(result) if result is not None else None, error, job_id)
+            )
+            # The job's lane may have queued work that was waiting for it
+            self._available.notify_all()
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a queued job. Returns the job's status afterwards, or None if unknown.
+
+        Running jobs cannot be interrupted mid-GUI-interaction and are left as is.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def recover_in_flight(self) -> int:
+        """Requeue jobs left running by a crashed worker; fail those out of attempts"""
+        with self._available:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'Exceeded max attempts after restart' "
+                "WHERE status = 'running' AND attempts >= ?",
+                (time.time(), self.max_attempts)
+            )
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+            )
+            if cursor.rowcount:
+                logger.warning(f"Requeued {cursor.rowcount} in-flight job(s) from a previous run")
+                self._available.notify_all()
+            return cursor.rowcount
+
+    def add_callback(self, job_id: str, url: str):
+        """Register a URL to be notified when the job finishes"""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO callbacks (job_id, url) VALUES (?, ?)", (job_id, url))
+
+    def callbacks(self, job_id: str) -> List[str]:
+        """Callback URLs registered for a job"""
+        with self._lock:
+            return [row["url"] for row in self._conn.execute(
+                "SELECT url FROM callbacks WHERE job_id = ?", (job_id,)
+            )]
+
+    def prune(self, older_than_s: float) -> int:
+        """Delete finished jobs older than older_than_s seconds"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'failed', 'cancelled') AND finished_at < ?",
+                (time.time() - older_than_s,)
+            )
+            self._conn.execute("DELETE FROM callbacks WHERE job_id NOT IN (SELECT id FROM jobs)")
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} finished job(s) from the queue database")
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status and queued jobs per lane"""
+        with self._lock:
+            by_status = {
+                row["status"]: row["count"] for row in self._conn.execute(
+                    "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+                )
+            }
+            by_lane = {
+                row["lane"]: row["count"] for row in self._conn.execute(
+                    "SELECT lane, COUNT(*) AS count FROM jobs WHERE status = 'queued' GROUP BY lane"
+                )
+            }
+        return {"by_status": by_status, "queued_by_lane": by_lane}
@@ -0,0 +1,240 @@
+"""
+Metrics - lightweight spans, counters and histograms for the automation hot path
+
+Code under measurement wraps its phases in span("name"); each finished span
+is added to the span duration histogram and, when a trace file is configured,
+written as one JSON line with its trace id and parent span so a whole
+run_automation cycle can be reconstructed. The registry renders itself in the
+Prometheus text exposition format for the API server's /metrics endpoint.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "claude_automation"
+
+# Seconds; spans range from millisecond detectors to multi-minute response waits
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts..., count, sum
+
+    def observe(self, value: float, labels: LabelKey):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', repr(float(bound))))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-1]:.6f}")
+        return lines
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            ",".join(f"{k}={v}" for k, v in labels) or "_": {
+                "count": series[-2],
+                "total_s": round(series[-1], 3),
+                "mean_s": round(series[-1] / series[-2], 4) if series[-2] else 0
+            }
+            for labels, series in self._series.items()
+        }
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[LabelKey, float] = {}
+
+    def inc(self, labels: LabelKey, amount: float = 1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(labels)} {value:g}" for labels, value in sorted(self._series.items())]
+        return lines
+
+
+class Gauge(Counter):
+    """Point-in-time value per label set"""
+
+    def set(self, labels: LabelKey, value: float):
+        self._series[labels] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics and span tracer"""
+
+    def __init__(self, namespace: str = NAMESPACE):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._local = threading.local()
+        self._trace_file = None
+        self.enabled = True
+
+    def configure(self, trace_file: Optional[str] = None, enabled: bool = True):
+        """Enable or disable collection and set (or clear) the JSONL trace file"""
+        with self._lock:
+            if self._trace_file:
+                self._trace_file.close()
+                self._trace_file = None
+            if trace_file:
+                os.makedirs(os.path.dirname(os.path.abspath(trace_file)), exist_ok=True)
+                self._trace_file = open(trace_file, 'a', encoding='utf-8', buffering=1)
+            self.enabled = enabled
+        if trace_file:
+            logger.info(f"Writing automation traces to {trace_file}")
+
+    def _metric_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}"
+
+    def observe(self, name: str, value: float, help_text: str = "", **labels):
+        """Record a value (seconds, by convention) in a histogram"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self._metric_name(name), help_text or name)
+            histogram.observe(value, _label_key(labels))
+
+    def inc(self, name: str, amount: float = 1, help_text: str = "", **labels):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = Counter(self._metric_name(name), help_text or name)
+            counter.inc(_label_key(labels), amount)
+
+    def set_gauge(self, name: str, value: float, help_text: str = "", **labels):
+        """Set a gauge to its current value"""
+        if not self.enabled:
+            return
+        with self._lock:
+            gauge = self._gauges.get(name)
+            if gauge is None:
+                gauge = self._gauges[name] = Gauge(self._metric_name(name), help_text or name)
+            gauge.set(_label_key(labels), value)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Time a block. Nested spans on the same thread share a trace id."""
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        span_id = uuid.uuid4().hex[:16]
+        trace_id = parent[1] if parent else uuid.uuid4().hex
+        stack.append((span_id, trace_id))
+        wall_start = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self.observe("span_duration_seconds", duration, "Wall time of instrumented automation phases",
+                         span=name, **labels)
+            if self._trace_file:
+                record = {
+                    "ts": wall_start, "trace_id": trace_id, "span_id": span_id,
+                    "parent_id": parent[0] if parent else None, "name": name,
+                    "duration_s": round(duration, 6), "thread": threading.current_thread().name
+                }
+                if labels:
+                    record["labels"] = {key: str(value) for key, value in labels.items()}
+                if error:
+                    record["error"] = error
+                with self._lock:
+                    if self._trace_file:
+                        self._trace_file.write(json.dumps(record) + "\n")
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator form of span(); defaults to the function's qualified name"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for metric in list(self._counters.values()) + list(self._gauges.values()) + list(self._histograms.values()):
+                lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, total and mean per histogram series, for logs and JSON endpoints"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+
+# Shared registry used across the automation, orchestrator and API server
+metrics = MetricsRegistry()
+span = metrics.span
+traced = metrics.traced
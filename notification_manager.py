@@ -255,6 +255,21 @@ class NotificationManager:
         
         return self.send_notification(message, title, "warning")
     
+    def notify_architecture_violations(self, violations):
+        """Send layer dependency violation notification."""
+        if not violations:
+            return False
+        
+        title = "Architecture Warning"
+        message = f"Layer dependency violations detected: {len(violations)} imports\n\n"
+        
+        # First 5 violations
+        for violation in violations[:5]:
+            message += (f"- {violation['path']}:{violation['line']} ({violation['source_layer']}) imports "
+                        f"{violation['target']} ({violation['target_layer']})\n")
+        
+        return self.send_notification(message, title, "warning")
+    
     def notify_task_completion(self, task_id, task_name):
         """Send task completion notification."""
         title = "Task Completion Alert"
@@ -0,0 +1,240 @@
+"""
+Process Supervisor - PID file and heartbeat tracking for the orchestrator
+
+The orchestrator records its PID and start time in a PID file and refreshes a
+heartbeat file while it works. The dashboard reads both through
+OrchestratorSupervisor, which checks liveness with os.kill(pid, 0) instead of
+spawning pgrep/pkill, and only re-reads a file when its mtime changes.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PID_FILE = os.path.join("logs", "orchestrator.pid")
+DEFAULT_HEARTBEAT_FILE = os.path.join("logs", "orchestrator_heartbeat.json")
+
+
+def _write_json_atomic(file_path: str, data: Dict[str, Any]):
+    """Write JSON via a temp file so readers never see a partial file"""
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, file_path)
+
+
+def _proc_start_ticks(pid: int) -> Optional[int]:
+    """Kernel start time of a process (Linux only), used to detect PID reuse"""
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            stat = f.read()
+        # Field 22; skip past the parenthesised command name, which may contain spaces
+        return int(stat[stat.rindex(b')') + 2:].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def is_process_alive(pid: Optional[int]) -> bool:
+    """Check whether a process exists without spawning anything"""
+    if not pid or pid <= 0:
+        return False
+
+    if os.name == 'nt':
+        # os.kill(pid, 0) would terminate the process on Windows
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists but owned by another user
+    except OSError:
+        return False
+    return True
+
+
+def record_pid(pid_file: str = DEFAULT_PID_FILE, pid: Optional[int] = None,
+               command: Optional[List[str]] = None):
+    """Record a PID and its start time in the PID file"""
+    pid = pid or os.getpid()
+    _write_json_atomic(pid_file, {
+        "pid": pid,
+        "started_at": datetime.now().isoformat(),
+        "proc_start": _proc_start_ticks(pid),
+        "command": command or sys.argv
+    })
+
+
+def clear_pid(pid_file: str = DEFAULT_PID_FILE, pid: Optional[int] = None):
+    """Remove the PID file if it still belongs to pid (default: this process)"""
+    pid = pid or os.getpid()
+    try:
+        with open(pid_file, 'r', encoding='utf-8') as f:
+            if json.load(f).get("pid") != pid:
+                return
+        os.remove(pid_file)
+    except (OSError, ValueError):
+        pass
+
+
+def write_heartbeat(heartbeat_file: str = DEFAULT_HEARTBEAT_FILE, **fields):
+    """Write a heartbeat timestamp plus optional state fields (current task, etc.)"""
+    try:
+        _write_json_atomic(heartbeat_file, {
+            "pid": os.getpid(),
+            "timestamp": time.time(),
+            "updated_at": datetime.now().isoformat(),
+            **fields
+        })
+    except Exception as e:
+        logger.debug(f"Failed to write heartbeat: {e}")
+
+
+class OrchestratorSupervisor:
+    """Tracks the orchestrator process from its PID and heartbeat files.
+
+    status() is served from memory: each call costs one kill(pid, 0) and two
+    stat() calls, and a file is parsed again only after it changes.
+    """
+
+    def __init__(self, pid_file: str = DEFAULT_PID_FILE, heartbeat_file: str = DEFAULT_HEARTBEAT_FILE,
+                 heartbeat_stale_after_s: float = 900):
+        self.pid_file = str(pid_file)
+        self.heartbeat_file = str(heartbeat_file)
+        self.heartbeat_stale_after_s = heartbeat_stale_after_s
+
+        self._pid_info: Dict[str, Any] = {}
+        self._pid_mtime = None
+        self._heartbeat: Dict[str, Any] = {}
+        self._heartbeat_mtime = None
+        self._process: Optional[subprocess.Popen] = None  # Set when we started it
+
+    def _refresh_file(self, file_path: str, cached_mtime):
+        """Return (data, mtime) if the file changed since cached_mtime, else None"""
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return ({}, None) if cached_mtime is not None else None
+        if mtime == cached_mtime:
+            return None
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f), mtime
+        except (OSError, ValueError) as e:
+            logger.debug(f"Failed to read {file_path}: {e}")
+            return None
+
+    def _refresh(self):
+        changed = self._refresh_file(self.pid_file, self._pid_mtime)
+        if changed is not None:
+            self._pid_info, self._pid_mtime = changed
+        changed = self._refresh_file(self.heartbeat_file, self._heartbeat_mtime)
+        if changed is not None:
+            self._heartbeat, self._heartbeat_mtime = changed
+
+    def _is_running(self, pid: Optional[int]) -> bool:
+        # Reap our own child so an exited orchestrator doesn't linger as a zombie
+        if self._process is not None and self._process.pid == pid:
+            return self._process.poll() is None
+        if not is_process_alive(pid):
+            return False
+        recorded_start = self._pid_info.get("proc_start")
+        if recorded_start is not None:
+            current_start = _proc_start_ticks(pid)
+            if current_start is not None and current_start != recorded_start:
+                return False  # PID has been reused by another process
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Current orchestrator status"""
+        self._refresh()
+        pid = self._pid_info.get("pid")
+        running = self._is_running(pid)
+
+        result = {
+            "running": running,
+            "pid": pid if running else None,
+            "started_at": self._pid_info.get("started_at") if running else None,
+            "heartbeat": None,
+            "heartbeat_age_s": None,
+            "heartbeat_stale": None
+        }
+
+        if running and self._heartbeat.get("pid") == pid:
+            age = time.time() - self._heartbeat.get("timestamp", 0)
+            result["heartbeat"] = self._heartbeat
+            result["heartbeat_age_s"] = round(age, 3)
+            result["heartbeat_stale"] = age > self.heartbeat_stale_after_s
+
+        return result
+
+    def start(self, command: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+        """Start the orchestrator unless it is already running"""
+        current = self.status()
+        if current["running"]:
+            return {"started": False, "pid": current["pid"]}
+
+        self._process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        # The orchestrator records itself too; writing here avoids a window
+        # where status() would report it as stopped
+        record_pid(self.pid_file, self._process.pid, command)
+        logger.info(f"Orchestrator started with PID {self._process.pid}")
+        return {"started": True, "pid": self._process.pid}
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """Stop the orchestrator. Returns False if it was not running"""
+        current = self.status()
+        pid = current["pid"]
+        if not current["running"]:
+            return False
+
+        # SIGTERM lets the orchestrator save progress in its signal handler
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError as e:
+            logger.error(f"Failed to signal orchestrator {pid}: {e}")
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self._is_running(pid):
+            time.sleep(0.1)
+
+        if self._is_running(pid) and hasattr(signal, 'SIGKILL'):
+            logger.warning(f"Orchestrator {pid} did not exit after {timeout}s, killing")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+            if self._process is not None and self._process.pid == pid:
+                self._process.wait(timeout=5)
+
+        clear_pid(self.pid_file, pid)
+        return True
@@ -0,0 +1,127 @@
+"""
+Result Store - bounded in-memory status/result cache for automation jobs
+
+Entries live in an LRU ordered by last access and are evicted once the store
+exceeds max_entries or an entry has gone ttl_s without being read or updated.
+Finished results can optionally be appended to a JSONL file as history. The
+job queue database remains the source of truth, so an evicted entry is only a
+cache miss, not a lost result.
+
+Callers can block in wait() until a job reaches a finished status; each job
+being waited on gets its own condition variable, so a completion wakes only
+the requests interested in that job.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class ResultStore:
+    """Thread-safe LRU of job status and results with size and idle-TTL eviction"""
+
+    def __init__(self, max_entries: int = 1000, ttl_s: float = 3600, spill_file: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.spill_file = spill_file
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # task_id -> [Condition, number of waiting threads]
+        self._waiters: Dict[str, list] = {}
+
+        if spill_file:
+            os.makedirs(os.path.dirname(os.path.abspath(spill_file)), exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, now: float):
+        # Entries are ordered by last access, so expired ones are at the front
+        while self._entries:
+            task_id, entry = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_entries or now - entry["_touched"] > self.ttl_s:
+                del self._entries[task_id]
+            else:
+                break
+
+    def set(self, task_id: str, status: str, result: Optional[Dict[str, Any]] = None):
+        """Record a job's status, and its result once it has one"""
+        now = time.monotonic()
+        entry = {"status": status, "_touched": now}
+        if result is not None:
+            entry["result"] = result
+
+        with self._lock:
+            self._entries[task_id] = entry
+            self._entries.move_to_end(task_id)
+            self._evict(now)
+            waiter = self._waiters.get(task_id)
+            if waiter and status in FINISHED_STATUSES:
+                waiter[0].notify_all()
+
+        if self.spill_file and status in FINISHED_STATUSES:
+            self._spill(task_id, status, result)
+
+    def seed(self, task_id: str, status: str, result: Optional[Dict[str, Any]] = None):
+        """Like set(), but leaves an existing entry alone so a stale status read
+        elsewhere cannot overwrite one the worker has already advanced"""
+        with self._lock:
+            if task_id in self._entries:
+                return
+        self.set(task_id, status, result)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return {"status", "result"?} for a cached job, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                return None
+            if now - entry["_touched"] > self.ttl_s:
+                del self._entries[task_id]
+                return None
+            entry["_touched"] = now
+            self._entries.move_to_end(task_id)
+            return {key: value for key, value in entry.items() if key != "_touched"}
+
+    def wait(self, task_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until the job has a finished status or timeout elapses, then return get()"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            waiter = self._waiters.setdefault(task_id, [threading.Condition(self._lock), 0])
+            waiter[1] += 1
+            try:
+                while True:
+                    entry = self._entries.get(task_id)
+                    if entry and entry["status"] in FINISHED_STATUSES:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    waiter[0].wait(remaining)
+            finally:
+                waiter[1] -= 1
+                if not waiter[1]:
+                    del self._waiters[task_id]
+        return self.get(task_id)
+
+    def _spill(self, task_id: str, status: str, result: Optional[Dict[str, Any]]):
+        try:
+            with open(self.spill_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    "task_id": task_id,
+                    "status": status,
+                    "result": result,
+                    "recorded_at": datetime.now().isoformat()
+                }) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write result history: {e}")
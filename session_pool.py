@@ -0,0 +1,118 @@
+"""
+Session Pool - several Claude Desktop windows driven in parallel
+
+Each session binds one ClaudeDesktopAutomation to one Claude window (by index
+among the windows with the configured title) and, optionally, a fixed screen
+region. Sessions on the same display share one input lock, so typing and
+clicking are serialized while the long response waits overlap. With the Xvfb
+backend every session gets its own virtual display instead, so nothing is
+shared and input runs fully in parallel.
+"""
+
+import shlex
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+from claude_desktop_automation import ClaudeDesktopAutomation, DISPLAY_INPUT_LOCK
+from display_backend import create_backend
+
+logger = logging.getLogger(__name__)
+
+
+class AutomationSession:
+    """One Claude window, its automation instance and what it is working on"""
+
+    def __init__(self, index: int, automation: ClaudeDesktopAutomation):
+        self.index = index
+        self.automation = automation
+        self.current_project: Optional[str] = None
+        self.current_jobs: List[str] = []
+        self.jobs_completed = 0
+        self.last_active: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def begin(self, project: Optional[str], job_ids: List[str]):
+        """Mark the session busy with the given jobs"""
+        with self._lock:
+            self.current_project = project
+            self.current_jobs = list(job_ids)
+            self.last_active = datetime.now().isoformat()
+
+    def end(self):
+        """Mark the session idle; the project is kept for chat affinity"""
+        with self._lock:
+            self.jobs_completed += len(self.current_jobs)
+            self.current_jobs = []
+            self.last_active = datetime.now().isoformat()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "index": self.index,
+                "window_index": self.automation.window_index,
+                "region": self.automation.region,
+                "display_backend": self.automation.backend.name,
+                "busy": bool(self.current_jobs),
+                "current_project": self.current_project,
+                "current_jobs": list(self.current_jobs),
+                "jobs_completed": self.jobs_completed,
+                "last_active": self.last_active
+            }
+
+
+class SessionPool:
+    """Fixed set of automation sessions, one per Claude window"""
+
+    def __init__(self, sessions: List[AutomationSession]):
+        if not sessions:
+            raise ValueError("SessionPool needs at least one session")
+        self.sessions = sessions
+
+    @classmethod
+    def create(cls, count: int = 1, config_path: str = "claude_desktop_config.json",
+               regions: Optional[List[Tuple[int, int, int, int]]] = None,
+               factory: Callable[..., ClaudeDesktopAutomation] = ClaudeDesktopAutomation,
+               display_backend: Optional[str] = None, app_command: Optional[str] = None) -> "SessionPool":
+        """Create count sessions bound to windows 0..count-1.
+
+        A single session keeps the classic behaviour (first window, maximized).
+        With display_backend="xvfb" each session gets its own virtual display,
+        and app_command (if given) is launched on each one.
+        """
+        sessions = []
+        for index in range(count):
+            if display_backend == "xvfb":
+                options = {"app_command": shlex.split(app_command)} if app_command else {}
+                automation = factory(config_path, backend=create_backend("xvfb", **options),
+                                     input_lock=threading.RLock())
+            elif count == 1 and not regions:
+                automation = factory(config_path, backend=create_backend(display_backend) if display_backend else None)
+            else:
+                region = regions[index] if regions and index < len(regions) else None
+                automation = factory(config_path, window_index=index, region=region,
+                                     input_lock=DISPLAY_INPUT_LOCK,
+                                     backend=create_backend(display_backend) if display_backend else None)
+            sessions.append(AutomationSession(index, automation))
+        logger.info(f"Session pool created with {count} session(s)")
+        return cls(sessions)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __iter__(self):
+        return iter(self.sessions)
+
+    @property
+    def primary(self) -> ClaudeDesktopAutomation:
+        """Automation of the first session, used for one-off window operations"""
+        return self.sessions[0].automation
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [session.status() for session in self.sessions]
+
+    def close(self):
+        """Release display backends (stops any Xvfb servers the pool started)"""
+        for session in self.sessions:
+            session.automation.backend.close()
@@ -0,0 +1,332 @@
+"""
+Symbol Index - persistent packages, classes and imports of a source tree
+
+Java and Python files under a source root are scanned once into SQLite: each
+file's package/module and hexagonal layer, the types it declares and the
+imports it makes. Later updates only re-parse files whose size or mtime
+changed (or the paths a commit touched), so architecture questions such as
+"which domain files import infrastructure" are answered by indexed joins
+instead of rescanning sources.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from comment_detector import PYTHON_TOKENS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join("logs", "symbol_index.db")
+
+# Directory-name markers of hexagonal layers (a directory belongs to a layer if its name contains one)
+HEXAGONAL_LAYERS = ("domain", "application", "infrastructure", "ports", "adapters")
+
+# Layer -> layers it must not depend on
+LAYER_RULES = {
+    "domain": ("application", "infrastructure", "adapters"),
+    "application": ("infrastructure", "adapters"),
+    "ports": ("infrastructure", "adapters")
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    package TEXT,
+    layer TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_layer ON files(layer);
+
+-- Types, modules and packages, each pointing at the file that defines it
+CREATE TABLE IF NOT EXISTS symbols (
+    qualified_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(qualified_name);
+CREATE INDEX IF NOT EXISTS idx_symbols_path ON symbols(path);
+
+-- target: the imported name; container: its enclosing module when the target may be a
+-- non-indexed member (Python "from a.b import f")
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    container TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_imports_path ON imports(path);
+"""
+
+JAVA_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+JAVA_IMPORT = re.compile(r"^\s*import\s+(static\s+)?([\w.]+?)(\.\*)?\s*;", re.MULTILINE)
+JAVA_TYPE = re.compile(
+    r"^\s*(?:(?:public|protected|private|abstract|final|static|sealed|non-sealed|strictfp)\s+)*"
+    r"(class|interface|enum|record|@interface)\s+(\w+)",
+    re.MULTILINE
+)
+
+# Line-based like the Java patterns: import statements and top-level classes, no full parse.
+# String literals and comments are matched first (and skipped) so docstring examples do not count.
+PYTHON_STATEMENTS = re.compile(
+    PYTHON_TOKENS.pattern
+    + r"|^[ \t]*from[ \t]+(?P<source>\.*[ \t]*[\w.]*)[ \t]+import[ \t]+(?P<names>\([^)]*\)|(?:[^\n#;\\]|\\\r?\n)+)"
+    + r"|^[ \t]*import[ \t]+(?P<modules>(?:[^\n#;\\]|\\\r?\n)+)"
+    + r"|^class[ \t]+(?P<class>\w+)",
+    re.MULTILINE
+)
+
+# Imports from files in a source layer that resolve to files in a target layer. The container
+# ("a.b" of "from a.b import f") is only used when the imported name itself is not indexed.
+DEPENDENCY_QUERY = """
+SELECT path, line, target, MIN(target_path) AS target_path FROM (
+    SELECT i.path, i.line, i.target, t.path AS target_path
+    FROM files f
+    JOIN imports i ON i.path = f.path
+    JOIN symbols s ON s.qualified_name = i.target
+    JOIN files t ON t.path = s.path
+    WHERE f.layer = :source AND t.layer = :target
+    UNION ALL
+    SELECT i.path, i.line, i.target, t.path AS target_path
+    FROM files f
+    JOIN imports i ON i.path = f.path
+    JOIN symbols s ON s.qualified_name = i.container
+    JOIN files t ON t.path = s.path
+    WHERE f.layer = :source AND t.layer = :target
+      AND NOT EXISTS (SELECT 1 FROM symbols known WHERE known.qualified_name = i.target)
+)
+GROUP BY path, line, target
+ORDER BY path, line
+"""
+
+
+def layer_for(relative_path: str) -> Optional[str]:
+    """Innermost hexagonal layer named by the path's directories, e.g. application/ports -> ports"""
+    layer = None
+    for part in relative_path.replace("\\", "/").split("/")[:-1]:
+        for name in HEXAGONAL_LAYERS:
+            if name in part.lower():
+                layer = name
+    return layer
+
+
+def _line_of(text: str, offset: int) -> int:
+    return text.count("\n", 0, offset) + 1
+
+
+def parse_java(text: str) -> Tuple[Optional[str], List[Tuple[str, str]], List[Tuple[int, str, Optional[str]]]]:
+    """(package, [(qualified name, kind)], [(line, target, container)]) of a Java/Kotlin-style source"""
+    match = JAVA_PACKAGE.search(text)
+    package = match.group(1) if match else None
+    prefix = f"{package}." if package else ""
+
+    symbols = [(prefix + m.group(2), m.group(1).lstrip("@")) for m in JAVA_TYPE.finditer(text)]
+    if package:
+        symbols.append((package, "package"))
+
+    imports = []
+    for m in JAVA_IMPORT.finditer(text):
+        is_static, name, wildcard = m.group(1), m.group(2), m.group(3)
+        if is_static and not wildcard:
+            name = name.rsplit(".", 1)[0]  # import static a.b.C.member -> a.b.C
+        imports.append((_line_of(text, m.start(2)), name, None))
+    return package, symbols, imports
+
+
+def _import_names(clause: str) -> List[str]:
+    """Imported names of "a, b as c" or "(a,\n b)", without aliases"""
+    names = []
+    clause = re.sub(r"#[^\n]*", "", clause).replace("\\\n", " ")
+    for item in clause.strip().strip("()").split(","):
+        words = item.split()
+        if words:
+            names.append(words[0])
+    return names
+
+
+def parse_python(text: str, module: str) -> Tuple[Optional[str], List[Tuple[str, str]], List[Tuple[int, str, Optional[str]]]]:
+    """(package, [(qualified name, kind)], [(line, target, container)]) of a Python module"""
+    is_package = module.endswith(".__init__") or module == "__init__"
+    if is_package:
+        module = module.rsplit(".", 1)[0] if "." in module else ""
+    package = module if is_package else (module.rsplit(".", 1)[0] if "." in module else "")
+
+    symbols = [(module, "package" if is_package else "module")] if module else []
+    imports = []
+    for m in PYTHON_STATEMENTS.finditer(text):
+        if m.group("class"):
+            symbols.append((f"{module}.{m.group('class')}" if module else m.group("class"), "class"))
+            continue
+        if m.group("modules"):
+            line = _line_of(text, m.start())
+            imports.extend((line, name, None) for name in _import_names(m.group("modules")))
+            continue
+        source = m.group("source")
+        if source is None:
+            continue  # String literal or comment
+        line = _line_of(text, m.start())
+        base = source.lstrip(".")
+        level = len(source) - len(base)
+        base = base.strip()
+        if level:
+            # Relative import: resolved against the importing module's package
+            parts = package.split(".") if package else []
+            anchor = parts[:len(parts) - level + 1] if level <= len(parts) + 1 else []
+            base = ".".join(anchor + ([base] if base else []))
+        for name in _import_names(m.group("names")):
+            if name == "*":
+                imports.append((line, base, None))
+            else:
+                imports.append((line, f"{base}.{name}" if base else name, base or None))
+    return package, symbols, imports
+
+
+# Indexed file extensions -> language; other sources (Kotlin, JavaScript, ...) are not indexed
+INDEXED_LANGUAGES = {
+    ".py": "python",
+    ".java": "java"
+}
+
+
+def indexed_language(path: str) -> Optional[str]:
+    return INDEXED_LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+
+class SymbolIndex:
+    """Persistent symbol/import index of one source root"""
+
+    def __init__(self, src_root: str, db_path: str = DEFAULT_INDEX_PATH):
+        self.src_root = os.path.abspath(src_root)
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _parse(self, path: str) -> Optional[Tuple[str, Optional[str], List, List]]:
+        language = indexed_language(path)
+        if language is None:
+            return None
+        relative = os.path.relpath(path, self.src_root)
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError as e:
+            logger.warning(f"Could not index {path}: {e}")
+            return None
+        if language == "python":
+            module = os.path.splitext(relative)[0].replace(os.sep, ".").replace("/", ".")
+            return (language,) + parse_python(text, module)
+        return (language,) + parse_java(text)
+
+    def _remove(self, paths: List[str]):
+        rows = [(path,) for path in paths]
+        for table in ("files", "symbols", "imports"):
+            self._conn.executemany(f"DELETE FROM {table} WHERE path = ?", rows)
+
+    def _reindex(self, paths: List[str]):
+        """Parse paths and replace their rows in one transaction; missing files are removed"""
+        parsed = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                parsed.append((path, None, None))
+                continue
+            parsed.append((path, stat, self._parse(path)))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._remove([path for path, _, _ in parsed])
+            for path, stat, result in parsed:
+                if stat is None or result is None:
+                    continue
+                language, package, symbols, imports = result
+                layer = layer_for(os.path.relpath(path, self.src_root))
+                self._conn.execute(
+                    "INSERT INTO files (path, size, mtime_ns, language, package, layer, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, language, package, layer, time.time())
+                )
+                self._conn.executemany("INSERT INTO symbols (qualified_name, kind, path) VALUES (?, ?, ?)",
+                                       [(name, kind, path) for name, kind in symbols])
+                self._conn.executemany("INSERT INTO imports (path, line, target, container) VALUES (?, ?, ?, ?)",
+                                       [(path, line, target, container) for line, target, container in imports])
+            self._conn.execute("COMMIT")
+
+    def sync(self, files: Iterable[str]) -> Dict[str, int]:
+        """Bring the index in line with the complete current file list: re-parse new or
+        modified files and drop files no longer present. Files of languages the index
+        does not parse are ignored."""
+        current = {os.path.abspath(path) for path in files if indexed_language(path)}
+        with self._lock:
+            known = {row["path"]: (row["size"], row["mtime_ns"])
+                     for row in self._conn.execute("SELECT path, size, mtime_ns FROM files")}
+
+        changed = []
+        for path in current:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) != (stat.st_size, stat.st_mtime_ns):
+                changed.append(path)
+        removed = [path for path in known if path not in current]
+
+        self._reindex(changed + removed)
+        counts = {"indexed": len(changed), "removed": len(removed), "unchanged": len(current) - len(changed)}
+        logger.info(f"Symbol index sync: {counts['indexed']} indexed, {counts['removed']} removed, "
+                    f"{counts['unchanged']} unchanged")
+        return counts
+
+    def update_paths(self, paths: Iterable[str], extensions: Iterable[str] = tuple(INDEXED_LANGUAGES)) -> int:
+        """Incremental update for specific paths (e.g. the files a commit touched).
+        Only paths with one of extensions that the index can parse are considered."""
+        extensions = tuple(extension for extension in extensions if extension.lower() in INDEXED_LANGUAGES)
+        root = self.src_root + os.sep
+        selected = [os.path.abspath(path) for path in paths]
+        selected = [path for path in selected if path.startswith(root) and path.lower().endswith(extensions)]
+        if selected:
+            self._reindex(selected)
+            logger.info(f"Symbol index updated for {len(selected)} file(s)")
+        return len(selected)
+
+    def layers(self) -> Dict[str, int]:
+        """Indexed file count per hexagonal layer"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT layer, COUNT(*) AS files FROM files WHERE layer IS NOT NULL GROUP BY layer"
+            ).fetchall()
+        return {row["layer"]: row["files"] for row in rows}
+
+    def dependencies(self, source_layer: str, target_layer: str) -> List[Dict[str, Any]]:
+        """Imports from source_layer files that resolve to target_layer files"""
+        with self._lock:
+            rows = self._conn.execute(DEPENDENCY_QUERY, {"source": source_layer, "target": target_layer}).fetchall()
+        return [dict(row, source_layer=source_layer, target_layer=target_layer) for row in rows]
+
+    def violations(self, rules: Optional[Dict[str, Iterable[str]]] = None) -> List[Dict[str, Any]]:
+        """Every import that breaks a layer rule (default: LAYER_RULES)"""
+        found = []
+        for source_layer, forbidden in (rules or LAYER_RULES).items():
+            for target_layer in forbidden:
+                found.extend(self.dependencies(source_layer, target_layer))
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("files", "symbols", "imports")}
+
+    def close(self):
+        self._conn.close()
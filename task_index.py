@@ -0,0 +1,211 @@
+"""
+Task Index - secondary indexes over tasks.json for paged listings
+
+The index is built once per version of tasks.json (keyed by mtime and size)
+and answers filtered, cursor-paginated queries by walking the smallest
+matching posting list (or, with updated_since, the update-time order from
+the first match) and testing other filters against membership sets built
+with the index, so a request costs roughly the positions it scans for one
+page rather than the whole backlog.
+"""
+
+import os
+import json
+import base64
+import bisect
+import heapq
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+DONE_STATUSES = ("done", "completed")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def normalize_timestamp(value: str) -> str:
+    """An ISO 8601 timestamp in the form tasks.json stores (naive local time, as
+    datetime.isoformat() writes it), so timestamps compare correctly as strings.
+    Raises ValueError for anything that is not ISO 8601."""
+    moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+
+def encode_cursor(task_id: Any, position: int, updated: Optional[str] = None) -> str:
+    """Opaque cursor pointing at the next task to return: its id, its position when the
+    page was served and, for update-time ordered listings, its update time. The id keeps
+    the cursor on the right task when tasks.json is edited between pages."""
+    payload = {"id": str(task_id), "p": position}
+    if updated is not None:
+        payload["u"] = updated
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {"id": payload.get("id"), "p": int(payload["p"]), "u": payload.get("u")}
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def project_fields(item: Dict, fields: Optional[List[str]]) -> Dict:
+    """Keep only the requested keys (id is always kept)"""
+    if not fields:
+        return item
+    return {key: item[key] for key in ["id", *fields] if key in item}
+
+
+class TaskIndex:
+    """Posting lists of task positions by status, priority, readiness and update time"""
+
+    def __init__(self, tasks_data: Dict):
+        self.tasks: List[Dict] = tasks_data.get("tasks", [])
+        self.by_status: Dict[str, List[int]] = {}
+        self.by_priority: Dict[str, List[int]] = {}
+        self.ready: List[int] = []
+        self.not_ready: List[int] = []
+
+        status_by_id = {str(task.get("id")): task.get("status") for task in self.tasks}
+        self._position_by_id = {str(task.get("id")): position for position, task in enumerate(self.tasks)}
+        self._updated_at: List[str] = []
+
+        for position, task in enumerate(self.tasks):
+            self.by_status.setdefault(task.get("status", "pending"), []).append(position)
+            self.by_priority.setdefault(task.get("priority", "medium"), []).append(position)
+
+            dependencies = task.get("dependencies", [])
+            is_ready = task.get("status", "pending") == "pending" and all(
+                status_by_id.get(str(dep)) in DONE_STATUSES for dep in dependencies
+            )
+            (self.ready if is_ready else self.not_ready).append(position)
+
+            updated = task.get("updated_at") or task.get("created_at") or ""
+            try:
+                updated = normalize_timestamp(updated)
+            except ValueError:
+                pass  # Missing or foreign format: compared as stored
+            self._updated_at.append(updated)
+
+        # Membership sets for filters that do not drive the scan, built once per index
+        self._status_sets = {key: set(positions) for key, positions in self.by_status.items()}
+        self._priority_sets = {key: set(positions) for key, positions in self.by_priority.items()}
+        self._ready_sets = {True: set(self.ready), False: set(self.not_ready)}
+        # Update-time order: (updated, position) pairs, plus the keys alone for bisecting on a time
+        self._updated_order = sorted((updated, position) for position, updated in enumerate(self._updated_at))
+        self._updated_keys = [updated for updated, _ in self._updated_order]
+
+    def _resume_position(self, cursor: Dict[str, Any]) -> int:
+        """Current position of the cursor's task (its old position if it was deleted)"""
+        return self._position_by_id.get(cursor["id"], cursor["p"])
+
+    @staticmethod
+    def _merge_from(lists: List[List[int]], start: int) -> Iterator[int]:
+        """Positions >= start from position-sorted, disjoint posting lists, in order"""
+        # Index ranges rather than slices, so resuming from a cursor copies nothing
+        tails = [map(lst.__getitem__, range(bisect.bisect_left(lst, start), len(lst))) for lst in lists]
+        return tails[0] if len(tails) == 1 else heapq.merge(*tails)
+
+    def query(self, status: Optional[List[str]] = None, priority: Optional[List[str]] = None,
+              ready: Optional[bool] = None, updated_since: Optional[str] = None,
+              cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Return one page of matching tasks.
+
+        Tasks come in tasks.json order, or by update time (oldest first) when
+        updated_since is given. Returns {"tasks", "next_cursor", "total"}; total
+        is exact when at most one filter is applied and None otherwise, since
+        counting an intersection would mean visiting every match. Raises
+        ValueError for a malformed cursor or updated_since.
+        """
+        # (match count, posting lists, membership sets) per filter; lists and sets are prebuilt
+        filters: List[Tuple[int, List[List[int]], List[set]]] = []
+        for values, postings, sets in ((status, self.by_status, self._status_sets),
+                                       (priority, self.by_priority, self._priority_sets)):
+            if values:
+                keys = [key for key in set(values) if key in postings]
+                lists = [postings[key] for key in keys]
+                filters.append((sum(map(len, lists)), lists, [sets[key] for key in keys]))
+        if ready is not None:
+            filters.append((len(self.ready if ready else self.not_ready),
+                            [self.ready if ready else self.not_ready], [self._ready_sets[bool(ready)]]))
+
+        resume = decode_cursor(cursor) if cursor else None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        if updated_since:
+            # Update-time order, starting at the first task updated at or after updated_since
+            try:
+                since = normalize_timestamp(updated_since)
+            except ValueError:
+                raise ValueError(f"updated_since must be an ISO 8601 timestamp: {updated_since}")
+            first = bisect.bisect_left(self._updated_keys, since)
+            begin = first
+            if resume:
+                after = (resume["u"] or "", self._resume_position(resume))
+                begin = max(first, bisect.bisect_left(self._updated_order, after))
+            driver = (position for _, position in map(self._updated_order.__getitem__,
+                                                      range(begin, len(self._updated_order))))
+            total = len(self._updated_keys) - first
+            others = [sets for _, _, sets in filters]
+        elif filters:
+            # The smallest posting-list filter drives the scan
+            filters.sort(key=lambda entry: entry[0])
+            total, lists, _ = filters[0]
+            driver = self._merge_from(lists, self._resume_position(resume) if resume else 0)
+            others = [sets for _, _, sets in filters[1:]]
+        else:
+            total = len(self.tasks)
+            driver = iter(range(self._resume_position(resume) if resume else 0, len(self.tasks)))
+            others = []
+
+        page: List[int] = []
+        next_cursor = None
+        for position in driver:
+            if all(any(position in members for members in sets) for sets in others):
+                if len(page) == limit:
+                    next_cursor = encode_cursor(self.tasks[position].get("id"), position,
+                                                self._updated_at[position] if updated_since else None)
+                    break
+                page.append(position)
+
+        return {
+            "tasks": [self.tasks[position] for position in page],
+            "next_cursor": next_cursor,
+            "total": total if len(filters) + bool(updated_since) <= 1 else None
+        }
+
+
+_index_cache: Dict[str, Tuple[Any, TaskIndex]] = {}
+_index_lock = threading.Lock()
+
+
+def get_task_index(tasks_file: str) -> TaskIndex:
+    """Return the index for tasks_file, rebuilding it only when the file changed"""
+    path = str(tasks_file)
+    try:
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return TaskIndex({"tasks": []})
+
+    with _index_lock:
+        cached = _index_cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = TaskIndex(json.load(f))
+        except Exception as e:
+            logger.error(f"Error indexing {path}: {e}")
+            return TaskIndex({"tasks": []})
+
+        _index_cache[path] = (signature, index)
+        return index
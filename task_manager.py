@@ -8,6 +8,8 @@ from typing import List, Dict, Optional, Union
 from datetime import datetime
 import re
 
+from task_versioning import mark_changed, save_tasks_file
+
 logger = logging.getLogger(__name__)
 
 class TaskManager:
@@ -31,8 +33,7 @@ class TaskManager:
         """Save tasks.json file"""
         try:
             self.tasks_data["metadata"]["last_updated"] = datetime.now().isoformat()
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(self.tasks_data, f, indent=2, ensure_ascii=False)
+            save_tasks_file(self.tasks_file, self.tasks_data, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
             logger.error(f"Failed to save tasks: {e}")
@@ -102,6 +103,7 @@ class TaskManager:
         if task:
             task["status"] = status
             task["updated_at"] = datetime.now().isoformat()
+            mark_changed(self.tasks_data, task)
             return self._save_tasks()
         
         return False
@@ -145,6 +147,7 @@ class TaskManager:
         
         tasks.append(new_task)
         self.tasks_data["tasks"] = tasks
+        mark_changed(self.tasks_data, new_task)
         
         if self._save_tasks():
             return new_id
@@ -178,6 +181,7 @@ class TaskManager:
         
         subtasks.append(new_subtask)
         parent_task["subtasks"] = subtasks
+        mark_changed(self.tasks_data, new_subtask)
         
         if self._save_tasks():
             return f"{parent_id}.{new_subtask_id}"
@@ -198,6 +202,7 @@ class TaskManager:
         """Update all tasks from specific ID"""
         tasks = self.tasks_data.get("tasks", [])
         updated_count = 0
+        updated_tasks = []
         
         for task in tasks:
             if int(task.get("id", 0)) >= from_id:
@@ -208,10 +213,13 @@ class TaskManager:
                 else:
                     task["description"] += f"\n\n[Updated]: {prompt}"
                     task["updated_at"] = datetime.now().isoformat()
+                    updated_tasks.append(task)
                 
                 updated_count += 1
         
         if updated_count > 0:
+            if updated_tasks:
+                mark_changed(self.tasks_data, *updated_tasks)
             self._save_tasks()
             logger.info(f"Updated {updated_count} tasks")
             return True
@@ -13,6 +13,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from task_orchestrator import TaskOrchestrator
+from task_versioning import mark_changed
 
 
 class TaskMasterWrapper:
@@ -144,6 +145,7 @@ class TaskMasterWrapper:
                     
                 subtask["status"] = "pending"
                 subtask["failure_count"] = 0
+                mark_changed(self.tasks_data, subtask)
                 print(f"Reset subtask '{subtask.get('name', subtask_id)}' status.")
             else:
                 task["status"] = "pending"
@@ -156,6 +158,7 @@ class TaskMasterWrapper:
                     subtask["status"] = "pending"
                     subtask["failure_count"] = 0
                     
+                mark_changed(self.tasks_data, task, *task.get("subtasks", []))
                 print(f"Reset task '{task.get('name', task_id)}' status.")
         else:
             # Reset all tasks
@@ -168,6 +171,8 @@ class TaskMasterWrapper:
                 for subtask in task.get("subtasks", []):
                     subtask["status"] = "pending"
                     subtask["failure_count"] = 0
+                
+                mark_changed(self.tasks_data, task, *task.get("subtasks", []))
                     
             print("Reset all task statuses.")
         
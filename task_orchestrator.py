@@ -16,6 +16,7 @@ from claude_desktop_automation import ClaudeDesktopAutomation # Updated import
 from code_analyzer import CodeAnalyzer
 from notification_manager import NotificationManager
 from task_master_mcp_client import TaskMasterMCPClient
+from task_versioning import mark_changed, save_tasks_file
 
 # Create logs directory
 LOGS_DIR = "logs"
@@ -280,8 +281,7 @@ class TaskOrchestrator:
     def _save_tasks_data(self):
         """Save tasks data to tasks.json"""
         try:
-            with open("tasks.json", 'w') as f:
-                json.dump(self.tasks_data, f, indent=2)
+            save_tasks_file("tasks.json", self.tasks_data)
             logger.info("Tasks data saved")
             return True
         except Exception as e:
@@ -314,12 +314,14 @@ class TaskOrchestrator:
             if task_id:
                 task = self.get_task_by_id(task_id)
                 if task:
+                    changed = task
                     if result["success"]:
                         if subtask_id:
                             subtask = self.get_subtask_by_id(task, subtask_id)
                             if subtask:
                                 subtask["status"] = "completed"
                                 subtask["completed_at"] = datetime.now().isoformat()
+                                changed = subtask
                         else:
                             task["status"] = "completed"
                             task["completed_at"] = datetime.now().isoformat()
@@ -328,9 +330,12 @@ class TaskOrchestrator:
                             subtask = self.get_subtask_by_id(task, subtask_id)
                             if subtask:
                                 subtask["status"] = "failed"
+                                changed = subtask
                         else:
                             task["status"] = "failed"
                     
+                    mark_changed(self.tasks_data, changed)
+                    
                     self._save_tasks_data()
             
             return result
@@ -22,14 +22,25 @@ from typing import Dict, List, Optional, Any, Tuple
 # Module imports
 from claude_desktop_automation import ClaudeDesktopAutomation
 from code_analyzer import CodeAnalyzer
+from analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+from symbol_index import SymbolIndex, DEFAULT_INDEX_PATH
 from notification_manager import NotificationManager
 from task_master_mcp_client import TaskMasterMCPClient
+from process_supervisor import record_pid, clear_pid, write_heartbeat
+from metrics import metrics, traced
 
 # Create logs directory
 LOGS_DIR = "logs"
 if not os.path.exists(LOGS_DIR):
     os.makedirs(LOGS_DIR)
 
+# Process tracking files read by the dashboard's OrchestratorSupervisor
+PID_FILE = os.path.join(LOGS_DIR, "orchestrator.pid")
+HEARTBEAT_FILE = os.path.join(LOGS_DIR, "orchestrator_heartbeat.json")
+
+# Prometheus text snapshot refreshed with the heartbeat (node_exporter textfile format)
+METRICS_FILE = os.path.join(LOGS_DIR, "orchestrator_metrics.prom")
+
 # Logging configuration
 log_file_path = os.path.join(LOGS_DIR, "automation_orchestrator.log")
 logging.basicConfig(
@@ -50,10 +61,24 @@ class EnhancedTaskOrchestrator:
         self.config = self._load_config(config_path)
         self.project_root = os.path.abspath(self.config.get("project_dir", "."))
         
+        # Tracing: spans from this process go to a JSONL file when configured
+        metrics_config = self.config.get("metrics", {})
+        metrics.configure(trace_file=metrics_config.get("trace_file"),
+                          enabled=metrics_config.get("enabled", True))
+        
         # Initialize components
         try:
             self.claude = ClaudeDesktopAutomation(self.config.get("claude_desktop", {}).get("config_path"))
             self.code_analyzer = CodeAnalyzer()
+            analysis_config = self.config.get("code_analysis", {})
+            for key in ("file_discovery", "file_list_cache", "languages", "language_rules"):
+                if key in analysis_config:
+                    self.code_analyzer.config[key] = analysis_config[key]
+            self.analysis_cache = AnalysisCache(
+                analysis_config.get("cache_file", DEFAULT_CACHE_PATH),
+                signature=self.code_analyzer.config_signature()
+            ) if analysis_config.get("cache_enabled", True) else None
+            self.symbol_index = None  # Opened on the first code quality check (needs the dev project's src_dir)
             self.notification = NotificationManager(self.config.get("notification", {}).get("config_path"))
             self.task_master_client = TaskMasterMCPClient(self.project_root)
         except Exception as e:
@@ -247,6 +272,7 @@ Traceback:
             logger.warning(f"Configuration file not found: {config_path}")
             return {}
             
+    @traced("orchestrator.check_task_master_progress")
     def check_task_master_progress(self):
         """Check current development progress through Task Master MCP"""
         if self.task_master_checked:
@@ -370,12 +396,28 @@ After checking, please organize the results in the following format:
                 json.dump(self.progress_state, f, indent=2)
                 
             logger.info(f"Progress state saved: {progress_file}")
+            self._write_heartbeat()
             
             # Also save context state whenever progress is saved
             self.save_context_state()
         except Exception as e:
             logger.error(f"Failed to save progress state: {e}")
             
+    def _write_heartbeat(self, phase: str = "running"):
+        """Refresh the heartbeat file polled by the dashboard"""
+        write_heartbeat(
+            HEARTBEAT_FILE,
+            phase=phase,
+            current_task=self.progress_state.get("current_task"),
+            current_subtask=self.progress_state.get("current_subtask")
+        )
+        try:
+            with open(f"{METRICS_FILE}.tmp", 'w', encoding='utf-8') as f:
+                f.write(metrics.render_prometheus())
+            os.replace(f"{METRICS_FILE}.tmp", METRICS_FILE)
+        except OSError as e:
+            logger.debug(f"Could not write metrics file: {e}")
+            
     def load_progress_state(self):
         """Load saved progress state"""
         progress_file = Path(self.project_root) / "logs" / "orchestrator_progress.json"
@@ -432,6 +474,7 @@ After checking, please organize the results in the following format:
         
         return self.current_global_context_summary
     
+    @traced("orchestrator.process_task_with_mcp")
     def process_task_with_mcp(self, task_id: str, subtask_id: Optional[str] = None):
         """Process task using Task Master MCP"""
         logger.info(f"Starting task processing: task_id={task_id}, subtask_id={subtask_id}")
@@ -573,6 +616,7 @@ Please start the implementation!
             
             return False
             
+    @traced("orchestrator.run_tests_in_dev_project")
     def run_tests_in_dev_project(self) -> bool:
         """Run tests in development project"""
         if not self.config.get("dev_project_path"):
@@ -613,6 +657,7 @@ Please start the implementation!
             logger.warning(f"Unsupported project type: {project_type}")
             return False
             
+    @traced("orchestrator.check_code_quality")
     def check_code_quality(self):
         """Check code quality"""
         if not self.config.get("dev_project_path"):
@@ -623,14 +668,81 @@ Please start the implementation!
         
         if src_dir.exists():
             logger.info("Starting code quality check...")
-            analysis_result = self.code_analyzer.analyze_project(str(src_dir))
+            changed_files = None
+            if self.config.get("code_analysis", {}).get("git_diff_only", False):
+                changed_files = self._files_changed_since_last_commit(dev_path)
+            analysis_result = self.code_analyzer.analyze_project(
+                str(src_dir), cache=self.analysis_cache, changed_files=changed_files
+            )
             
             if analysis_result["total_mocks"] > 0 or analysis_result["total_commented_code"] > 0:
                 logger.warning("Code quality issues found!")
                 self.notification.notify_mock_detection(analysis_result)
             else:
                 logger.info("Code quality check passed")
+            
+            symbol_index = self._get_symbol_index(src_dir)
+            if symbol_index is not None:
+                # The index persists between runs: only files changed since it was built are re-parsed
+                if changed_files is not None and symbol_index.stats()["files"]:
+                    symbol_index.update_paths(changed_files, self.code_analyzer.source_extensions())
+                else:
+                    symbol_index.sync(self.code_analyzer.iter_files(str(src_dir)))
+                violations = symbol_index.violations()
+                if violations:
+                    logger.warning(f"Architecture check: {len(violations)} layer dependency violation(s)")
+                    self.notification.notify_architecture_violations(violations)
+                else:
+                    logger.info("Architecture check passed")
+    
+    def _get_symbol_index(self, src_dir: Path) -> Optional[SymbolIndex]:
+        """Symbol index of the dev project's sources, or None if disabled"""
+        analysis_config = self.config.get("code_analysis", {})
+        if not analysis_config.get("symbol_index_enabled", True):
+            return None
+        if self.symbol_index is None or self.symbol_index.src_root != os.path.abspath(src_dir):
+            if self.symbol_index is not None:
+                self.symbol_index.close()
+            self.symbol_index = SymbolIndex(str(src_dir), analysis_config.get("symbol_index_file", DEFAULT_INDEX_PATH))
+        return self.symbol_index
+    
+    def _update_symbol_index_after_commit(self, dev_path: Path):
+        """Re-index the files the last commit touched"""
+        src_dir = dev_path / self.config.get("src_dir", "src")
+        symbol_index = self._get_symbol_index(src_dir) if src_dir.exists() else None
+        if symbol_index is None:
+            return
+        try:
+            top_level = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=dev_path,
+                                       capture_output=True, text=True, check=True).stdout.strip()
+            committed = subprocess.run(["git", "diff-tree", "--no-commit-id", "--name-only", "-r", "HEAD"],
+                                       cwd=dev_path, capture_output=True, text=True, check=True).stdout.splitlines()
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not list committed files for the symbol index: {e}")
+            return
+        symbol_index.update_paths([os.path.join(top_level, name) for name in committed if name],
+                                  self.code_analyzer.source_extensions())
                 
+    def _files_changed_since_last_commit(self, dev_path: Path) -> Optional[set]:
+        """Absolute paths modified or added since the last commit_changes(), or None if unknown"""
+        last_commit = self.progress_state.get("last_commit_sha")
+        if not last_commit:
+            return None
+        try:
+            top_level = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=dev_path,
+                                       capture_output=True, text=True, check=True).stdout.strip()
+            changed = subprocess.run(["git", "diff", "--name-only", last_commit], cwd=dev_path,
+                                     capture_output=True, text=True, check=True).stdout.splitlines()
+            untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard", "--full-name"],
+                                       cwd=dev_path, capture_output=True, text=True, check=True).stdout.splitlines()
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not list changed files since {last_commit[:8]}, analyzing everything: {e}")
+            return None
+        files = {os.path.abspath(os.path.join(top_level, name)) for name in changed + untracked if name}
+        logger.info(f"{len(files)} file(s) changed since commit {last_commit[:8]}")
+        return files
+
+    @traced("orchestrator.commit_changes")
     def commit_changes(self, task_id: str, subtask_id: Optional[str] = None):
         """Perform Git commit"""
         if not self.config.get("git_enabled", False):
@@ -653,6 +765,13 @@ Please start the implementation!
             
             logger.info(f"Git commit complete: {commit_message}")
             
+            # Baseline for analyzing only what changed afterwards
+            head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=dev_path,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+            self.progress_state["last_commit_sha"] = head
+            self.save_progress_state()
+            self._update_symbol_index_after_commit(dev_path)
+            
         except subprocess.CalledProcessError as e:
             logger.error(f"Git commit failed: {e}")
             
@@ -663,6 +782,10 @@ Please start the implementation!
         # Setup signal handlers for graceful shutdown
         self._setup_signal_handlers()
         
+        # Register with the dashboard supervisor
+        record_pid(PID_FILE)
+        self._write_heartbeat("starting")
+        
         try:
             # Load previous progress state
             self.load_progress_state()
@@ -729,6 +852,7 @@ Note: When implementing tasks, please follow the complete process explained in p
 """
                     
                     logger.info(f"Checking and processing next task... ({processed_tasks + 1}/{max_tasks})")
+                    self._write_heartbeat("processing")
                     
                     # Send prompt to Claude
                     project_name = self.config.get("dev_project_name", "default")
@@ -828,6 +952,9 @@ Note: When implementing tasks, please follow the complete process explained in p
             
             return False
         
+        finally:
+            clear_pid(PID_FILE)
+        
     def print_progress_summary(self):
         """Print progress summary"""
         logger.info("=" * 50)
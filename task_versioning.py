@@ -0,0 +1,136 @@
+"""
+Task Versioning - change tracking for tasks.json
+
+Every write path flags the tasks and subtasks it modifies (mark_changed) and
+saves through save_tasks_file(), which stamps them with a new change version.
+Readers can then ask for everything changed after a version they have
+already seen.
+
+Several processes (dashboard, orchestrator, task master CLI) write tasks.json
+from their own in-memory copies, so versions are allocated at save time under
+an exclusive lock on tasks.json.lock, which also holds the last allocated
+version: allocation and write happen together, so a version on disk is never
+lower than one a reader could already have received.
+"""
+
+import os
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Placeholder set by mark_changed(); save_tasks_file() replaces it with the allocated version
+PENDING_VERSION = -1
+
+
+def current_version(tasks_data: Dict) -> int:
+    """Latest change version recorded in tasks data"""
+    return int(tasks_data.get("metadata", {}).get("change_version", 0))
+
+
+def mark_changed(tasks_data: Dict, *items: Dict) -> None:
+    """Flag the given tasks/subtasks as changed; they get a version when tasks_data is saved"""
+    for item in items:
+        item["version"] = PENDING_VERSION
+
+
+def _pending_items(tasks_data: Dict) -> List[Dict]:
+    pending = []
+    for task in tasks_data.get("tasks", []):
+        if task.get("version") == PENDING_VERSION:
+            pending.append(task)
+        pending.extend(subtask for subtask in task.get("subtasks", []) if subtask.get("version") == PENDING_VERSION)
+    return pending
+
+
+@contextmanager
+def tasks_file_lock(tasks_file):
+    """Exclusive cross-process lock for tasks_file; yields the lock file (which holds the version counter)"""
+    fd = os.open(f"{tasks_file}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, 'r+', encoding='utf-8') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield lock_file
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _allocate_version(lock_file, tasks_data: Dict) -> int:
+    """Next version after both the shared counter and this copy's; call with the lock held"""
+    lock_file.seek(0)
+    try:
+        counter = int(lock_file.read().strip() or 0)
+    except ValueError:
+        counter = 0
+    # The clock keeps versions increasing even if the lock file is deleted
+    version = max(counter + 1, current_version(tasks_data) + 1, int(time.time() * 1000))
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(version))
+    lock_file.flush()
+    return version
+
+
+def save_tasks_file(tasks_file, tasks_data: Dict, **dump_options) -> Optional[int]:
+    """Write tasks_data to tasks_file, stamping items flagged by mark_changed() with a new version.
+
+    Allocation and write happen under tasks_file_lock, and the file is replaced
+    atomically, so readers never see a partial file or a version going backwards.
+    Returns the allocated version (None if nothing was flagged). Raises OSError.
+    """
+    dump_options.setdefault("indent", 2)
+    with tasks_file_lock(tasks_file) as lock_file:
+        version = None
+        pending = _pending_items(tasks_data)
+        if pending:
+            version = _allocate_version(lock_file, tasks_data)
+            tasks_data.setdefault("metadata", {})["change_version"] = version
+            for item in pending:
+                item["version"] = version
+
+        temp_path = f"{tasks_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(tasks_data, f, **dump_options)
+        os.replace(temp_path, tasks_file)
+    return version
+
+
+def changes_since(tasks_data: Dict, since: Optional[int] = None) -> Dict[str, Any]:
+    """Tasks and subtasks modified after the given version.
+
+    With since omitted or 0, every task is returned so a client can build its
+    initial snapshot. Tasks are returned without their subtask list; changed
+    subtasks are listed separately with a parent_task_id.
+    """
+    full = not since
+    since = since or 0
+
+    tasks: List[Dict] = []
+    subtasks: List[Dict] = []
+    for task in tasks_data.get("tasks", []):
+        if full or task.get("version", 0) > since:
+            tasks.append({key: value for key, value in task.items() if key != "subtasks"})
+        for subtask in task.get("subtasks", []):
+            if full or subtask.get("version", 0) > since:
+                subtasks.append({**subtask, "parent_task_id": str(task.get("id"))})
+
+    return {
+        "version": current_version(tasks_data),
+        "since": since,
+        "full": full,
+        "tasks": tasks,
+        "subtasks": subtasks
+    }
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Test script for the code analysis cache
+Tests size/mtime/sha256 revalidation, trusted lookups, pattern signature
+invalidation and incremental analysis through CodeAnalyzer
+"""
+
+import os
+import sys
+import tempfile
+from analysis_cache import AnalysisCache
+from code_analyzer import CodeAnalyzer
+
+def write_file(path, text, mtime_ns=None):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def cached_result(cache, path, value):
+    """Look the file up (recording its stat) and store a result for it"""
+    cache.get(path)
+    cache.put_many([{"file": path, "value": value}])
+
+def test_revalidation():
+    """Size and mtime decide, and the content hash settles mtime-only changes"""
+    print("🔧 Testing stat/sha256 revalidation...")
+
+    try:
+        workdir = tempfile.mkdtemp()
+        path = os.path.join(workdir, "module.py")
+        write_file(path, "x = 1\n", mtime_ns=1_000_000_000)
+        cache = AnalysisCache(os.path.join(workdir, "cache.db"))
+
+        assert cache.get(path) is None, "first lookup misses"
+        cache.put_many([{"file": path, "value": 1}])
+        assert cache.get(path)["value"] == 1, "unchanged file hits"
+
+        write_file(path, "x = 1\n", mtime_ns=2_000_000_000)
+        assert cache.get(path)["value"] == 1, "touched but identical file hits via sha256"
+
+        write_file(path, "x = 2\n", mtime_ns=3_000_000_000)
+        assert cache.get(path) is None, "same size, new content misses"
+        assert cache.get(path, trust=True)["value"] == 1, "trusted lookup skips validation"
+
+        write_file(path, "x = 22\n", mtime_ns=3_000_000_000)
+        assert cache.get(path) is None, "size change misses even with the same mtime"
+
+        print("✅ Revalidation test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Revalidation test FAILED: {e}")
+        return False
+
+def test_change_during_analysis():
+    """A file modified between lookup and store is not cached"""
+    print("🔧 Testing changes during analysis...")
+
+    try:
+        workdir = tempfile.mkdtemp()
+        path = os.path.join(workdir, "module.py")
+        write_file(path, "x = 1\n", mtime_ns=1_000_000_000)
+        cache = AnalysisCache(os.path.join(workdir, "cache.db"))
+
+        assert cache.get(path) is None, "first lookup misses"
+        write_file(path, "x = 10\n", mtime_ns=2_000_000_000)
+        cache.put_many([{"file": path, "value": "stale"}])
+        assert cache.get(path) is None, "result for older content was not stored"
+
+        print("✅ Change during analysis test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Change during analysis test FAILED: {e}")
+        return False
+
+def test_signature_and_prune():
+    """A new pattern signature invalidates old entries; prune drops them and deleted files"""
+    print("🔧 Testing signature invalidation and prune...")
+
+    try:
+        workdir = tempfile.mkdtemp()
+        db_path = os.path.join(workdir, "cache.db")
+        kept = os.path.join(workdir, "kept.py")
+        deleted = os.path.join(workdir, "deleted.py")
+        write_file(kept, "a = 1\n")
+        write_file(deleted, "b = 1\n")
+
+        old = AnalysisCache(db_path, signature="old")
+        cached_result(old, kept, "old")
+        cached_result(old, deleted, "old")
+
+        new = AnalysisCache(db_path, signature="new")
+        assert new.get(kept) is None, "entries from another signature miss"
+        new.put_many([{"file": kept, "value": "new"}])
+        os.remove(deleted)
+
+        assert new.prune() == 1, "the deleted file's old-signature entry is pruned"
+        assert new.get(kept)["value"] == "new", "current entry kept"
+        assert old.get(kept) is None, "old-signature entry replaced"
+
+        print("✅ Signature and prune test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Signature and prune test FAILED: {e}")
+        return False
+
+def test_incremental_analysis():
+    """changed_files trusts the cache for other files, and is ignored without one"""
+    print("🔧 Testing incremental analysis...")
+
+    try:
+        workdir = tempfile.mkdtemp()
+        source_dir = os.path.join(workdir, "src")
+        os.makedirs(source_dir)
+        for name in ("a", "b", "c"):
+            write_file(os.path.join(source_dir, f"{name}.py"), f"{name} = 1\n")
+        analyzer = CodeAnalyzer()
+        files = analyzer.find_files(source_dir)
+
+        changed = {os.path.abspath(os.path.join(source_dir, "b.py"))}
+        assert len(analyzer.analyze_files(files, None, changed)) == 3, "no cache: every file analyzed"
+
+        cache = AnalysisCache(os.path.join(workdir, "cache.db"))
+        first = analyzer.analyze_files(files, cache)
+        cache.hits = cache.misses = 0
+        second = analyzer.analyze_files(files, cache, changed)
+        assert second == first, "cached results match a fresh analysis"
+        assert cache.stats() == {"hits": 3, "misses": 0}, "every file served from the cache"
+
+        print("✅ Incremental analysis test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Incremental analysis test FAILED: {e}")
+        return False
+
+def main():
+    """Run all analysis cache tests"""
+    print("🚀 Starting Analysis Cache Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Revalidation", test_revalidation),
+        ("Change During Analysis", test_change_during_analysis),
+        ("Signature And Prune", test_signature_and_prune),
+        ("Incremental Analysis", test_incremental_analysis)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n📋 Running: {test_name}")
+        print("-" * 40)
+
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} EXCEPTION: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 60)
+    print("📊 TEST RESULTS SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status:<10} {test_name}")
+        if result:
+            passed += 1
+
+    print("-" * 60)
+    print(f"Total: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests PASSED!")
+        sys.exit(0)
+    else:
+        print("⚠️  Some tests FAILED. Please check the issues above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
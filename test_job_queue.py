@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script for the automation job queue
+Tests lane exclusivity, deduplication, crash recovery and pruning
+against a throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+from job_queue import JobQueue
+
+def new_queue(**options):
+    """Job queue backed by a fresh temporary database"""
+    return JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"), **options)
+
+def test_lane_exclusivity():
+    """A lane with a running job is skipped until that job finishes"""
+    print("🔧 Testing lane exclusivity in claim...")
+
+    try:
+        queue = new_queue()
+        queue.enqueue({"prompt": "first", "project_name": "alpha"})
+        queue.enqueue({"prompt": "second", "project_name": "alpha"})
+        queue.enqueue({"prompt": "other", "project_name": "beta"})
+
+        first = queue.claim(timeout=0)
+        assert first["payload"]["prompt"] == "first", "FIFO order within a lane"
+        other = queue.claim(timeout=0)
+        assert other["lane"] == "beta", "busy lane alpha must be skipped"
+        assert queue.claim(timeout=0) is None, "nothing claimable while alpha is running"
+
+        queue.complete(first["id"], True)
+        second = queue.claim(timeout=0)
+        assert second["payload"]["prompt"] == "second", "alpha is claimable again once idle"
+
+        print("✅ Lane exclusivity test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Lane exclusivity test FAILED: {e}")
+        return False
+
+def test_lane_owner_binding():
+    """Continue-chat jobs stay with the session that owns their lane"""
+    print("🔧 Testing lane binding to sessions...")
+
+    try:
+        queue = new_queue()
+        queue.enqueue({"prompt": "start", "project_name": "alpha"})
+        job = queue.claim(timeout=0, owner=0)
+        queue.complete(job["id"], True)
+
+        queue.enqueue({"prompt": "follow up", "project_name": "alpha"})
+        assert queue.claim(timeout=0, owner=1) is None, "session 1 must not continue session 0's chat"
+
+        queue.enqueue({"prompt": "fresh", "project_name": "alpha", "create_new_chat": True}, priority="high")
+        job = queue.claim(timeout=0, owner=1)
+        assert job["payload"]["prompt"] == "fresh", "new-chat jobs may move to any session"
+        queue.complete(job["id"], True)
+
+        assert queue.claim(timeout=0, owner=0) is None, "the lane moved to session 1"
+        job = queue.claim(timeout=0, owner=1)
+        assert job["payload"]["prompt"] == "follow up", "the new owner continues the chat"
+
+        print("✅ Lane binding test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Lane binding test FAILED: {e}")
+        return False
+
+def test_dedup_priority_promotion():
+    """A duplicate prompt returns the pending job and can raise its priority"""
+    print("🔧 Testing deduplication with priority promotion...")
+
+    try:
+        queue = new_queue()
+        low_id, created = queue.enqueue({"prompt": "same", "project_name": "alpha"}, priority="low")
+        assert created, "first enqueue creates the job"
+        queue.enqueue({"prompt": "normal", "project_name": "beta"})
+
+        dup_id, created = queue.enqueue({"prompt": "same", "project_name": "alpha"}, priority="high")
+        assert not created and dup_id == low_id, "duplicate returns the existing id"
+        assert queue.get(low_id)["priority"] == 10, "duplicate promoted the pending job"
+        assert queue.claim(timeout=0)["id"] == low_id, "promoted job is claimed first"
+
+        _, created = queue.enqueue({"prompt": "same", "project_name": "alpha"}, priority="low")
+        assert not created, "a running job still deduplicates"
+        _, created = queue.enqueue({"prompt": "same", "project_name": "alpha"}, dedup=False)
+        assert created, "dedup=False always queues"
+
+        print("✅ Deduplication test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Deduplication test FAILED: {e}")
+        return False
+
+def test_recover_in_flight():
+    """Running jobs are requeued after a restart, or failed once out of attempts"""
+    print("🔧 Testing recover_in_flight...")
+
+    try:
+        db_path = os.path.join(tempfile.mkdtemp(), "jobs.db")
+        queue = JobQueue(db_path, max_attempts=2)
+        retry_id, _ = queue.enqueue({"prompt": "retry", "project_name": "alpha"})
+        spent_id, _ = queue.enqueue({"prompt": "spent", "project_name": "beta"})
+        queue.claim(timeout=0)
+        queue.claim(timeout=0)
+        # spent has used its second attempt when the process dies
+        queue._conn.execute("UPDATE jobs SET attempts = 2 WHERE id = ?", (spent_id,))
+
+        restarted = JobQueue(db_path, max_attempts=2)
+        assert restarted.recover_in_flight() == 1, "one job requeued"
+        assert restarted.get(retry_id)["status"] == "queued", "job with attempts left is requeued"
+        assert restarted.get(spent_id)["status"] == "failed", "job out of attempts is failed"
+        assert restarted.claim(timeout=0)["id"] == retry_id, "requeued job is claimable"
+
+        print("✅ recover_in_flight test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ recover_in_flight test FAILED: {e}")
+        return False
+
+def test_cancel_and_prune():
+    """Only queued jobs cancel; prune deletes finished jobs and their callbacks"""
+    print("🔧 Testing cancel and prune...")
+
+    try:
+        queue = new_queue()
+        queued_id, _ = queue.enqueue({"prompt": "queued", "project_name": "alpha"})
+        running_id, _ = queue.enqueue({"prompt": "running", "project_name": "beta"}, priority="high")
+        queue.claim(timeout=0)
+        queue.add_callback(queued_id, "http://localhost/hook")
+
+        assert queue.cancel(running_id) == "running", "running jobs are not cancelled"
+        assert queue.cancel(queued_id) == "cancelled", "queued job is cancelled"
+        assert queue.cancel("missing") is None, "unknown job"
+
+        assert queue.prune(3600) == 0, "recently finished jobs are kept"
+        assert queue.prune(-1) == 1, "only the finished job is pruned"
+        assert queue.get(queued_id) is None, "cancelled job pruned"
+        assert queue.callbacks(queued_id) == [], "its callbacks pruned"
+        assert queue.get(running_id) is not None, "running job kept"
+
+        print("✅ Cancel and prune test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Cancel and prune test FAILED: {e}")
+        return False
+
+def main():
+    """Run all job queue tests"""
+    print("🚀 Starting Job Queue Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Lane Exclusivity", test_lane_exclusivity),
+        ("Lane Binding", test_lane_owner_binding),
+        ("Dedup Priority Promotion", test_dedup_priority_promotion),
+        ("Recover In-Flight", test_recover_in_flight),
+        ("Cancel And Prune", test_cancel_and_prune)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n📋 Running: {test_name}")
+        print("-" * 40)
+
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} EXCEPTION: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 60)
+    print("📊 TEST RESULTS SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status:<10} {test_name}")
+        if result:
+            passed += 1
+
+    print("-" * 60)
+    print(f"Total: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests PASSED!")
+        sys.exit(0)
+    else:
+        print("⚠️  Some tests FAILED. Please check the issues above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the job result store
+Tests LRU and idle-TTL eviction, seeding, waiting and result history
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from result_store import ResultStore
+
+def test_lru_eviction():
+    """Past max_entries the least recently used entry is evicted"""
+    print("🔧 Testing LRU eviction...")
+
+    try:
+        store = ResultStore(max_entries=3)
+        for task_id in ("a", "b", "c"):
+            store.set(task_id, "queued")
+        assert store.get("a") is not None, "a is cached"  # a is now the most recent
+        store.set("d", "queued")
+
+        assert len(store) == 3, "size stays bounded"
+        assert store.get("b") is None, "least recently used entry evicted"
+        assert all(store.get(task_id) for task_id in ("a", "c", "d")), "recent entries kept"
+
+        print("✅ LRU eviction test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ LRU eviction test FAILED: {e}")
+        return False
+
+def test_ttl_eviction():
+    """Entries idle for longer than ttl_s expire; reads keep an entry alive"""
+    print("🔧 Testing idle-TTL eviction...")
+
+    try:
+        store = ResultStore(ttl_s=0.2)
+        store.set("idle", "queued")
+        store.set("busy", "running")
+        for _ in range(3):
+            time.sleep(0.1)
+            assert store.get("busy") is not None, "read within the TTL keeps the entry"
+
+        assert store.get("idle") is None, "idle entry expired on read"
+        store.set("new", "queued")
+        assert len(store) == 2, "expired entries are evicted on write"
+
+        print("✅ TTL eviction test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ TTL eviction test FAILED: {e}")
+        return False
+
+def test_seed_keeps_newer_status():
+    """seed() never overwrites an entry the worker already advanced"""
+    print("🔧 Testing seed...")
+
+    try:
+        store = ResultStore()
+        store.set("job", "running")
+        store.seed("job", "queued")
+        assert store.get("job")["status"] == "running", "existing entry kept"
+        store.seed("other", "queued")
+        assert store.get("other")["status"] == "queued", "missing entry seeded"
+
+        print("✅ Seed test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Seed test FAILED: {e}")
+        return False
+
+def test_wait_and_spill():
+    """wait() returns when the job finishes; finished results go to the history file"""
+    print("🔧 Testing wait and result history...")
+
+    try:
+        spill_file = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+        store = ResultStore(spill_file=spill_file)
+        store.set("job", "running")
+
+        assert store.wait("job", 0.05)["status"] == "running", "wait times out on a running job"
+        finisher = threading.Timer(0.1, store.set, args=("job", "completed", {"success": True}))
+        finisher.start()
+        started = time.monotonic()
+        entry = store.wait("job", 5)
+        assert entry["status"] == "completed", "wait returns the finished status"
+        assert time.monotonic() - started < 1, "wait wakes on completion, not at the timeout"
+        finisher.join()  # History is appended after waiters are woken
+
+        with open(spill_file, encoding="utf-8") as f:
+            history = [json.loads(line) for line in f]
+        assert [record["status"] for record in history] == ["completed"], "only finished results spilled"
+        assert history[0]["result"] == {"success": True}, "result recorded"
+
+        print("✅ Wait and history test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Wait and history test FAILED: {e}")
+        return False
+
+def main():
+    """Run all result store tests"""
+    print("🚀 Starting Result Store Tests")
+    print("=" * 60)
+
+    tests = [
+        ("LRU Eviction", test_lru_eviction),
+        ("TTL Eviction", test_ttl_eviction),
+        ("Seed Keeps Newer Status", test_seed_keeps_newer_status),
+        ("Wait And History", test_wait_and_spill)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n📋 Running: {test_name}")
+        print("-" * 40)
+
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} EXCEPTION: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 60)
+    print("📊 TEST RESULTS SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status:<10} {test_name}")
+        if result:
+            passed += 1
+
+    print("-" * 60)
+    print(f"Total: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests PASSED!")
+        sys.exit(0)
+    else:
+        print("⚠️  Some tests FAILED. Please check the issues above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the symbol index
+Tests layer violation queries, incremental sync of a source tree and
+targeted updates of the paths a commit touched
+"""
+
+import os
+import sys
+import tempfile
+from symbol_index import SymbolIndex
+
+SOURCES = {
+    "com/shop/domain/Order.java": (
+        "package com.shop.domain;\n"
+        "import com.shop.infrastructure.Database;\n"
+        "public class Order {}\n"
+    ),
+    "com/shop/infrastructure/Database.java": (
+        "package com.shop.infrastructure;\n"
+        "public class Database {}\n"
+    ),
+    "shop/domain/model.py": (
+        '"""Example: import shop.adapters.web is not a real import"""\n'
+        "from ..infrastructure.db import connect\n"
+        "class Model:\n"
+        "    pass\n"
+    ),
+    "shop/infrastructure/db.py": "def connect():\n    pass\n",
+    "shop/adapters/web.py": "import shop.domain.model\n",
+    "shop/domain/notes.md": "import shop.infrastructure.db\n"
+}
+
+def make_tree():
+    """Source root with SOURCES written under it, and an index database beside it"""
+    workdir = tempfile.mkdtemp()
+    src_root = os.path.join(workdir, "src")
+    for relative, text in SOURCES.items():
+        path = os.path.join(src_root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return src_root, SymbolIndex(src_root, os.path.join(workdir, "symbols.db"))
+
+def source_files(src_root):
+    return [os.path.join(directory, name) for directory, _, names in os.walk(src_root) for name in names]
+
+def violation_pairs(index, src_root):
+    return sorted((os.path.relpath(v["path"], src_root).replace(os.sep, "/"), v["target"])
+                  for v in index.violations())
+
+def test_violations():
+    """Domain imports of infrastructure are reported for Java and Python"""
+    print("🔧 Testing layer violations...")
+
+    try:
+        src_root, index = make_tree()
+        counts = index.sync(source_files(src_root))
+        assert counts == {"indexed": 5, "removed": 0, "unchanged": 0}, f"only .py/.java indexed: {counts}"
+        assert index.layers() == {"domain": 2, "infrastructure": 2, "adapters": 1}, "files per layer"
+        assert violation_pairs(index, src_root) == [
+            ("com/shop/domain/Order.java", "com.shop.infrastructure.Database"),
+            ("shop/domain/model.py", "shop.infrastructure.db.connect")
+        ], "violations from real imports only"
+        assert index.dependencies("adapters", "domain")[0]["target"] == "shop.domain.model", "allowed dependency"
+
+        print("✅ Layer violations test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Layer violations test FAILED: {e}")
+        return False
+
+def test_incremental_sync():
+    """sync re-parses only modified files and drops deleted ones"""
+    print("🔧 Testing incremental sync...")
+
+    try:
+        src_root, index = make_tree()
+        index.sync(source_files(src_root))
+        assert index.sync(source_files(src_root)) == {"indexed": 0, "removed": 0, "unchanged": 5}, "nothing to do"
+
+        order = os.path.join(src_root, "com/shop/domain/Order.java")
+        with open(order, "w", encoding="utf-8") as f:
+            f.write("package com.shop.domain;\npublic class Order {}\n")
+        os.remove(os.path.join(src_root, "shop/domain/model.py"))
+
+        counts = index.sync(source_files(src_root))
+        assert counts == {"indexed": 1, "removed": 1, "unchanged": 3}, f"one modified, one deleted: {counts}"
+        assert violation_pairs(index, src_root) == [], "violations of changed files are gone"
+        assert index.stats()["files"] == 4, "deleted file dropped"
+
+        print("✅ Incremental sync test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Incremental sync test FAILED: {e}")
+        return False
+
+def test_update_paths():
+    """update_paths re-parses the given files under the root and removes deleted ones"""
+    print("🔧 Testing update_paths...")
+
+    try:
+        src_root, index = make_tree()
+        index.sync(source_files(src_root))
+
+        model = os.path.join(src_root, "shop/domain/model.py")
+        with open(model, "w", encoding="utf-8") as f:
+            f.write("from shop.adapters.web import *\n")
+        os.remove(os.path.join(src_root, "com/shop/domain/Order.java"))
+        outside = os.path.join(os.path.dirname(src_root), "elsewhere.py")
+
+        updated = index.update_paths([
+            model,
+            os.path.join(src_root, "com/shop/domain/Order.java"),
+            os.path.join(src_root, "shop/domain/notes.md"),
+            outside
+        ])
+        assert updated == 2, "only parsed sources under the root are updated"
+        assert violation_pairs(index, src_root) == [("shop/domain/model.py", "shop.adapters.web")], \
+            "index reflects the new imports"
+        assert index.update_paths([model], extensions=[".java"]) == 0, "extension filter applies"
+
+        print("✅ update_paths test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ update_paths test FAILED: {e}")
+        return False
+
+def main():
+    """Run all symbol index tests"""
+    print("🚀 Starting Symbol Index Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Layer Violations", test_violations),
+        ("Incremental Sync", test_incremental_sync),
+        ("Update Paths", test_update_paths)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n📋 Running: {test_name}")
+        print("-" * 40)
+
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} EXCEPTION: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 60)
+    print("📊 TEST RESULTS SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status:<10} {test_name}")
+        if result:
+            passed += 1
+
+    print("-" * 60)
+    print(f"Total: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests PASSED!")
+        sys.exit(0)
+    else:
+        print("⚠️  Some tests FAILED. Please check the issues above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
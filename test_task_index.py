@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test script for the task index
+Tests filtered cursor paging against a brute-force scan, update-time
+listings, cursors that survive edits between pages and index caching
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from task_index import TaskIndex, get_task_index, DONE_STATUSES
+
+STATUSES = ["pending", "in-progress", "done", "deferred"]
+PRIORITIES = ["high", "medium", "low"]
+START = datetime(2026, 1, 1)
+
+def make_tasks(count=300):
+    """Deterministic tasks with mixed statuses, priorities, dependencies and update times"""
+    return [
+        {
+            "id": task_id,
+            "status": STATUSES[task_id % 4],
+            "priority": PRIORITIES[task_id % 3],
+            "dependencies": [task_id - 1] if task_id % 5 else [],
+            "updated_at": (START + timedelta(minutes=(task_id * 37) % count)).isoformat()
+        }
+        for task_id in range(1, count + 1)
+    ]
+
+def all_pages(index, limit, **filters):
+    """Ids of every task returned by following next_cursor to the end"""
+    ids, cursor = [], None
+    while True:
+        page = index.query(cursor=cursor, limit=limit, **filters)
+        ids.extend(task["id"] for task in page["tasks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+def is_ready(task, status_by_id):
+    return task["status"] == "pending" and all(
+        status_by_id.get(dep) in DONE_STATUSES for dep in task["dependencies"]
+    )
+
+def test_filtered_paging():
+    """Every filter combination pages through exactly the brute-force matches"""
+    print("🔧 Testing filtered cursor paging...")
+
+    try:
+        tasks = make_tasks()
+        index = TaskIndex({"tasks": tasks})
+        status_by_id = {task["id"]: task["status"] for task in tasks}
+        cases = [
+            {},
+            {"status": ["pending"]},
+            {"status": ["pending", "done"], "priority": ["high"]},
+            {"priority": ["low"], "ready": False},
+            {"ready": True},
+            {"status": ["missing"]}
+        ]
+        for filters in cases:
+            expected = [
+                task["id"] for task in tasks
+                if ("status" not in filters or task["status"] in filters["status"])
+                and ("priority" not in filters or task["priority"] in filters["priority"])
+                and ("ready" not in filters or is_ready(task, status_by_id) == filters["ready"])
+            ]
+            for limit in (1, 7, 50, 500):
+                assert all_pages(index, limit, **filters) == expected, f"{filters} with limit {limit}"
+            total = index.query(limit=1, **filters)["total"]
+            assert total == (len(expected) if len(filters) <= 1 else None), f"total for {filters}"
+
+        print("✅ Filtered paging test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Filtered paging test FAILED: {e}")
+        return False
+
+def test_updated_since():
+    """updated_since lists matches oldest update first and rejects bad timestamps"""
+    print("🔧 Testing updated_since listings...")
+
+    try:
+        tasks = make_tasks()
+        index = TaskIndex({"tasks": tasks})
+        since = (START + timedelta(minutes=120)).isoformat()
+        expected = [task["id"] for task in sorted(tasks, key=lambda task: (task["updated_at"], task["id"] - 1))
+                    if task["updated_at"] >= since]
+        for limit in (1, 9, 500):
+            assert all_pages(index, limit, updated_since=since) == expected, f"limit {limit}"
+        assert index.query(updated_since=since)["total"] == len(expected), "exact total"
+
+        expected_high = [task_id for task_id in expected if tasks[task_id - 1]["priority"] == "high"]
+        assert all_pages(index, 4, updated_since=since, priority=["high"]) == expected_high, "combined filter"
+
+        # Equivalent spellings of the same instant
+        utc = (START + timedelta(minutes=120)).astimezone(timezone.utc)
+        zulu = utc.replace(tzinfo=None).isoformat() + "Z"
+        assert all_pages(index, 50, updated_since=zulu) == expected, "UTC 'Z' timestamp"
+
+        try:
+            index.query(updated_since="yesterday")
+            assert False, "invalid updated_since accepted"
+        except ValueError:
+            pass
+
+        print("✅ updated_since test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ updated_since test FAILED: {e}")
+        return False
+
+def test_cursor_survives_edits():
+    """A cursor resumes at its task even if tasks are added or removed before it"""
+    print("🔧 Testing cursors across edits...")
+
+    try:
+        tasks = make_tasks(40)
+        first = TaskIndex({"tasks": tasks}).query(status=["pending"], limit=3)
+        seen = [task["id"] for task in first["tasks"]]
+
+        # Between pages one task is inserted at the front and an already served one deleted
+        edited = [{"id": 1000, "status": "pending", "priority": "high", "dependencies": []}]
+        edited += [task for task in tasks if task["id"] != seen[0]]
+        rest = TaskIndex({"tasks": edited}).query(status=["pending"], cursor=first["next_cursor"], limit=100)
+        remaining = [task["id"] for task in rest["tasks"]]
+
+        expected = [task["id"] for task in tasks if task["status"] == "pending"][3:]
+        assert remaining == expected, "no repeats and no misses after the edit"
+
+        try:
+            TaskIndex({"tasks": tasks}).query(cursor="not-a-cursor")
+            assert False, "malformed cursor accepted"
+        except ValueError:
+            pass
+
+        print("✅ Cursor edit test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Cursor edit test FAILED: {e}")
+        return False
+
+def test_index_cache():
+    """get_task_index reuses the index until tasks.json changes"""
+    print("🔧 Testing index caching...")
+
+    try:
+        tasks_file = os.path.join(tempfile.mkdtemp(), "tasks.json")
+        with open(tasks_file, "w", encoding="utf-8") as f:
+            json.dump({"tasks": make_tasks(10)}, f)
+        index = get_task_index(tasks_file)
+        assert get_task_index(tasks_file) is index, "unchanged file reuses the index"
+
+        with open(tasks_file, "w", encoding="utf-8") as f:
+            json.dump({"tasks": make_tasks(12)}, f)
+        rebuilt = get_task_index(tasks_file)
+        assert rebuilt is not index and len(rebuilt.tasks) == 12, "changed file is reindexed"
+        assert get_task_index(tasks_file + ".missing").tasks == [], "missing file gives an empty index"
+
+        print("✅ Index cache test PASSED")
+        return True
+
+    except AssertionError as e:
+        print(f"❌ Index cache test FAILED: {e}")
+        return False
+
+def main():
+    """Run all task index tests"""
+    print("🚀 Starting Task Index Tests")
+    print("=" * 60)
+
+    tests = [
+        ("Filtered Paging", test_filtered_paging),
+        ("Updated Since", test_updated_since),
+        ("Cursor Survives Edits", test_cursor_survives_edits),
+        ("Index Cache", test_index_cache)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n📋 Running: {test_name}")
+        print("-" * 40)
+
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} EXCEPTION: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 60)
+    print("📊 TEST RESULTS SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    total = len(results)
+
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status:<10} {test_name}")
+        if result:
+            passed += 1
+
+    print("-" * 60)
+    print(f"Total: {passed}/{total} tests passed")
+
+    if passed == total:
+        print("🎉 All tests PASSED!")
+        sys.exit(0)
+    else:
+        print("⚠️  Some tests FAILED. Please check the issues above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
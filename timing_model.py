@@ -0,0 +1,147 @@
+"""
+Timing Model - learned response durations for Claude Desktop prompts
+
+Records how long each response actually took, keyed by project, complexity
+bucket and prompt length bucket, and predicts the completion time of the
+next prompt from the recorded quantiles. The response wait loop uses the
+prediction to sleep through the part of the response that is certainly not
+done yet and to poll densely around the expected finish.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_FILE = os.path.join("logs", "response_timings.json")
+
+# Upper bounds (inclusive) of complexity and prompt-length buckets
+COMPLEXITY_BUCKETS = ((3, "simple"), (7, "moderate"), (10, "complex"))
+LENGTH_BUCKETS = ((500, "short"), (2000, "medium"), (8000, "long"))
+
+MAX_SAMPLES_PER_KEY = 50
+MIN_SAMPLES = 3
+
+
+class Prediction(NamedTuple):
+    expected_s: float   # Median duration of similar prompts
+    upper_s: float      # 90th percentile
+    samples: int
+    key: str            # History bucket the prediction came from
+
+
+def complexity_bucket(score: int) -> str:
+    for bound, name in COMPLEXITY_BUCKETS:
+        if score <= bound:
+            return name
+    return COMPLEXITY_BUCKETS[-1][1]
+
+
+def length_bucket(chars: int) -> str:
+    for bound, name in LENGTH_BUCKETS:
+        if chars <= bound:
+            return name
+    return "huge"
+
+
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class TimingModel:
+    """Response duration history persisted as JSON, shared by all sessions using the same file"""
+
+    _instances: Dict[str, "TimingModel"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, history_file: str = DEFAULT_HISTORY_FILE):
+        self.history_file = history_file
+        self._lock = threading.Lock()
+        self._history: Dict[str, List[float]] = {}
+        if os.path.exists(history_file):
+            try:
+                with open(history_file, 'r', encoding='utf-8') as f:
+                    self._history = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable timing history ({history_file}): {e}")
+
+    @classmethod
+    def shared(cls, history_file: str = DEFAULT_HISTORY_FILE) -> "TimingModel":
+        """One instance per history file, so parallel sessions do not overwrite each other's samples"""
+        path = os.path.abspath(history_file)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    @staticmethod
+    def _keys(project: Optional[str], complexity: int, prompt_chars: int) -> List[str]:
+        """History keys from most to least specific"""
+        shape = f"{complexity_bucket(complexity)}/{length_bucket(prompt_chars)}"
+        return [f"{project or '*'}/{shape}", f"*/{shape}", f"*/{complexity_bucket(complexity)}"]
+
+    def record(self, project: Optional[str], complexity: int, prompt_chars: int, duration_s: float):
+        """Add an observed response duration to every bucket it belongs to"""
+        keys = self._keys(project, complexity, prompt_chars)
+        if not project:
+            keys = keys[1:]
+        with self._lock:
+            for key in keys:
+                samples = self._history.setdefault(key, [])
+                samples.append(round(duration_s, 2))
+                del samples[:-MAX_SAMPLES_PER_KEY]
+            self._save()
+        logger.debug(f"Recorded response duration {duration_s:.1f}s for {keys[0]}")
+
+    def predict(self, project: Optional[str], complexity: int, prompt_chars: int) -> Optional[Prediction]:
+        """Expected duration from the most specific bucket with enough history"""
+        with self._lock:
+            for key in self._keys(project, complexity, prompt_chars):
+                samples = self._history.get(key, [])
+                if len(samples) >= MIN_SAMPLES:
+                    return Prediction(_quantile(samples, 0.5), _quantile(samples, 0.9), len(samples), key)
+        return None
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.history_file)), exist_ok=True)
+        temp_path = f"{self.history_file}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._history, f)
+            os.replace(temp_path, self.history_file)
+        except OSError as e:
+            logger.warning(f"Could not save timing history: {e}")
+
+
+def initial_wait_for(prediction: Prediction, default_s: float, min_s: float = 1) -> float:
+    """Sleep before the first check: half the expected duration, never more than the default"""
+    return max(min_s, min(default_s, prediction.expected_s * 0.5))
+
+
+def poll_interval_for(prediction: Prediction, elapsed_s: float, dense_s: float, max_s: float) -> float:
+    """Time until the next check, densest between 70% of the median and the 90th percentile.
+
+    Before the window the loop sleeps up to its start (checks stay at least
+    every max_s for usage-limit and Continue detection); after it, intervals
+    grow again since the response is running long.
+    """
+    window_start = prediction.expected_s * 0.7
+    window_end = max(prediction.upper_s, prediction.expected_s) * 1.2
+    if elapsed_s < window_start:
+        return max(dense_s, min(max_s, window_start - elapsed_s))
+    if elapsed_s <= window_end:
+        return dense_s
+    overrun = (elapsed_s - window_end) / max(window_end, 1)
+    return min(max_s, dense_s * (1 + 2 * overrun))
+
+
+def timeout_for(prediction: Prediction, base_timeout_s: float, max_timeout_s: float) -> float:
+    """Give up after three times the 90th percentile, within the configured bounds"""
+    return min(max_timeout_s, max(base_timeout_s, prediction.upper_s * 3))